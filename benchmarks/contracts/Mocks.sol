@@ -0,0 +1,164 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+// Minimal stand-ins for mUSD, Wrapped BTC and the Uniswap-v2 style Dumpy Swap
+// router, with the same function signatures and events the tools call.
+
+contract MockERC20 {
+    string public name;
+    string public symbol;
+    uint8 public constant decimals = 18;
+    uint256 public totalSupply;
+    mapping(address => uint256) public balanceOf;
+    mapping(address => mapping(address => uint256)) public allowance;
+
+    event Transfer(address indexed from, address indexed to, uint256 value);
+    event Approval(address indexed owner, address indexed spender, uint256 value);
+
+    constructor(string memory _name, string memory _symbol) {
+        name = _name;
+        symbol = _symbol;
+    }
+
+    function mint(address to, uint256 amount) external {
+        totalSupply += amount;
+        balanceOf[to] += amount;
+        emit Transfer(address(0), to, amount);
+    }
+
+    function transfer(address to, uint256 amount) external returns (bool) {
+        _transfer(msg.sender, to, amount);
+        return true;
+    }
+
+    function approve(address spender, uint256 amount) external returns (bool) {
+        allowance[msg.sender][spender] = amount;
+        emit Approval(msg.sender, spender, amount);
+        return true;
+    }
+
+    function transferFrom(address from, address to, uint256 amount) external returns (bool) {
+        uint256 allowed = allowance[from][msg.sender];
+        if (allowed != type(uint256).max) {
+            require(allowed >= amount, "ERC20: insufficient allowance");
+            allowance[from][msg.sender] = allowed - amount;
+        }
+        _transfer(from, to, amount);
+        return true;
+    }
+
+    function _transfer(address from, address to, uint256 amount) internal {
+        require(balanceOf[from] >= amount, "ERC20: insufficient balance");
+        balanceOf[from] -= amount;
+        balanceOf[to] += amount;
+        emit Transfer(from, to, amount);
+    }
+}
+
+contract MockPair {
+    address public token0;
+    address public token1;
+    uint112 private reserve0;
+    uint112 private reserve1;
+    uint32 private blockTimestampLast;
+
+    event Sync(uint112 reserve0, uint112 reserve1);
+    event Swap(
+        address indexed sender,
+        uint256 amount0In,
+        uint256 amount1In,
+        uint256 amount0Out,
+        uint256 amount1Out,
+        address indexed to
+    );
+
+    constructor(address tokenA, address tokenB) {
+        (token0, token1) = tokenA < tokenB ? (tokenA, tokenB) : (tokenB, tokenA);
+    }
+
+    function getReserves() external view returns (uint112, uint112, uint32) {
+        return (reserve0, reserve1, blockTimestampLast);
+    }
+
+    function sync() public {
+        reserve0 = uint112(MockERC20(token0).balanceOf(address(this)));
+        reserve1 = uint112(MockERC20(token1).balanceOf(address(this)));
+        blockTimestampLast = uint32(block.timestamp);
+        emit Sync(reserve0, reserve1);
+    }
+
+    function swap(uint256 amount0Out, uint256 amount1Out, address to) external {
+        require(amount0Out < reserve0 && amount1Out < reserve1, "Pair: insufficient liquidity");
+        if (amount0Out > 0) MockERC20(token0).transfer(to, amount0Out);
+        if (amount1Out > 0) MockERC20(token1).transfer(to, amount1Out);
+        uint256 balance0 = MockERC20(token0).balanceOf(address(this));
+        uint256 balance1 = MockERC20(token1).balanceOf(address(this));
+        uint256 amount0In = balance0 > reserve0 - amount0Out ? balance0 - (reserve0 - amount0Out) : 0;
+        uint256 amount1In = balance1 > reserve1 - amount1Out ? balance1 - (reserve1 - amount1Out) : 0;
+        require(amount0In > 0 || amount1In > 0, "Pair: insufficient input");
+        // Constant product with the 0.3% LP fee
+        require(
+            (balance0 * 1000 - amount0In * 3) * (balance1 * 1000 - amount1In * 3)
+                >= uint256(reserve0) * reserve1 * 1000 ** 2,
+            "Pair: K"
+        );
+        emit Swap(msg.sender, amount0In, amount1In, amount0Out, amount1Out, to);
+        sync();
+    }
+}
+
+contract MockFactory {
+    mapping(address => mapping(address => address)) public getPair;
+
+    function createPair(address tokenA, address tokenB) external returns (address pair) {
+        pair = address(new MockPair(tokenA, tokenB));
+        getPair[tokenA][tokenB] = pair;
+        getPair[tokenB][tokenA] = pair;
+    }
+}
+
+contract MockRouter {
+    address public immutable factory;
+
+    constructor(address _factory) {
+        factory = _factory;
+    }
+
+    function getAmountOut(uint256 amountIn, uint256 reserveIn, uint256 reserveOut) public pure returns (uint256) {
+        uint256 amountInWithFee = amountIn * 997;
+        return amountInWithFee * reserveOut / (reserveIn * 1000 + amountInWithFee);
+    }
+
+    function getAmountsOut(uint256 amountIn, address[] memory path) public view returns (uint256[] memory amounts) {
+        require(path.length >= 2, "Router: invalid path");
+        amounts = new uint256[](path.length);
+        amounts[0] = amountIn;
+        for (uint256 i = 0; i < path.length - 1; i++) {
+            MockPair pair = MockPair(MockFactory(factory).getPair(path[i], path[i + 1]));
+            (uint112 reserve0, uint112 reserve1,) = pair.getReserves();
+            (uint256 reserveIn, uint256 reserveOut) =
+                path[i] == pair.token0() ? (uint256(reserve0), uint256(reserve1)) : (uint256(reserve1), uint256(reserve0));
+            amounts[i + 1] = getAmountOut(amounts[i], reserveIn, reserveOut);
+        }
+    }
+
+    function swapExactTokensForTokens(
+        uint256 amountIn,
+        uint256 amountOutMin,
+        address[] calldata path,
+        address to,
+        uint256 deadline
+    ) external returns (uint256[] memory amounts) {
+        require(deadline >= block.timestamp, "Router: expired");
+        amounts = getAmountsOut(amountIn, path);
+        require(amounts[amounts.length - 1] >= amountOutMin, "Router: insufficient output amount");
+        MockERC20(path[0]).transferFrom(msg.sender, MockFactory(factory).getPair(path[0], path[1]), amountIn);
+        for (uint256 i = 0; i < path.length - 1; i++) {
+            MockPair pair = MockPair(MockFactory(factory).getPair(path[i], path[i + 1]));
+            (uint256 amount0Out, uint256 amount1Out) =
+                path[i] == pair.token0() ? (uint256(0), amounts[i + 1]) : (amounts[i + 1], uint256(0));
+            address recipient = i < path.length - 2 ? MockFactory(factory).getPair(path[i + 1], path[i + 2]) : to;
+            pair.swap(amount0Out, amount1Out, recipient);
+        }
+    }
+}
@@ -0,0 +1,68 @@
+"""
+Import-time benchmark for mezo_agent.
+
+Each scenario runs in a fresh interpreter (so nothing is cached in sys.modules)
+and reports the median wall time of the import plus which heavy dependencies it
+pulled in. Run from the repository root:
+
+    python benchmarks/import_time.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "import mezo_agent": "import mezo_agent",
+    "import mezo_agent.config": "import mezo_agent.config",
+    "chat tool": "from mezo_agent import mezo_character_chat",
+    "price tool": "from mezo_agent import mezo_agent_token_price_tool",
+    "all tools": "from mezo_agent import *",
+}
+
+HEAVY_MODULES = ["web3", "eth_account", "langchain", "langchain_openai", "openai", "requests"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_scenario(statement: str, runs: int) -> dict:
+    timings, loaded = [], []
+    for _ in range(runs):
+        probe = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+        out = subprocess.run(
+            [sys.executable, "-c", probe], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(out)
+        timings.append(result["seconds"])
+        loaded = result["loaded"]
+    return {"median_ms": statistics.median(timings) * 1000, "max_ms": max(timings) * 1000, "loaded": loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure mezo_agent import time.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario.")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<28}{'median ms':>12}{'max ms':>10}  heavy modules loaded")
+    for name, statement in SCENARIOS.items():
+        try:
+            result = run_scenario(statement, args.runs)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<28}{'failed':>12}  {e.stderr.strip().splitlines()[-1] if e.stderr else ''}")
+            continue
+        loaded = ", ".join(result["loaded"]) or "-"
+        print(f"{name:<28}{result['median_ms']:>12.1f}{result['max_ms']:>10.1f}  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
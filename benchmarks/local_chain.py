@@ -0,0 +1,314 @@
+"""
+Local chain stand-ins for the tool benchmarks.
+
+Two backends are supported, both served on 127.0.0.1:
+
+- anvil (Foundry), started as a subprocess with Mezo Matsnet's chain id, and
+- eth-tester on py-evm, run in-process (pip install "eth-tester[py-evm]").
+
+Either way the tools talk to an RpcProxy, which counts HTTP posts and JSON-RPC
+calls per method, so round trips show up in the benchmark report. LocalChain
+then deploys the mock mUSD, Wrapped BTC, factory, pair and router from
+contracts/Mocks.sol (compiled with py-solc-x) and funds the agent account.
+"""
+import json
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTRACTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "contracts", "Mocks.sol")
+SOLC_VERSION = "0.8.24"
+MEZO_CHAIN_ID = 31611
+
+INITIAL_BTC = 10 ** 20  # native balance given to the agent, in wei
+INITIAL_MUSD = 10 ** 24  # mUSD minted to the agent
+POOL_MUSD = 10 ** 26  # mUSD / Wrapped BTC liquidity in the pair
+POOL_WBTC = 10 ** 21
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# ---------------------------------------------------------------------- #
+# Counting proxy
+# ---------------------------------------------------------------------- #
+class RpcCounter:
+    """
+    Thread-safe tally of HTTP posts and JSON-RPC calls per method.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.posts = 0
+        self.methods = Counter()
+
+    def record(self, methods):
+        with self._lock:
+            self.posts += 1
+            self.methods.update(methods)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"posts": self.posts, "methods": dict(self.methods)}
+
+    @staticmethod
+    def diff(after: dict, before: dict) -> dict:
+        methods = {
+            m: n - before["methods"].get(m, 0)
+            for m, n in after["methods"].items()
+            if n - before["methods"].get(m, 0)
+        }
+        return {"posts": after["posts"] - before["posts"], "calls": sum(methods.values()), "methods": methods}
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        payload = json.loads(body)
+        requests = payload if isinstance(payload, list) else [payload]
+        self.server.counter.record(r.get("method") for r in requests)
+        data = json.dumps(self.server.forward(payload, body)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class RpcProxy:
+    """
+    JSON-RPC endpoint that counts every request before handing it to a backend.
+    """
+
+    def __init__(self, forward):
+        """
+        :param forward: Callable(payload, raw_body) returning the JSON-RPC response.
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _ProxyHandler)
+        self._server.daemon_threads = True
+        self._server.forward = forward
+        self._server.counter = RpcCounter()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def counter(self) -> RpcCounter:
+        return self._server.counter
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# ---------------------------------------------------------------------- #
+# Backends
+# ---------------------------------------------------------------------- #
+class AnvilBackend:
+    name = "anvil"
+
+    def __init__(self, chain_id: int = MEZO_CHAIN_ID):
+        port = _free_port()
+        self.upstream = f"http://127.0.0.1:{port}"
+        self.process = subprocess.Popen(
+            ["anvil", "--port", str(port), "--chain-id", str(chain_id), "--silent"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.time() + 30
+        while True:
+            try:
+                self.forward({"jsonrpc": "2.0", "id": 0, "method": "eth_chainId", "params": []})
+                break
+            except OSError:
+                if time.time() > deadline or self.process.poll() is not None:
+                    self.close()
+                    raise RuntimeError("anvil did not start")
+                time.sleep(0.1)
+
+    def forward(self, payload, body: bytes = None):
+        request = urllib.request.Request(
+            self.upstream,
+            data=body or json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait()
+
+
+def _jsonable(value):
+    """
+    Converts eth-tester results to JSON-RPC wire types (hex quantities and data).
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, int):
+        return hex(value)
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if isinstance(value, dict) or hasattr(value, "items"):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+class EthTesterBackend:
+    name = "eth-tester"
+
+    def __init__(self):
+        from web3 import EthereumTesterProvider
+
+        self.provider = EthereumTesterProvider()
+        self._lock = threading.Lock()  # py-evm is not thread-safe
+
+    def _call(self, request: dict) -> dict:
+        with self._lock:
+            try:
+                response = self.provider.make_request(request["method"], request.get("params", []))
+            except Exception as e:
+                response = {"error": {"code": -32000, "message": str(e)}}
+        response = dict(response, jsonrpc="2.0", id=request.get("id"))
+        if "result" in response:
+            response["result"] = _jsonable(response["result"])
+        return response
+
+    def forward(self, payload, body: bytes = None):
+        if isinstance(payload, list):
+            return [self._call(request) for request in payload]
+        return self._call(payload)
+
+    def close(self):
+        pass
+
+
+def start_backend(name: str = "auto"):
+    """
+    :param name: "anvil", "eth-tester" or "auto" (anvil when it is on PATH).
+    """
+    if name == "auto":
+        name = "anvil" if shutil.which("anvil") else "eth-tester"
+    if name == "anvil":
+        return AnvilBackend()
+    if name == "eth-tester":
+        return EthTesterBackend()
+    raise ValueError(f"Unknown chain backend '{name}'")
+
+
+# ---------------------------------------------------------------------- #
+# Contracts
+# ---------------------------------------------------------------------- #
+def compile_contracts() -> dict:
+    """
+    :return: {contract name: {"abi", "bin"}} for every contract in Mocks.sol.
+    """
+    import solcx
+
+    if SOLC_VERSION not in {str(v) for v in solcx.get_installed_solc_versions()}:
+        solcx.install_solc(SOLC_VERSION)
+    compiled = solcx.compile_files(
+        [CONTRACTS_PATH], output_values=["abi", "bin"], solc_version=SOLC_VERSION, optimize=True
+    )
+    return {key.split(":")[-1]: value for key, value in compiled.items()}
+
+
+class LocalChain:
+    """
+    A backend behind a counting proxy, with the mock tokens and router deployed.
+    """
+
+    def __init__(self, backend: str = "auto"):
+        from web3 import Web3
+
+        self.backend = start_backend(backend)
+        self.proxy = RpcProxy(self.backend.forward)
+        self.web3 = Web3(Web3.HTTPProvider(self.proxy.url))
+        self.chain_id = self.web3.eth.chain_id
+        self.addresses = {}
+
+    @property
+    def rpc_url(self) -> str:
+        return self.proxy.url
+
+    def _transact(self, call, sender: str):
+        tx_hash = call.transact({"from": sender})
+        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        if receipt.status != 1:
+            raise RuntimeError(f"Setup transaction {tx_hash.hex()} reverted")
+        return receipt
+
+    def deploy(self, agent_addresses) -> dict:
+        """
+        Deploys the mocks, seeds the mUSD / Wrapped BTC pool and funds the agent accounts.
+
+        :param agent_addresses: Accounts the tools will sign with.
+        :return: {"musd", "wbtc", "factory", "router", "pair"} checksum addresses.
+        """
+        w3 = self.web3
+        artifacts = compile_contracts()
+        deployer = w3.eth.accounts[0]
+
+        def deploy(name, *args):
+            factory = w3.eth.contract(abi=artifacts[name]["abi"], bytecode=artifacts[name]["bin"])
+            receipt = self._transact(factory.constructor(*args), deployer)
+            return w3.eth.contract(address=receipt.contractAddress, abi=artifacts[name]["abi"])
+
+        musd = deploy("MockERC20", "Mezo USD", "mUSD")
+        wbtc = deploy("MockERC20", "Wrapped Testnet BTC", "WTBTC")
+        factory = deploy("MockFactory")
+        router = deploy("MockRouter", factory.address)
+
+        self._transact(factory.functions.createPair(musd.address, wbtc.address), deployer)
+        pair_address = factory.functions.getPair(musd.address, wbtc.address).call()
+        pair = w3.eth.contract(address=pair_address, abi=artifacts["MockPair"]["abi"])
+        self._transact(musd.functions.mint(pair_address, POOL_MUSD), deployer)
+        self._transact(wbtc.functions.mint(pair_address, POOL_WBTC), deployer)
+        self._transact(pair.functions.sync(), deployer)
+
+        for address in agent_addresses:
+            tx_hash = w3.eth.send_transaction({"from": deployer, "to": address, "value": INITIAL_BTC})
+            w3.eth.wait_for_transaction_receipt(tx_hash)
+            self._transact(musd.functions.mint(address, INITIAL_MUSD), deployer)
+
+        self.addresses = {
+            "musd": musd.address,
+            "wbtc": wbtc.address,
+            "factory": factory.address,
+            "router": router.address,
+            "pair": pair_address,
+        }
+        return self.addresses
+
+    def pair_snapshot(self) -> dict:
+        """
+        :return: The deployed pair with its current reserves, for the subgraph stub.
+        """
+        reserves = self.web3.eth.call({"to": self.addresses["pair"], "data": "0x0902f1ac"})
+        token0 = min(self.addresses["musd"], self.addresses["wbtc"], key=lambda a: int(a, 16))
+        token1 = max(self.addresses["musd"], self.addresses["wbtc"], key=lambda a: int(a, 16))
+        return {
+            "id": self.addresses["pair"].lower(),
+            "token0": token0.lower(),
+            "token1": token1.lower(),
+            "reserve0": int.from_bytes(reserves[0:32], "big"),
+            "reserve1": int.from_bytes(reserves[32:64], "big"),
+        }
+
+    def close(self):
+        self.proxy.close()
+        self.backend.close()
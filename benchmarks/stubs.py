@@ -0,0 +1,215 @@
+"""
+Offline stand-ins for OpenAI and the Goldsky subgraph used by the tool benchmarks.
+"""
+import re
+import json
+import time
+import asyncio
+import threading
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_INPUT_RE = re.compile(r"(?:request|query):\n(.*?)(?:\n\n|$)", re.IGNORECASE | re.DOTALL)
+_AMOUNT_RE = re.compile(r"\d+(?:\.\d+)?")
+_ADDRESS_RE = re.compile(r"0x[0-9a-fA-F]{40}")
+_SYMBOLS = ("musd", "wtbtc", "btc")
+
+CHAT_REPLY = (
+    "Stack sats, stay humble. Mezo lets your Bitcoin work without leaving its home chain: "
+    "borrow mUSD against BTC, swap on Dumpy Swap and keep full custody the whole way."
+)
+
+
+def _user_input(prompt: str) -> str:
+    matches = _INPUT_RE.findall(prompt)
+    return matches[-1] if matches else prompt
+
+
+def _symbol(text: str) -> str:
+    lowered = text.lower()
+    return next((s.upper() for s in _SYMBOLS if re.search(rf"\b{s}\b", lowered)), "BTC")
+
+
+def scripted_reply(prompt: str) -> str:
+    """
+    Answers the tools' extraction prompts from the request text, and anything else with chat.
+    """
+    text = _user_input(prompt)
+    amount = (_AMOUNT_RE.findall(_ADDRESS_RE.sub("", text)) or ["1"])[0]
+    recipient = (_ADDRESS_RE.findall(text) or [None])[0]
+    if prompt.startswith("Classify the request"):
+        lowered = text.lower()
+        if recipient:
+            intent = "transfer"
+        elif "swap" in lowered or "trade" in lowered:
+            intent = "swap"
+        elif "balance" in lowered or "holding" in lowered:
+            intent = "balance"
+        elif "price" in lowered or "worth" in lowered:
+            intent = "price"
+        else:
+            intent = "chat"
+        currency = "mUSD" if "musd" in lowered else "BTC"
+        return json.dumps({
+            "intent": intent,
+            "amount": amount if intent in ("transfer", "swap") else None,
+            "currency": currency if intent == "transfer" else None,
+            "recipient": recipient,
+            "token_symbol": _symbol(text) if intent in ("balance", "price") else None,
+            "from_currency": "mUSD" if intent == "swap" else None,
+            "to_currency": "BTC" if intent == "swap" else None,
+        })
+    if prompt.startswith("Extract transaction details"):
+        currency = "mUSD" if "musd" in text.lower() else "BTC"
+        return "```json\n" + json.dumps({"amount": amount, "currency": currency, "recipient": recipient}) + "\n```"
+    if prompt.startswith("Extract swap transaction details"):
+        details = {"amount": amount, "from_currency": "mUSD", "to_currency": "BTC", "router_address": ""}
+        return "```json\n" + json.dumps(details) + "\n```"
+    if prompt.startswith("Output a JSON object with the following key"):
+        return json.dumps({"token_symbol": _symbol(text)})
+    return CHAT_REPLY
+
+
+class FakeChatOpenAI:
+    """
+    Drop-in for ChatOpenAI: scripted answers after a configurable latency.
+
+    invoke() sleeps for latency; stream() yields the first chunk after ttft and spreads
+    the rest of the latency over the remaining chunks.
+    """
+
+    def __init__(self, latency: float = 0.5, ttft: float = None, temperature: float = 0):
+        """
+        :param latency: Seconds per completion.
+        :param ttft: Seconds to the first streamed chunk (defaults to a quarter of latency).
+        :param temperature: Reported temperature (0 lets the LLM cache wrap it).
+        """
+        self.latency = latency
+        self.ttft = latency / 4 if ttft is None else ttft
+        self.temperature = temperature
+        self.model_name = "fake-chat"
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _reply(self, prompt) -> str:
+        with self._lock:
+            self.calls += 1
+        if not isinstance(prompt, str):
+            prompt = "\n".join(getattr(m, "content", str(m)) for m in prompt)
+        return scripted_reply(prompt)
+
+    def _chunks(self, prompt):
+        words = self._reply(prompt).split(" ")
+        return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+    def invoke(self, prompt, **kwargs):
+        from langchain_core.messages import AIMessage
+
+        time.sleep(self.latency)
+        return AIMessage(content=self._reply(prompt))
+
+    async def ainvoke(self, prompt, **kwargs):
+        from langchain_core.messages import AIMessage
+
+        await asyncio.sleep(self.latency)
+        return AIMessage(content=self._reply(prompt))
+
+    def stream(self, prompt, **kwargs):
+        from langchain_core.messages import AIMessageChunk
+
+        chunks = self._chunks(prompt)
+        delay = max(self.latency - self.ttft, 0) / max(len(chunks) - 1, 1)
+        time.sleep(self.ttft)
+        for i, chunk in enumerate(chunks):
+            if i:
+                time.sleep(delay)
+            yield AIMessageChunk(content=chunk)
+
+    async def astream(self, prompt, **kwargs):
+        from langchain_core.messages import AIMessageChunk
+
+        chunks = self._chunks(prompt)
+        delay = max(self.latency - self.ttft, 0) / max(len(chunks) - 1, 1)
+        await asyncio.sleep(self.ttft)
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(delay)
+            yield AIMessageChunk(content=chunk)
+
+
+class _GraphHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        data = json.dumps(self.server.stub.answer(body.get("query", ""))).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class GraphStub:
+    """
+    Local HTTP stand-in for the exchange subgraph (GRAPH_URL).
+
+    Answers the tokens (paged or id_in) and pairs queries the tools send from a fixed
+    token list and pair snapshot; any other entity returns an empty list.
+    """
+
+    def __init__(self, tokens: list, pairs: list, latency: float = 0.05):
+        """
+        :param tokens: {"id", "symbol", "decimals", "derivedUSD", "derivedETH"} dicts.
+        :param pairs: {"id", "token0", "token1", "reserve0", "reserve1"} dicts with raw reserves.
+        :param latency: Seconds added to every response.
+        """
+        self.tokens = sorted(({**t, "id": t["id"].lower()} for t in tokens), key=lambda t: t["id"])
+        self.pairs = sorted(pairs, key=lambda p: p["id"])
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _GraphHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def answer(self, query: str) -> dict:
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.latency)
+        root = re.search(r"\{\s*(\w+)", query)
+        root = root.group(1) if root else "data"
+        last_id = re.search(r'id_gt:\s*"([^"]*)"', query)
+        last_id = last_id.group(1).lower() if last_id else ""
+
+        if root == "tokens":
+            id_in = re.search(r"id_in:\s*\[(.*?)\]", query, re.DOTALL)
+            if id_in:
+                wanted = {i.lower() for i in re.findall(r'"([^"]+)"', id_in.group(1))}
+                rows = [t for t in self.tokens if t["id"] in wanted]
+            else:
+                rows = [t for t in self.tokens if t["id"] > last_id]
+        elif root == "pairs":
+            decimals = {t["id"]: int(t["decimals"]) for t in self.tokens}
+            rows = []
+            for p in self.pairs:
+                if p["id"] <= last_id:
+                    continue
+                d0, d1 = decimals.get(p["token0"], 18), decimals.get(p["token1"], 18)
+                rows.append({
+                    "id": p["id"],
+                    "reserve0": str(Decimal(p["reserve0"]).scaleb(-d0)),
+                    "reserve1": str(Decimal(p["reserve1"]).scaleb(-d1)),
+                    "token0": {"id": p["token0"], "decimals": str(d0)},
+                    "token1": {"id": p["token1"], "decimals": str(d1)},
+                })
+        else:
+            rows = []
+        return {"data": {root: rows}}
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,241 @@
+"""
+Offline benchmark for the mezo_agent tools.
+
+Runs the real tool functions against a local chain (anvil, or eth-tester on py-evm)
+with mock mUSD, Wrapped BTC and a Uniswap-v2 style router deployed, a fake ChatOpenAI
+with configurable latency and a local stub for the subgraph (GRAPH_URL). Nothing
+touches testnet, OpenAI or Goldsky. For each tool it reports p50/p99 latency,
+throughput, and JSON-RPC, subgraph and LLM round trips per call, so a change in
+round-trip counts shows up in the numbers. Counts include background work started by
+earlier calls (e.g. receipt polling), as they would in a running agent.
+
+Run from the repository root:
+
+    pip install -e ".[bench]"
+    python benchmarks/tool_bench.py --iterations 50 --llm-latency 0.3
+    python benchmarks/tool_bench.py --chain eth-tester --tools price,balance --json out.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from local_chain import LocalChain, RpcCounter  # noqa: E402
+from stubs import FakeChatOpenAI, GraphStub  # noqa: E402
+
+RECIPIENT = "0x000000000000000000000000000000000000bEEF"
+TOKEN_PRICES = {"musd": ("1.0", "0.00001"), "wtbtc": ("100000.0", "1.0")}
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def _set_environment(workdir: str, private_key: str, llm_cache: bool):
+    """
+    Keeps every cache the tools write inside workdir and hands them the agent key.
+    Must run before mezo_agent modules that read these at import are loaded.
+    """
+    os.environ.update({
+        "PRIVATE_KEY": private_key,
+        "OPENAI_API_KEY": "offline-benchmark",
+        "MEZO_TOKEN_CACHE": os.path.join(workdir, "tokens.json"),
+        "MEZO_LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.sqlite"),
+        "MEZO_HISTORY_DIR": os.path.join(workdir, "history"),
+        "MEZO_INDEX_DB": os.path.join(workdir, "index.sqlite"),
+        "MEZO_LLM_CACHE": "memory" if llm_cache else "off",
+    })
+    os.environ.pop("PRIVATE_KEYS", None)
+    os.environ.pop("MEZO_KEYSTORE_DIR", None)
+
+
+def _point_config_at(chain: LocalChain, graph: GraphStub):
+    """
+    Repoints the module constants at the local chain and subgraph stub. Tool modules
+    import some of these by name, so this runs before any of them is imported.
+    """
+    from mezo_agent import config
+
+    config.RPC_URL = chain.rpc_url
+    config.CHAIN_ID = chain.chain_id
+    config.GRAPH_URL = graph.url
+    config.MUSD_ADDRESS = chain.addresses["musd"]
+    config.WRAPPED_BTC_ADDRESS = chain.addresses["wbtc"]
+    config.ROUTER_ADDRESS = chain.addresses["router"]
+
+
+def build_scenarios(batch_size: int) -> dict:
+    """
+    :return: {name: callable(iteration) -> tool result string}.
+    """
+    from mezo_agent import (
+        mezo_agent_token_price_tool,
+        mezo_agent_token_balance_tool,
+        mezo_character_chat,
+        mezo_agent_transaction_btc,
+        mezo_agent_musd_transaction,
+        mezo_agent_swap_musd_btc,
+        run_intent,
+    )
+    from mezo_agent.batch_payout import batch_payout
+
+    def payout(i):
+        results = list(batch_payout([(RECIPIENT, 0.0001, "btc")] * batch_size))
+        failed = [r["error"] for r in results if "error" in r]
+        return failed[0] if failed else f"✅ {len(results)} payouts"
+
+    return {
+        "price": lambda i: mezo_agent_token_price_tool.invoke("What is the price of BTC?"),
+        "balance": lambda i: mezo_agent_token_balance_tool.invoke("What is my mUSD balance?"),
+        "chat": lambda i: mezo_character_chat.invoke({"prompt": f"What is Mezo? ({i})", "character": "DigAIJoe"}),
+        "chat_cached": lambda i: mezo_character_chat.invoke({"prompt": "What is Mezo?", "character": "DigAIJoe"}),
+        "transfer_btc": lambda i: mezo_agent_transaction_btc.invoke(f"Send 0.0001 BTC to {RECIPIENT}"),
+        "transfer_musd": lambda i: mezo_agent_musd_transaction.invoke(f"Send 1 mUSD to {RECIPIENT}"),
+        "swap": lambda i: mezo_agent_swap_musd_btc.invoke("Swap 1 mUSD for BTC"),
+        "intent_llm": lambda i: run_intent(f"Could you move 0.0001 BTC over to {RECIPIENT} for me?"),
+        "batch_payout": payout,
+    }
+
+
+def run_scenario(name, fn, iterations, warmup, concurrency, chain, graph, llm) -> dict:
+    for i in range(warmup):
+        fn(iterations + i)  # Distinct from the measured iterations, so nothing is pre-cached
+
+    rpc_before, graph_before, llm_before = chain.proxy.counter.snapshot(), graph.requests, llm.calls
+    latencies, errors = [], []
+
+    def timed(i):
+        start = time.perf_counter()
+        try:
+            result = str(fn(i))
+        except Exception as e:
+            result = f"❌ {type(e).__name__}: {e}"
+        latencies.append(time.perf_counter() - start)
+        if result.startswith("❌"):
+            errors.append(result)
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(timed, range(iterations)))
+    else:
+        for i in range(iterations):
+            timed(i)
+    elapsed = time.perf_counter() - start
+
+    rpc = RpcCounter.diff(chain.proxy.counter.snapshot(), rpc_before)
+    return {
+        "tool": name,
+        "iterations": iterations,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "throughput": iterations / elapsed if elapsed else 0.0,
+        "rpc_calls": rpc["calls"] / iterations,
+        "rpc_posts": rpc["posts"] / iterations,
+        "rpc_methods": {m: n / iterations for m, n in sorted(rpc["methods"].items())},
+        "graph_queries": (graph.requests - graph_before) / iterations,
+        "llm_calls": (llm.calls - llm_before) / iterations,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def print_report(results: list, verbose: bool):
+    header = f"{'tool':<15}{'p50 ms':>10}{'p99 ms':>10}{'ops/s':>9}{'rpc/op':>9}{'posts/op':>10}{'graph/op':>10}{'llm/op':>8}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['tool']:<15}{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['throughput']:>9.1f}"
+            f"{r['rpc_calls']:>9.1f}{r['rpc_posts']:>10.1f}{r['graph_queries']:>10.1f}"
+            f"{r['llm_calls']:>8.1f}{r['errors']:>8}"
+        )
+        if verbose:
+            for method, n in r["rpc_methods"].items():
+                print(f"    {method:<32}{n:>8.2f}/op")
+        if r["first_error"]:
+            print(f"    first error: {r['first_error'][:120]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the mezo_agent tools offline.")
+    parser.add_argument("--chain", default="auto", choices=["auto", "anvil", "eth-tester"], help="Local chain backend.")
+    parser.add_argument("--tools", default="", help="Comma-separated scenarios (default: all).")
+    parser.add_argument("--iterations", type=int, default=20, help="Measured calls per tool.")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured calls per tool first.")
+    parser.add_argument("--concurrency", type=int, default=1, help="Calls in flight per tool.")
+    parser.add_argument("--batch-size", type=int, default=20, help="Payouts per batch_payout call.")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per fake LLM completion.")
+    parser.add_argument("--graph-latency", type=float, default=0.05, help="Seconds per subgraph response.")
+    parser.add_argument("--no-llm-cache", action="store_true", help="Disable the LLM response cache.")
+    parser.add_argument("--verbose", action="store_true", help="Show JSON-RPC calls per method.")
+    parser.add_argument("--show-output", action="store_true", help="Let the tools print while they run.")
+    parser.add_argument("--json", help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    from eth_account import Account
+
+    agent = Account.create()
+    workdir = tempfile.mkdtemp(prefix="mezo-bench-")
+    _set_environment(workdir, agent.key.hex(), not args.no_llm_cache)
+
+    chain = LocalChain(args.chain)
+    graph = None
+    try:
+        print(f"Deploying mocks on {chain.backend.name} ...")
+        addresses = chain.deploy([agent.address])
+        tokens = [
+            {"id": addresses["musd"], "symbol": "mUSD", "decimals": "18",
+             "derivedUSD": TOKEN_PRICES["musd"][0], "derivedETH": TOKEN_PRICES["musd"][1]},
+            {"id": addresses["wbtc"], "symbol": "WTBTC", "decimals": "18",
+             "derivedUSD": TOKEN_PRICES["wtbtc"][0], "derivedETH": TOKEN_PRICES["wtbtc"][1]},
+        ]
+        graph = GraphStub(tokens, [chain.pair_snapshot()], latency=args.graph_latency)
+        _point_config_at(chain, graph)
+
+        from mezo_agent import MezoContext, set_context
+        from mezo_agent.llm_cache import wrap_llm
+
+        llm = FakeChatOpenAI(latency=args.llm_latency)
+        set_context(MezoContext(
+            rpc_url=chain.rpc_url,
+            private_key=agent.key.hex(),
+            llm=wrap_llm(llm),
+            creative_llm=FakeChatOpenAI(latency=args.llm_latency, temperature=0.9),
+        ))
+
+        scenarios = build_scenarios(args.batch_size)
+        selected = [t.strip() for t in args.tools.split(",") if t.strip()] or list(scenarios)
+        unknown = [t for t in selected if t not in scenarios]
+        if unknown:
+            parser.error(f"unknown tools: {', '.join(unknown)} (choose from {', '.join(scenarios)})")
+
+        results = []
+        for name in selected:
+            print(f"Running {name} ...", file=sys.stderr)
+            # The tools log with print(); keep it out of the report unless asked for
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(sys.stdout if args.show_output else devnull):
+                results.append(run_scenario(
+                    name, scenarios[name], args.iterations, args.warmup, args.concurrency, chain, graph, llm
+                ))
+        print_report(results, args.verbose)
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"chain": chain.backend.name, "args": vars(args), "results": results}, f, indent=2)
+    finally:
+        if graph is not None:
+            graph.close()
+        chain.close()
+
+
+if __name__ == "__main__":
+    main()
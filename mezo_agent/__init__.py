@@ -1,18 +1,56 @@
-from .transaction import mezo_agent_transaction_btc, mezo_agent_musd_transaction
-from .swap_musd_btc import mezo_agent_swap_musd_btc
-from .chat import mezo_character_chat
-from .characters import get_character_prompt
-from .token_balance_tool import mezo_agent_token_balance_tool
-from .token_price_tool import mezo_agent_token_price_tool
-from .safe_mode_btc_tool import mezo_agent_safe_mode_btc_transaction
-
-__all__ = [
-    "mezo_agent_transaction_btc",
-    "mezo_agent_musd_transaction",
-    "mezo_agent_swap_musd_btc",
-    "mezo_character_chat",
-    "mezo_agent_token_balance_tool",
-    "mezo_agent_token_price_tool",
-    "mezo_agent_safe_mode_btc_transaction", 
-    "get_character_prompt"
-]
+import importlib
+
+from .config import load_env
+
+# Settings such as MEZO_SLIPPAGE_BPS are read when their module is imported, so `.env`
+# is loaded before any submodule. This only reads the file; nothing touches the network.
+load_env()
+
+# Public names and the submodule that defines each one. Submodules are imported on
+# first attribute access, so `import mezo_agent` does not pull in LangChain or Web3.
+_EXPORTS = {
+    "mezo_agent_transaction_btc": ".transaction",
+    "mezo_agent_musd_transaction": ".transaction",
+    "mezo_agent_swap_musd_btc": ".swap_musd_btc",
+    "mezo_character_chat": ".chat",
+    "stream_character_chat": ".chat",
+    "astream_character_chat": ".chat",
+    "mezo_agent_token_balance_tool": ".token_balance_tool",
+    "mezo_agent_token_price_tool": ".token_price_tool",
+    "mezo_agent_safe_mode_btc_transaction": ".safe_mode_btc_tool",
+    "mezo_agent_batch_payout": ".batch_payout",
+    "load_payouts": ".batch_payout",
+    "extract_intent": ".intent",
+    "run_intent": ".intent",
+    "get_portfolio": ".portfolio",
+    "PriceFeed": ".price_feed",
+    "HistoryStore": ".history",
+    "LogIndexer": ".indexer",
+    "SignerPool": ".signer_pool",
+    "BulkSigner": ".bulk_signing",
+    "sign_transactions": ".bulk_signing",
+    "get_llm_cache_stats": ".llm_cache",
+    "get_streaming_stats": ".streaming",
+    "invoke_with_trace": ".telemetry",
+    "get_metrics": ".telemetry",
+    "prometheus_text": ".telemetry",
+    "serve_metrics": ".telemetry",
+    "get_character_prompt": ".characters",
+    "MezoContext": ".context",
+    "get_context": ".context",
+    "set_context": ".context",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,212 @@
+import threading
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+from . import config
+from .nonce_manager import nonce_manager
+from .gas_oracle import gas_oracle
+from .receipts import receipt_watcher
+
+MAX_UINT256 = 2**256 - 1
+APPROVE_GAS_FALLBACK = 50000
+DEFAULT_POLICY = "max"
+
+# keccak256("Approval(address,address,uint256)")
+APPROVAL_TOPIC = "0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"
+
+Key = Tuple[str, str, str]  # (owner, token, spender), lowercase
+
+
+def parse_policy(policy: str) -> Tuple[str, Optional[Decimal]]:
+    """
+    Parses an approval policy string.
+
+    :param policy: 'exact', 'max' or 'budget:<token amount>' (e.g. 'budget:5000').
+    :return: (kind, budget) where budget is only set for 'budget'.
+    """
+    policy = policy.strip().lower()
+    if policy in ("exact", "max"):
+        return policy, None
+    if policy.startswith("budget:"):
+        try:
+            return "budget", Decimal(policy.split(":", 1)[1])
+        except ArithmeticError:
+            pass
+    raise ValueError(f"❌ Invalid approval policy '{policy}'. Use 'exact', 'max' or 'budget:<amount>'.")
+
+
+class AllowanceManager:
+    """
+    Caches ERC-20 allowances per (owner, token, spender) so swaps skip the allowance call.
+
+    The chain is read only the first time a key is needed, or when the cached value is
+    too small (it may have been raised elsewhere). The cache then follows our own
+    approvals and spends, plus any Approval logs fed in from receipts or an indexer.
+    How much to approve is set by the policy (MEZO_APPROVAL_POLICY):
+    - exact: approve just the amount needed (an approval before every swap)
+    - max: approve 2**256-1 once (no further approvals)
+    - budget:<amount>: approve max(needed, amount) tokens at a time
+    """
+
+    def __init__(self, policy: Optional[str] = None):
+        """
+        :param policy: Approval policy (defaults to MEZO_APPROVAL_POLICY or 'max').
+        """
+        self.policy, self.budget = parse_policy(policy or config.get_env("MEZO_APPROVAL_POLICY") or DEFAULT_POLICY)
+        self._allowances: Dict[Key, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(owner: str, token: str, spender: str) -> Key:
+        return owner.lower(), token.lower(), spender.lower()
+
+    # ------------------------------------------------------------------ #
+    # Cache
+    # ------------------------------------------------------------------ #
+    def allowance(self, token_contract, spender: str, owner: Optional[str] = None, refresh: bool = False) -> int:
+        """
+        :return: The cached allowance, read from the chain on first use or when refresh is set.
+        """
+        owner = owner or config.sender_address
+        key = self._key(owner, token_contract.address, spender)
+        if refresh or key not in self._allowances:
+            value = token_contract.functions.allowance(owner, spender).call()
+            with self._lock:
+                self._allowances[key] = value
+        return self._allowances[key]
+
+    def record_approval(self, token: str, spender: str, amount: int, owner: Optional[str] = None):
+        """
+        Sets the cached allowance after an approve() we sent or observed.
+        """
+        with self._lock:
+            self._allowances[self._key(owner or config.sender_address, token, spender)] = amount
+
+    def record_spend(self, token: str, spender: str, amount: int, owner: Optional[str] = None):
+        """
+        Deducts a transferFrom by the spender (e.g. a router swap) from the cached allowance.
+        Infinite (max) approvals are not decremented by standard ERC-20 implementations.
+        """
+        key = self._key(owner or config.sender_address, token, spender)
+        with self._lock:
+            current = self._allowances.get(key)
+            if current is not None and current != MAX_UINT256:
+                self._allowances[key] = max(current - amount, 0)
+
+    def invalidate(self, token: Optional[str] = None, spender: Optional[str] = None, owner: Optional[str] = None):
+        """
+        Drops cached allowances (all of them when no filter is given) so the next use re-reads the chain.
+        """
+        with self._lock:
+            for key in list(self._allowances):
+                if (
+                    (owner is None or key[0] == owner.lower())
+                    and (token is None or key[1] == token.lower())
+                    and (spender is None or key[2] == spender.lower())
+                ):
+                    del self._allowances[key]
+
+    def apply_logs(self, logs: Iterable[dict]):
+        """
+        Updates cached allowances from Approval event logs (raw JSON-RPC or web3 log dicts).
+        Only keys already in the cache are touched.
+        """
+        for log in logs:
+            topics = [t if isinstance(t, str) else "0x" + bytes(t).hex() for t in log.get("topics", [])]
+            if len(topics) != 3 or topics[0].lower().replace("0x", "") != APPROVAL_TOPIC[2:]:
+                continue
+            owner = "0x" + topics[1][-40:]
+            spender = "0x" + topics[2][-40:]
+            data = log.get("data") or "0x0"
+            value = int(data, 16) if isinstance(data, str) else int.from_bytes(data, "big")
+            key = self._key(owner, log["address"], spender)
+            with self._lock:
+                if key in self._allowances:
+                    self._allowances[key] = value
+
+    # ------------------------------------------------------------------ #
+    # Approvals
+    # ------------------------------------------------------------------ #
+    def approval_amount(self, required: int, decimals: int = 18) -> int:
+        """
+        :return: The amount to approve for a required allowance under the current policy.
+        """
+        if self.policy == "max":
+            return MAX_UINT256
+        if self.policy == "budget":
+            return max(required, int(self.budget * (Decimal(10) ** decimals)))
+        return required
+
+    def ensure_allowance(self, token_contract, spender: str, amount: int, decimals: int = 18, signer=None):
+        """
+        Makes sure spender may move amount of our tokens, approving under the policy if not.
+
+        The approval is not waited on: anything sent after it uses a later nonce and so
+        executes after it. The cache is updated optimistically and corrected from the
+        receipt's Approval log (or dropped if the approval fails).
+
+        :param signer: Owning pool account (defaults to the configured sender).
+        :return: The approval transaction hash, or None if the allowance already sufficed.
+        """
+        owner = signer.address if signer is not None else config.sender_address
+        manager = signer.nonce_manager if signer is not None else nonce_manager
+        if self.allowance(token_contract, spender, owner) >= amount:
+            return None
+        # The cached value may be stale if the allowance was raised elsewhere
+        current = self.allowance(token_contract, spender, owner, refresh=True)
+        if current >= amount:
+            return None
+
+        approve_amount = self.approval_amount(amount, decimals)
+        print(f"Current allowance ({current}) is less than required ({amount}). Approving {approve_amount}...")
+        approve_call = token_contract.functions.approve(spender, approve_amount)
+        try:
+            gas_limit = gas_oracle.estimate_gas({
+                "to": token_contract.address,
+                "from": owner,
+                "data": token_contract.encode_abi("approve", args=[spender, approve_amount]),
+            })
+        except Exception:
+            gas_limit = APPROVE_GAS_FALLBACK
+        fees = gas_oracle.fee_params()
+        nonce = manager.next_nonce()
+        try:
+            approve_tx = approve_call.build_transaction({
+                "from": owner,
+                "nonce": nonce,
+                "gas": gas_limit,
+                **fees,
+            })
+        except Exception:
+            manager.release(nonce)
+            raise
+
+        def sign(tx_nonce: int) -> bytes:
+            if signer is not None:
+                signed_tx = signer.sign(dict(approve_tx, nonce=tx_nonce))
+            else:
+                signed_tx = config.web3_instance.eth.account.sign_transaction(dict(approve_tx, nonce=tx_nonce), config.PRIVATE_KEY)
+            return signed_tx.raw_transaction
+
+        tx_hash = manager.send(sign, nonce=nonce)
+        self.record_approval(token_contract.address, spender, approve_amount, owner)
+        print(f"Approval submitted. TX Hash: {tx_hash.hex()}")
+
+        def on_confirmed(receipt):
+            if receipt.status == 1:
+                self.apply_logs(receipt.get("logs", []))
+                print(f"Approval successful. TX Hash: {tx_hash.hex()}")
+            else:
+                self.invalidate(token_contract.address, spender, owner)
+                gas_oracle.check_receipt(receipt, approve_tx["gas"])
+                print(f"❌ Approval failed. TX Hash: {tx_hash.hex()}")
+
+        receipt_watcher.watch(
+            tx_hash,
+            on_confirmed=on_confirmed,
+            on_dropped=lambda h: self.invalidate(token_contract.address, spender, owner),
+        )
+        return tx_hash
+
+
+# Shared allowance cache used by the swap tool
+allowance_manager = AllowanceManager()
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+from typing import Optional
+from web3 import Web3
+from . import config
+from .config import CHAIN_ID, MUSD_ADDRESS
+from .gas_oracle import gas_oracle, max_fee_per_gas
+from .signer_pool import signer_pool, Signer, TRANSFER_GAS, TOKEN_TRANSFER_GAS
+from .telemetry import bind_coroutine
+
+# A single long-lived event loop serves the sync tool wrappers, so the async
+# provider's HTTP session (and its keep-alive connections) is reused across calls.
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="mezo-agent-async", daemon=True).start()
+        return _loop
+
+
+def run_sync(coro):
+    """
+    Runs a coroutine to completion from synchronous code (including code that is
+    itself called from inside a running event loop) and returns its result.
+    """
+    # The coroutine runs on the loop's thread, so it is bound to the caller's trace
+    return asyncio.run_coroutine_threadsafe(bind_coroutine(coro), _background_loop()).result()
+
+
+async def send_btc_async(amount: float, recipient: str, signer: Optional[Signer] = None) -> str:
+    """
+    Sends BTC on Mezo Matsnet. Balance, nonce, fees and gas estimate are fetched
+    concurrently (fees and estimates usually come from the gas oracle's cache),
+    so the critical path is one round trip plus signing.
+
+    :param amount: Amount of BTC to send.
+    :param recipient: Recipient wallet address.
+    :param signer: Sending account (defaults to the least busy funded account in the signer pool).
+    :return: Result message with the transaction hash.
+    """
+    # Convert amount to Wei (BTC uses 18 decimals on Mezo Matsnet)
+    amount_wei = Web3.to_wei(amount, "ether")
+    if signer is None:
+        # Only pick an account that can also pay for gas
+        try:
+            fees = await gas_oracle.fee_params_async(config.async_web3_instance)
+        except Exception as e:
+            return f"❌ Failed to prepare BTC transaction: {str(e)}"
+        try:
+            signer = signer_pool.select(min_balance=amount_wei + TRANSFER_GAS * max_fee_per_gas(fees))
+        except ValueError as e:  # No keys configured
+            return str(e)
+        try:
+            return await send_btc_async(amount, recipient, signer)
+        finally:
+            signer_pool.release(signer)
+
+    w3 = config.async_web3_instance
+    nonce_manager = signer.nonce_manager
+
+    sender_balance, nonce, fees, gas_limit = await asyncio.gather(
+        w3.eth.get_balance(signer.address),
+        nonce_manager.next_nonce_async(w3),
+        gas_oracle.fee_params_async(w3),
+        gas_oracle.estimate_gas_async(w3, {"to": recipient, "value": amount_wei, "from": signer.address}),
+        return_exceptions=True,
+    )
+
+    error = next((r for r in (sender_balance, nonce, fees, gas_limit) if isinstance(r, Exception)), None)
+    if error is None and sender_balance < amount_wei:
+        sender_balance_btc = Web3.from_wei(sender_balance, "ether")
+        error = f"❌ Insufficient BTC balance! You have {sender_balance_btc} BTC but need {amount} BTC."
+    if error is not None:
+        if not isinstance(nonce, Exception):
+            nonce_manager.release(nonce)
+        return error if isinstance(error, str) else f"❌ Failed to prepare BTC transaction: {str(error)}"
+
+    tx = {
+        "to": recipient,
+        "value": amount_wei,
+        "gas": gas_limit,
+        "chainId": CHAIN_ID,
+        **fees,
+    }
+
+    def sign(tx_nonce: int) -> bytes:
+        return signer.sign(dict(tx, nonce=tx_nonce)).raw_transaction
+
+    try:
+        # Sign and send the transaction, resyncing the nonce if the node rejects it
+        tx_hash = await nonce_manager.send_async(w3, sign, nonce=nonce)
+        signer.debit(amount_wei + gas_limit * max_fee_per_gas(fees))
+        return f"✅ BTC Transaction Successful! Hash: {tx_hash.hex()}"
+    except Exception as e:
+        return f"❌ BTC Transaction Failed: {str(e)}"
+
+
+async def send_musd_async(amount: float, recipient: str, signer: Optional[Signer] = None) -> str:
+    """
+    Sends mUSD on Mezo Matsnet. Nonce, fees and gas estimate are fetched
+    concurrently before the transfer is signed and broadcast.
+
+    :param amount: Amount of mUSD to send.
+    :param recipient: Recipient wallet address.
+    :param signer: Sending account (defaults to the least busy account in the signer pool holding enough mUSD).
+    :return: Result message with the transaction hash.
+    """
+    # Convert the mUSD amount to its smallest unit (assumes 18 decimals, similar to ETH)
+    amount_token = Web3.to_wei(amount, "ether")
+    if signer is None:
+        # Only pick an account that can also pay for gas
+        try:
+            fees = await gas_oracle.fee_params_async(config.async_web3_instance)
+        except Exception as e:
+            return f"❌ Failed to prepare mUSD transaction: {str(e)}"
+        try:
+            signer = signer_pool.select(
+                min_balance=TOKEN_TRANSFER_GAS * max_fee_per_gas(fees),
+                token=MUSD_ADDRESS,
+                min_token_balance=amount_token,
+            )
+        except ValueError as e:  # No keys configured
+            return str(e)
+        try:
+            return await send_musd_async(amount, recipient, signer)
+        finally:
+            signer_pool.release(signer)
+
+    w3 = config.async_web3_instance
+    nonce_manager = signer.nonce_manager
+    transfer = config.async_musd_contract.functions.transfer(recipient, amount_token)
+    estimate_tx = {
+        "to": config.async_musd_contract.address,
+        "from": signer.address,
+        "data": config.async_musd_contract.encode_abi("transfer", args=[recipient, amount_token]),
+    }
+
+    nonce, fees, gas_limit = await asyncio.gather(
+        nonce_manager.next_nonce_async(w3),
+        gas_oracle.fee_params_async(w3),
+        gas_oracle.estimate_gas_async(w3, estimate_tx),
+        return_exceptions=True,
+    )
+
+    try:
+        error = next((r for r in (nonce, fees, gas_limit) if isinstance(r, Exception)), None)
+        if error is not None:
+            raise error
+        # All fields are supplied, so building the transaction makes no RPC calls
+        tx = await transfer.build_transaction({
+            "chainId": CHAIN_ID,
+            "from": signer.address,
+            "nonce": nonce,
+            "gas": gas_limit,
+            **fees,
+        })
+    except Exception as e:
+        if not isinstance(nonce, Exception):
+            nonce_manager.release(nonce)
+        return f"❌ Failed to prepare mUSD transaction: {str(e)}"
+
+    def sign(tx_nonce: int) -> bytes:
+        return signer.sign(dict(tx, nonce=tx_nonce)).raw_transaction
+
+    try:
+        # Sign and send the transaction, resyncing the nonce if the node rejects it
+        tx_hash = await nonce_manager.send_async(w3, sign, nonce=nonce)
+        signer.debit(amount_token, token=MUSD_ADDRESS)
+        signer.debit(gas_limit * max_fee_per_gas(fees))
+        return f"✅ mUSD Transaction Successful! Hash: {tx_hash.hex()}"
+    except Exception as e:
+        return f"❌ mUSD Transaction Failed: {str(e)}"
@@ -0,0 +1,332 @@
+import csv
+import json
+from concurrent.futures import as_completed
+from typing import Iterable, Iterator, List, Union
+from langchain.tools import tool
+from web3 import Web3
+from . import config
+from .nonce_manager import nonce_manager, is_already_known
+from .gas_oracle import gas_oracle, max_fee_per_gas
+from .receipts import receipt_watcher
+from .rpc_batch import DEFAULT_BATCH_SIZE, RpcError, rpc_batch
+
+DEFAULT_MAX_CONCURRENCY = 16  # broadcasts per JSON-RPC batch
+BULK_SIGN_THRESHOLD = 1000  # batches at least this large are signed in worker processes
+TOKEN_GAS_HEADROOM = 1.2
+FRESH_HOLDER_GAS = 20000  # first balance of a new holder: zero-to-nonzero SSTORE
+SUPPORTED_CURRENCIES = {"btc", "musd"}
+
+Payout = Union[dict, tuple, list]
+
+
+def load_payouts(path: str) -> List[dict]:
+    """
+    Loads payouts from a CSV file (header: recipient,amount,currency) or a JSONL file
+    with one {"recipient", "amount", "currency"} object per line.
+
+    :param path: Path to a .csv or .jsonl file.
+    :return: List of payout dictionaries.
+    """
+    with open(path, "r", newline="") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            return [json.loads(line) for line in f if line.strip()]
+        return [dict(row) for row in csv.DictReader(f)]
+
+
+def _normalize(index: int, payout: Payout) -> dict:
+    if isinstance(payout, dict):
+        recipient, amount, currency = payout.get("recipient"), payout.get("amount"), payout.get("currency")
+    else:
+        recipient, amount, currency = (list(payout) + [None] * 3)[:3]
+    item = {"index": index, "recipient": recipient, "amount": amount, "currency": str(currency or "").strip().lower()}
+    try:
+        item["recipient"] = Web3.to_checksum_address(str(recipient).strip())
+        item["amount"] = float(amount)
+        if item["amount"] <= 0:
+            raise ValueError("amount must be positive")
+        if item["currency"] not in SUPPORTED_CURRENCIES:
+            raise ValueError(f"unsupported currency '{currency}'")
+        item["amount_wei"] = Web3.to_wei(item["amount"], "ether")
+    except Exception as e:
+        item["error"] = f"❌ Invalid payout: {str(e)}"
+    return item
+
+
+def _estimate_gas_by_shape(items: List[dict]) -> dict:
+    """
+    Estimates gas once per transaction shape (native transfer vs mUSD transfer),
+    using the first payout of each shape as the sample.
+    """
+    gas = {}
+    for item in items:
+        currency = item["currency"]
+        if currency in gas:
+            continue
+        if currency == "btc":
+            gas[currency] = gas_oracle.estimate_gas({
+                "to": item["recipient"], "value": item["amount_wei"], "from": config.sender_address,
+            })
+        else:
+            estimate = gas_oracle.estimate_gas({
+                "to": config.MUSD_ADDRESS,
+                "from": config.sender_address,
+                "data": config.musd_contract.encode_abi("transfer", args=[item["recipient"], item["amount_wei"]]),
+            })
+            # The sample may already hold mUSD while other recipients do not
+            gas[currency] = int(estimate * TOKEN_GAS_HEADROOM) + FRESH_HOLDER_GAS
+    return gas
+
+
+def _check_funds(items: List[dict], gas: dict, fees: dict):
+    """
+    Fails the whole batch up front if the sender cannot cover it, since a rejected
+    transaction in the middle would leave every later nonce stuck.
+    """
+    w3 = config.web3_instance
+    btc_needed = sum(item["amount_wei"] for item in items if item["currency"] == "btc")
+    btc_needed += sum(gas[item["currency"]] * max_fee_per_gas(fees) for item in items)
+    musd_needed = sum(item["amount_wei"] for item in items if item["currency"] == "musd")
+
+    btc_balance = w3.eth.get_balance(config.sender_address)
+    if btc_balance < btc_needed:
+        raise ValueError(
+            f"Insufficient BTC balance! You have {Web3.from_wei(btc_balance, 'ether')} BTC "
+            f"but the batch needs {Web3.from_wei(btc_needed, 'ether')} BTC including gas."
+        )
+    if musd_needed:
+        musd_balance = config.musd_contract.functions.balanceOf(config.sender_address).call()
+        if musd_balance < musd_needed:
+            raise ValueError(
+                f"Insufficient mUSD balance! You have {Web3.from_wei(musd_balance, 'ether')} mUSD "
+                f"but the batch needs {Web3.from_wei(musd_needed, 'ether')} mUSD."
+            )
+
+
+def _build_tx(item: dict, nonce: int, gas: dict, fees: dict) -> dict:
+    if item["currency"] == "btc":
+        return {
+            "to": item["recipient"],
+            "value": item["amount_wei"],
+            "gas": gas["btc"],
+            "nonce": nonce,
+            "chainId": config.CHAIN_ID,
+            **fees,
+        }
+    # All fields are supplied, so building the transaction makes no RPC calls
+    return config.musd_contract.functions.transfer(item["recipient"], item["amount_wei"]).build_transaction({
+        "chainId": config.CHAIN_ID,
+        "from": config.sender_address,
+        "nonce": nonce,
+        "gas": gas["musd"],
+        **fees,
+    })
+
+
+def _sign_all(valid: List[dict], nonces: List[int], gas: dict, fees: dict) -> List[bytes]:
+    txs = []
+    for item, nonce in zip(valid, nonces):
+        item["nonce"] = nonce
+        txs.append(_build_tx(item, nonce, gas, fees))
+    if len(txs) >= BULK_SIGN_THRESHOLD:
+        from .bulk_signing import sign_transactions
+
+        return sign_transactions(txs, config.account.key.hex())
+    return [config.account.sign_transaction(tx).raw_transaction for tx in txs]
+
+
+def _lookup_sent(raw_txs: List[bytes], error: Exception) -> List[object]:
+    """
+    Asks the node which transactions of a batch it holds after the broadcast call itself
+    raised: a timeout or dropped connection does not mean the batch was rejected.
+
+    :param error: The broadcast error, reported for transactions the node does not have.
+    :return: One entry per transaction: its hash if the node has it, the error if it
+             does not, or None if the lookup failed too and the outcome is unknown.
+    """
+    hashes = [Web3.to_hex(Web3.keccak(raw_tx)) for raw_tx in raw_txs]
+    try:
+        found = rpc_batch([("eth_getTransactionByHash", [tx_hash]) for tx_hash in hashes])
+    except Exception as e:
+        print(f"⚠️ Warning: Could not check which payouts reached the node: {e}")
+        return [None] * len(hashes)
+    results = []
+    for tx_hash, tx in zip(hashes, found):
+        if isinstance(tx, RpcError):
+            results.append(None)
+        else:
+            results.append(tx_hash if tx else error)
+    return results
+
+
+def _broadcast_in_order(signed: List[tuple], batch_size: int) -> Iterator[dict]:
+    """
+    Broadcasts in nonce order as eth_sendRawTransaction JSON-RPC batches.
+
+    Nodes (Cosmos-EVM CheckTx in particular) may reject a nonce that arrives before its
+    predecessor, so nothing is sent out of order. Once a transaction is rejected, the
+    later batches are not sent: their nonces would sit behind the gap.
+
+    If the broadcast call raises, each transaction of the batch is looked up by hash
+    before it is reported as failed. One the node cannot account for is yielded with
+    its hash and status "unknown", since it may still be mined; sending it again could
+    pay twice.
+    """
+    from .bulk_signing import send_raw_transactions
+
+    blocked = None
+    for start in range(0, len(signed), batch_size):
+        chunk = signed[start:start + batch_size]
+        if blocked is not None:
+            for item, _ in chunk:
+                item["error"] = f"❌ Not sent: {blocked}"
+                yield item
+            continue
+        raw_txs = [raw_tx for _, raw_tx in chunk]
+        try:
+            results = send_raw_transactions(raw_txs, batch_size)
+        except Exception as e:
+            results = _lookup_sent(raw_txs, e)
+        for (item, raw_tx), result in zip(chunk, results):
+            if isinstance(result, Exception) and is_already_known(result):
+                result = Web3.to_hex(Web3.keccak(raw_tx))
+            if result is None:
+                item["tx_hash"] = Web3.to_hex(Web3.keccak(raw_tx))
+                item["status"] = "unknown"
+                if blocked is None:
+                    blocked = f"the payout with nonce {item['nonce']} could not be confirmed first."
+            elif isinstance(result, Exception):
+                item["error"] = f"❌ Broadcast failed: {str(result)}"
+                if blocked is None:
+                    blocked = f"the payout with nonce {item['nonce']} failed first."
+            else:
+                item["tx_hash"] = result
+            yield item
+
+
+def batch_payout(
+    payouts: Iterable[Payout],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    wait_for_receipt: bool = True,
+) -> Iterator[dict]:
+    """
+    Sends many BTC/mUSD transfers as one pipelined submission.
+
+    Gas is estimated once per transaction shape, a block of consecutive nonces is
+    reserved, every transaction is signed up front, and the signed transactions are
+    broadcast in nonce order as JSON-RPC batches. Batches of BULK_SIGN_THRESHOLD or
+    more are signed in worker processes. Results are yielded as they arrive.
+
+    If a broadcast fails, the later payouts that were accepted cannot be mined until
+    the gap is filled by the next send from this account: they are yielded with
+    status "pending" instead of waiting for receipts. Payouts whose broadcast outcome
+    could not be determined are yielded with status "unknown" and their tx_hash.
+    Nonces of payouts that were never sent are released.
+
+    :param payouts: (recipient, amount, currency) tuples or dicts with those keys.
+    :param max_concurrency: Maximum number of broadcasts per JSON-RPC batch.
+    :param wait_for_receipt: Wait for each receipt before yielding its result.
+    :return: Iterator of per-item result dictionaries (index, recipient, amount, currency,
+             nonce, tx_hash, status, receipt, error).
+    """
+    items = [_normalize(i, p) for i, p in enumerate(payouts)]
+    valid = [item for item in items if "error" not in item]
+    for item in items:
+        if "error" in item:
+            yield item
+    if not valid:
+        return
+
+    fees = gas_oracle.fee_params()
+    gas = _estimate_gas_by_shape(valid)
+    _check_funds(valid, gas, fees)
+
+    # Sign everything before the first broadcast so the network path is pure I/O
+    nonces = nonce_manager.reserve(len(valid))
+    try:
+        signed = list(zip(valid, _sign_all(valid, nonces, gas, fees)))
+    except Exception:
+        # Nothing was broadcast: hand the whole block back
+        for nonce in reversed(nonces):
+            nonce_manager.release(nonce)
+        raise
+
+    batch_size = DEFAULT_BATCH_SIZE if len(signed) >= BULK_SIGN_THRESHOLD else max_concurrency
+    broadcast_failed = False
+    unsent, unknown = [], False
+    receipts = {}
+    for item in _broadcast_in_order(signed, batch_size):
+        if "tx_hash" not in item:
+            broadcast_failed = True
+            unsent.append(item["nonce"])
+            yield item
+        elif item.get("status") == "unknown":
+            broadcast_failed = unknown = True
+            yield item
+        elif broadcast_failed:
+            # Queued behind the failed nonce until the next send fills the gap
+            item["status"] = "pending"
+            yield item
+        elif wait_for_receipt:
+            # One shared poller resolves every receipt instead of a blocking wait per item
+            receipts[receipt_watcher.watch(item["tx_hash"])] = item
+        else:
+            yield item
+
+    for future in as_completed(receipts):
+        item = receipts[future]
+        try:
+            receipt = future.result()
+            item["receipt"] = receipt
+            item["status"] = receipt.status
+            if receipt.status != 1:
+                gas_oracle.check_receipt(receipt, gas[item["currency"]])
+                item["error"] = "❌ Transaction reverted."
+        except Exception as e:
+            item["error"] = f"❌ Receipt wait failed: {str(e)}"
+        yield item
+
+    # Hand back the nonces that never left this process (newest first, so a block at
+    # the end of the counter is reused instead of forcing a resync)
+    for nonce in sorted(unsent, reverse=True):
+        nonce_manager.release(nonce)
+    if unknown:
+        # The node may or may not hold those nonces: re-read the pending count on the next send
+        nonce_manager._broadcast_failed()
+
+
+@tool
+def mezo_agent_batch_payout(payout_file: str) -> str:
+    """
+    Sends BTC/mUSD payouts to many recipients on Mezo Matsnet in one batch.
+
+    The payout_file should be a path to a CSV file (columns: recipient, amount, currency)
+    or a JSONL file with one {"recipient", "amount", "currency"} object per line.
+    """
+    try:
+        payouts = load_payouts(payout_file.strip())
+    except Exception as e:
+        return f"❌ Failed to load payouts: {str(e)}"
+
+    sent, pending, failed, unknown = 0, 0, [], []
+    try:
+        for result in batch_payout(payouts):
+            if "error" in result:
+                failed.append(f"#{result['index']} {result['recipient']}: {result['error']}")
+            elif result.get("status") == "unknown":
+                unknown.append(f"#{result['index']} {result['recipient']}: TX Hash {result['tx_hash']}")
+            elif result.get("status") == "pending":
+                pending += 1
+            else:
+                sent += 1
+    except Exception as e:
+        return f"❌ Batch payout failed: {str(e)}"
+
+    summary = f"✅ Batch payout complete: {sent} of {len(payouts)} transfers succeeded."
+    if pending:
+        summary += f" {pending} are pending behind a failed transfer."
+    if failed:
+        summary += "\n" + "\n".join(failed)
+    if unknown:
+        summary += "\n⚠️ Warning: these transfers may or may not have been sent. Check their hashes before resending:\n"
+        summary += "\n".join(unknown)
+    return summary
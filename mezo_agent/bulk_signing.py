@@ -0,0 +1,127 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+from web3 import Web3
+from .rpc_batch import rpc_batch, DEFAULT_BATCH_SIZE
+
+DEFAULT_CHUNK_SIZE = 250  # transactions per task sent to a worker
+INLINE_THRESHOLD = 200  # below this, process start-up costs more than signing inline
+# Workers are spawned, never forked: the agent runs daemon threads (receipt watcher,
+# event loop, HTTP pools) whose locks a forked child could inherit mid-acquire
+START_METHOD = "spawn"
+
+# Account held by each worker process, set once by _init_worker
+_worker_account = None
+
+
+def _init_worker(private_key: str):
+    global _worker_account
+    from eth_account import Account
+
+    _worker_account = Account.from_key(private_key)
+
+
+def _sign_chunk(txs: List[dict]) -> List[bytes]:
+    return [bytes(_worker_account.sign_transaction(tx).raw_transaction) for tx in txs]
+
+
+class BulkSigner:
+    """
+    Signs large lists of pre-built transactions across a pool of worker processes.
+
+    Signing (ECDSA plus RLP encoding) is CPU bound and holds the GIL, so threads do
+    not help. Each worker derives the account from the key once, in its initializer,
+    and then signs chunks of transaction dicts; results come back in input order.
+    The pool is started on first use and reused until close().
+    """
+
+    def __init__(self, private_key: str, max_workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        :param private_key: Key every transaction is signed with.
+        :param max_workers: Worker processes (defaults to the CPU count).
+        :param chunk_size: Transactions per task sent to a worker.
+        """
+        self._private_key = private_key
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(START_METHOD),
+                initializer=_init_worker,
+                initargs=(self._private_key,),
+            )
+        return self._pool
+
+    def sign(self, txs: Sequence[dict]) -> List[bytes]:
+        """
+        Signs transactions and returns their raw bytes in the same order.
+
+        :param txs: Fully populated transaction dicts (nonce, gas, fees and chainId set).
+        :return: Raw signed transactions, ready for send_raw_transaction.
+        """
+        txs = list(txs)
+        if len(txs) < INLINE_THRESHOLD or self.max_workers == 1:
+            from eth_account import Account
+
+            account = Account.from_key(self._private_key)
+            return [bytes(account.sign_transaction(tx).raw_transaction) for tx in txs]
+
+        chunks = [txs[i:i + self.chunk_size] for i in range(0, len(txs), self.chunk_size)]
+        raw_txs: List[bytes] = []
+        for signed in self._executor().map(_sign_chunk, chunks):
+            raw_txs.extend(signed)
+        return raw_txs
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def sign_transactions(
+    txs: Sequence[dict],
+    private_key: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[bytes]:
+    """
+    Signs many transactions in worker processes using a one-off pool.
+
+    :param txs: Fully populated transaction dicts.
+    :param private_key: Signing key (defaults to the context's account).
+    :param max_workers: Worker processes (defaults to the CPU count).
+    :param chunk_size: Transactions per task sent to a worker.
+    :return: Raw signed transactions, in input order.
+    """
+    if private_key is None:
+        from . import config
+
+        private_key = config.account.key.hex()
+    with BulkSigner(private_key, max_workers, chunk_size) as signer:
+        return signer.sign(txs)
+
+
+def send_raw_transactions(raw_txs: Sequence[bytes], batch_size: int = DEFAULT_BATCH_SIZE) -> List[object]:
+    """
+    Broadcasts signed transactions as eth_sendRawTransaction JSON-RPC batches.
+
+    Transactions are sent in order, so consecutive nonces from one sender reach the
+    node in sequence.
+
+    :param raw_txs: Raw signed transactions.
+    :param batch_size: Maximum requests per HTTP POST.
+    :return: One entry per transaction, in order: the tx hash, or an RpcError if rejected.
+    """
+    calls = [("eth_sendRawTransaction", [Web3.to_hex(raw_tx)]) for raw_tx in raw_txs]
+    return rpc_batch(calls, batch_size=batch_size)
@@ -1,10 +1,15 @@
+from typing import AsyncIterator, Iterator
 from mezo_agent.characters import get_character_prompt  # Import character selection
-from langchain_openai import ChatOpenAI
 from langchain.tools import tool
-from .config import OPENAI_API_KEY
+from .context import get_context
+from .streaming import stream_llm, astream_llm
 
-# Initialize OpenAI Chat Model
-llm = ChatOpenAI(temperature=0, openai_api_key=OPENAI_API_KEY)
+def build_character_query(prompt: str, character: str = "DigAIJoe") -> str:
+    """
+    Combines the selected character's personality with the user's message.
+    """
+    personality_prompt = get_character_prompt(character)
+    return personality_prompt + "\n\nUser: " + prompt + "\n\nAnswer accordingly."
 
 @tool
 def mezo_character_chat(prompt: str, character: str = "DigAIJoe") -> str:
@@ -15,8 +20,21 @@ def mezo_character_chat(prompt: str, character: str = "DigAIJoe") -> str:
     :param character: The character's name for personality selection.
     :return: AI-generated response.
     """
-    personality_prompt = get_character_prompt(character)
-    query = personality_prompt + "\n\nUser: " + prompt + "\n\nAnswer accordingly."
-    response = llm.invoke(query)
+    response = get_context().llm.invoke(build_character_query(prompt, character))
     return response.content.strip()
 
+def stream_character_chat(prompt: str, character: str = "DigAIJoe") -> Iterator[str]:
+    """
+    Streaming variant of mezo_character_chat: yields response tokens as they are generated.
+
+    :param prompt: User's input message.
+    :param character: The character's name for personality selection.
+    """
+    yield from stream_llm(build_character_query(prompt, character), name="character_chat")
+
+async def astream_character_chat(prompt: str, character: str = "DigAIJoe") -> AsyncIterator[str]:
+    """
+    Async streaming variant of mezo_character_chat, e.g. for a websocket handler.
+    """
+    async for token in astream_llm(build_character_query(prompt, character), name="character_chat"):
+        yield token
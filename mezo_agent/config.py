@@ -1,39 +1,49 @@
 import os
 import json
+import threading
 from dotenv import load_dotenv
-from web3 import Web3
-import importlib.resources as pkg_resources
-import requests
-
-# Load environment variables
-load_dotenv()
 
 USER_PROJECT_DIR = os.getcwd()
 USER_ENV_PATH = os.path.join(USER_PROJECT_DIR, ".env")
 
-if os.path.exists(USER_ENV_PATH):
-    load_dotenv(USER_ENV_PATH)
-else:
-    print("⚠️ Warning: No `.env` file found in your project directory! Transactions requiring signing may fail.")
+_env_loaded = False
+_env_lock = threading.Lock()
+
 
-PRIVATE_KEY = os.getenv("PRIVATE_KEY")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+def load_env():
+    """
+    Loads environment variables once, preferring the `.env` file in the project directory.
+    """
+    global _env_loaded
+    with _env_lock:
+        if _env_loaded:
+            return
+        if os.path.exists(USER_ENV_PATH):
+            load_dotenv(USER_ENV_PATH)
+        else:
+            load_dotenv()
+            print("⚠️ Warning: No `.env` file found in your project directory! Transactions requiring signing may fail.")
+        _env_loaded = True
 
-if not PRIVATE_KEY:
-    print("⚠️ Warning: PRIVATE_KEY not set. Please create a `.env` file in your project with your keys.")
-    PRIVATE_KEY = None  # Allow package to be installed but prevent transactions
 
-# Mezo Testnet RPC and Web3 initialization
+def get_env(name: str):
+    """
+    Reads an environment variable after making sure `.env` has been loaded.
+    """
+    load_env()
+    value = os.getenv(name)
+    if name == "PRIVATE_KEY" and not value:
+        print("⚠️ Warning: PRIVATE_KEY not set. Please create a `.env` file in your project with your keys.")
+    return value or None
+
+
+# Mezo Testnet RPC
 RPC_URL = "https://rpc.test.mezo.org"
-web3_instance = Web3(Web3.HTTPProvider(RPC_URL))
+CHAIN_ID = 31611  # Mezo Testnet Chain ID
 
 #Graph endpoint
 GRAPH_URL = "https://api.goldsky.com/api/public/project_cm48lsrzo0axx01tna6rb1ee9/subgraphs/exchange-v2-mezo/1.0.0/gn"
 
-# Create Account Object
-account = web3_instance.eth.account.from_key(PRIVATE_KEY)
-sender_address = account.address
-
 # mUSD Contract Setup using approve/allowance ABI
 MUSD_ADDRESS = "0x637e22A1EBbca50EA2d34027c238317fD10003eB"
 ERC20_ABI = json.loads(
@@ -48,8 +58,6 @@ ERC20_ABI = json.loads(
     '"name": "allowance", "outputs": [{"name": "remaining", "type": "uint256"}], "stateMutability": "view", "type": "function"}]'
 )
 
-musd_contract = web3_instance.eth.contract(address=MUSD_ADDRESS, abi=ERC20_ABI)
-
 #Query graph for token info
 def query_graph(query: str) -> dict:
     """
@@ -57,7 +65,11 @@ def query_graph(query: str) -> dict:
     :param query: GraphQL query string.
     :return: JSON response as a dictionary.
     """
-    response = requests.post(GRAPH_URL, json={"query": query})
+    from .transport import transport
+    from .telemetry import span
+
+    with span("graph", "query_graph"):
+        response = transport.post_json(GRAPH_URL, {"query": query})
     if response.status_code == 200:
         return response.json()
     else:
@@ -67,8 +79,25 @@ def query_graph(query: str) -> dict:
 WRAPPED_BTC_ADDRESS = "0xA460F83cdd9584E4bD6a9838abb0baC58EAde999"
 ROUTER_ADDRESS = "0xC2E61936a542D78b9c3AA024fA141c4C632DF6c1"
 
-# Load router ABI from a JSON file packaged with mezoAgent
-with pkg_resources.open_text("mezo_agent.data", "new_router.json") as f:
-    router_abi = json.load(f)
+# Clients, keys and contracts are created on first access by the shared MezoContext
+# (see context.py), so importing this module has no network or signing side effects.
+_LAZY_ATTRIBUTES = {
+    "PRIVATE_KEY": "private_key",
+    "OPENAI_API_KEY": "openai_api_key",
+    "web3_instance": "web3",
+    "async_web3_instance": "async_web3",
+    "account": "account",
+    "sender_address": "sender_address",
+    "musd_contract": "musd_contract",
+    "async_musd_contract": "async_musd_contract",
+    "router_abi": "router_abi",
+    "router_contract": "router_contract",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        from .context import get_context
 
-router_contract = web3_instance.eth.contract(address=ROUTER_ADDRESS, abi=router_abi)
+        return getattr(get_context(), _LAZY_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
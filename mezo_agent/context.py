@@ -0,0 +1,155 @@
+import json
+import threading
+import importlib.resources as pkg_resources
+from typing import Optional
+from . import config
+
+
+class _lazy:
+    """
+    Thread-safe cached property: the factory runs once, on first access, and the
+    result is stored on the instance.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if self.name in instance.__dict__:
+            return instance.__dict__[self.name]
+        with instance._lock:
+            if self.name not in instance.__dict__:
+                instance.__dict__[self.name] = self.factory(instance)
+        return instance.__dict__[self.name]
+
+
+class MezoContext:
+    """
+    Lazily initialized clients, contracts and LLMs used by the Mezo tools.
+
+    Nothing is created until first use, so importing mezo_agent stays cheap and a
+    process that only chats or reads prices never derives the signing account or
+    parses the router ABI. Every attribute can also be injected up front (e.g. a
+    local chain or a fake LLM for tests and benchmarks).
+    """
+
+    def __init__(
+        self,
+        rpc_url: str = config.RPC_URL,
+        private_key: Optional[str] = None,
+        openai_api_key: Optional[str] = None,
+        **overrides,
+    ):
+        """
+        :param rpc_url: JSON-RPC endpoint for the Web3 clients.
+        :param private_key: Signing key (defaults to the PRIVATE_KEY env variable).
+        :param openai_api_key: OpenAI key (defaults to the OPENAI_API_KEY env variable).
+        :param overrides: Pre-built attributes, e.g. web3=..., llm=..., account=...
+        """
+        self._lock = threading.RLock()
+        self.rpc_url = rpc_url
+        self._private_key = private_key
+        self._openai_api_key = openai_api_key
+        self.__dict__.update(overrides)
+
+    @_lazy
+    def private_key(self) -> Optional[str]:
+        return self._private_key or config.get_env("PRIVATE_KEY")
+
+    @_lazy
+    def openai_api_key(self) -> Optional[str]:
+        return self._openai_api_key or config.get_env("OPENAI_API_KEY")
+
+    @_lazy
+    def web3(self):
+        from web3 import Web3
+        from .transport import transport
+        from .telemetry import instrument_provider
+
+        provider = Web3.HTTPProvider(
+            self.rpc_url, session=transport.session, request_kwargs={"timeout": transport.timeout}
+        )
+        return Web3(instrument_provider(provider))
+
+    @_lazy
+    def async_web3(self):
+        from web3 import AsyncWeb3
+        from .telemetry import instrument_provider
+
+        return AsyncWeb3(instrument_provider(AsyncWeb3.AsyncHTTPProvider(self.rpc_url)))
+
+    @_lazy
+    def account(self):
+        if not self.private_key:
+            raise ValueError("❌ PRIVATE_KEY not set. Please create a `.env` file in your project with your keys.")
+        from eth_account import Account
+
+        return Account.from_key(self.private_key)
+
+    @_lazy
+    def sender_address(self) -> str:
+        return self.account.address
+
+    @_lazy
+    def musd_contract(self):
+        return self.web3.eth.contract(address=config.MUSD_ADDRESS, abi=config.ERC20_ABI)
+
+    @_lazy
+    def async_musd_contract(self):
+        return self.async_web3.eth.contract(address=config.MUSD_ADDRESS, abi=config.ERC20_ABI)
+
+    @_lazy
+    def router_abi(self) -> list:
+        # Load router ABI from a JSON file packaged with mezoAgent
+        with pkg_resources.open_text("mezo_agent.data", "new_router.json") as f:
+            return json.load(f)
+
+    @_lazy
+    def router_contract(self):
+        return self.web3.eth.contract(address=config.ROUTER_ADDRESS, abi=self.router_abi)
+
+    @_lazy
+    def llm(self):
+        from langchain_openai import ChatOpenAI
+        from .llm_cache import wrap_llm
+        from .telemetry import TracedLLM
+
+        # Deterministic (temperature 0) completions are cached; see llm_cache
+        return wrap_llm(TracedLLM(ChatOpenAI(temperature=0, openai_api_key=self.openai_api_key), "chat"))
+
+    @_lazy
+    def creative_llm(self):
+        from langchain_openai import ChatOpenAI
+        from .telemetry import TracedLLM
+
+        # Sampled model for generated content (tweets); never cached
+        return TracedLLM(ChatOpenAI(temperature=0.9, openai_api_key=self.openai_api_key), "creative")
+
+
+_context: Optional[MezoContext] = None
+_context_lock = threading.Lock()
+
+
+def get_context() -> MezoContext:
+    """
+    :return: The process-wide MezoContext, created on first call.
+    """
+    global _context
+    if _context is None:
+        with _context_lock:
+            if _context is None:
+                _context = MezoContext()
+    return _context
+
+
+def set_context(context: MezoContext):
+    """
+    Replaces the process-wide context, e.g. to point the tools at a local chain.
+    """
+    global _context
+    with _context_lock:
+        _context = context
@@ -0,0 +1,120 @@
+"""
+Deterministic extractors for well-formed tool prompts.
+
+Each parser returns a result in the same shape as the matching LLM schema in
+`parsing.py`, or None when the prompt is ambiguous (zero or several candidate
+amounts, addresses or tokens, an amount that is not positive, or an amount with
+letters attached such as "1k" or "1e3") and the LLM should decide instead.
+"""
+import re
+from decimal import Decimal
+from typing import Iterable, List, Optional
+
+ADDRESS_RE = re.compile(r"\b0x[a-fA-F0-9]{40}\b")
+HEX_RE = re.compile(r"\b0x[a-fA-F0-9]+\b")
+AMOUNT_RE = re.compile(
+    r"(?<![\w.,])(-?(?:\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+))([A-Za-z_]\w*)?(?![.,]?\d|[A-Za-z_])"
+)
+DECIMAL_RE = re.compile(r"\d+(?:\.\d+)?|\.\d+")
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9.]*[A-Za-z0-9]|[A-Za-z]")
+
+# Canonical spelling for the currencies the transfer and swap tools understand
+TRANSFER_CURRENCIES = {
+    "btc": "BTC",
+    "musd": "mUSD",
+}
+SWAP_CURRENCIES = {"btc", "wbtc", "wtbtc", "musd"}
+BTC_SYMBOLS = SWAP_CURRENCIES - {"musd"}
+# Symbols that may be written directly after an amount, e.g. "1.5BTC" or "10mUSD"
+AMOUNT_SUFFIXES = set(TRANSFER_CURRENCIES) | SWAP_CURRENCIES
+
+
+def find_addresses(text: str) -> List[str]:
+    """
+    :return: Distinct 0x addresses in order of appearance.
+    """
+    return list(dict.fromkeys(ADDRESS_RE.findall(text)))
+
+
+def find_amounts(text: str) -> List[str]:
+    """
+    :return: Numeric amounts in the text, ignoring digits inside hex strings and symbols.
+             A leading minus sign is kept, so callers can reject negative amounts. Letters
+             attached to a number are kept too ("1k", "1e3", "1_000") unless they spell a
+             currency symbol, so such amounts fail `is_positive_amount`.
+    """
+    stripped = HEX_RE.sub(" ", text)
+    amounts = []
+    for number, suffix in AMOUNT_RE.findall(stripped):
+        if suffix and suffix.lower() not in AMOUNT_SUFFIXES:
+            number += suffix
+        amounts.append(number.replace(",", ""))
+    return amounts
+
+
+def find_symbols(text: str, known_symbols: Iterable[str]) -> List[str]:
+    """
+    :param known_symbols: Lowercase token symbols to look for.
+    :return: Distinct lowercase symbols mentioned in the text, in order of appearance.
+    """
+    known = set(known_symbols)
+    stripped = HEX_RE.sub(" ", text)
+    words = (w.lower().rstrip(".") for w in WORD_RE.findall(stripped))
+    return list(dict.fromkeys(w for w in words if w in known))
+
+
+def is_positive_amount(amount) -> bool:
+    """
+    :param amount: Amount as written in the prompt or returned by the LLM.
+    :return: True only for a plain positive decimal such as "10" or "0.5".
+    """
+    amount = str(amount).strip()
+    return bool(DECIMAL_RE.fullmatch(amount)) and Decimal(amount) > 0
+
+
+def parse_transaction(text: str) -> Optional[dict]:
+    """
+    Extracts {amount, currency, recipient} when the prompt names exactly one of each.
+    """
+    addresses = find_addresses(text)
+    amounts = find_amounts(text)
+    currencies = find_symbols(text, TRANSFER_CURRENCIES)
+    if len(addresses) != 1 or len(amounts) != 1 or len(currencies) != 1:
+        return None
+    if not is_positive_amount(amounts[0]):
+        return None
+    return {
+        "amount": amounts[0],
+        "currency": TRANSFER_CURRENCIES[currencies[0]],
+        "recipient": addresses[0],
+    }
+
+
+def parse_swap(text: str, router_address: str) -> Optional[dict]:
+    """
+    Extracts the mUSD -> BTC swap amount when the prompt has a single positive amount
+    and names mUSD and then BTC. Any other pair or order (e.g. "swap 10 ETH") is left
+    to the LLM.
+    """
+    amounts = find_amounts(text)
+    if len(amounts) != 1 or find_addresses(text) or not is_positive_amount(amounts[0]):
+        return None
+    symbols = find_symbols(text, SWAP_CURRENCIES)
+    if len(symbols) != 2 or symbols[0] != "musd" or symbols[1] not in BTC_SYMBOLS:
+        return None
+    return {
+        "amount": amounts[0],
+        "from_currency": "mUSD",
+        "to_currency": "BTC",
+        "router_address": router_address,
+    }
+
+
+def parse_token_symbol(text: str, known_symbols: Iterable[str]) -> Optional[dict]:
+    """
+    Extracts {token_symbol} when the prompt mentions exactly one known token.
+    """
+    symbols = find_symbols(text, known_symbols)
+    if len(symbols) != 1:
+        return None
+    return {"token_symbol": symbols[0].upper()}
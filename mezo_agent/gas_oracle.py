@@ -0,0 +1,238 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional
+from . import config
+
+GAS_PRICE_TTL = 3  # seconds; roughly one Mezo block
+FEE_HISTORY_BLOCKS = 10
+ESTIMATE_CACHE_SIZE = 1024
+# A calldata word below 2**160 but at or above this is taken to be an address: real
+# addresses almost never fall below it, and token amounts this large never occur
+ADDRESS_WORD_MIN = 2 ** 140
+
+# Reward percentiles requested from eth_feeHistory, one per speed preset
+SPEED_PERCENTILES = {"low": 10, "standard": 50, "fast": 90}
+# Multipliers applied to the legacy gas price when the chain has no EIP-1559 fee market
+LEGACY_MULTIPLIERS = {"low": 0.9, "standard": 1.0, "fast": 1.25}
+
+
+def max_fee_per_gas(fees: dict) -> int:
+    """
+    :param fees: Result of GasOracle.fee_params().
+    :return: The most the transaction can pay per unit of gas.
+    """
+    return fees.get("maxFeePerGas", fees.get("gasPrice"))
+
+
+def _estimate_key(tx: dict) -> tuple:
+    """
+    Memoization key for a gas estimate: target, sender, function selector, calldata
+    length, whether value is attached, and every address argument. Calls that differ
+    only in amounts (e.g. ERC-20 transfers of different sizes to one recipient) share
+    an estimate; a new recipient (whose first balance costs a fresh storage slot) or
+    a different swap path gets its own.
+    """
+    data = tx.get("data") or ""
+    if isinstance(data, bytes):
+        data = data.hex()
+    data = data[2:] if data.startswith("0x") else data
+    addresses = []
+    for start in range(8, len(data) - 63, 64):
+        try:
+            word = int(data[start:start + 64], 16)
+        except ValueError:
+            break
+        if ADDRESS_WORD_MIN <= word < 2 ** 160:
+            addresses.append(word)
+    return (
+        str(tx.get("to", "")).lower(),
+        str(tx.get("from", "")).lower(),
+        data[:8],
+        len(data),
+        bool(tx.get("value")),
+        tuple(addresses),
+    )
+
+
+class GasOracle:
+    """
+    Caches gas prices and gas estimates so sends skip one or two RPC round trips.
+
+    The gas price is cached for a short TTL. When the chain supports eth_feeHistory
+    with base fees, EIP-1559 fee parameters are derived from recent base fees and
+    priority-fee percentiles; otherwise the legacy gas price is scaled per preset.
+    Gas estimates are memoized by (to, from, calldata shape, address arguments), and
+    dropped when a receipt shows a transaction ran out of gas.
+    """
+
+    def __init__(self, web3=None, ttl: float = GAS_PRICE_TTL):
+        """
+        :param web3: Web3 instance to query (defaults to config.web3_instance).
+        :param ttl: Seconds a gas price / fee history reading stays fresh.
+        """
+        self._web3 = web3
+        self.ttl = ttl
+        self._gas_price = None
+        self._gas_price_at = 0.0
+        self._fee_history = None
+        self._fee_history_at = 0.0
+        self._eip1559 = None  # unknown until the first feeHistory call
+        self._estimates = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def web3(self):
+        return self._web3 or config.web3_instance
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.ttl
+
+    # ------------------------------------------------------------------ #
+    # Gas price / fee history
+    # ------------------------------------------------------------------ #
+    def gas_price(self) -> int:
+        """
+        :return: The node's gas price, cached for the TTL.
+        """
+        if self._gas_price is None or not self._fresh(self._gas_price_at):
+            self._set_gas_price(self.web3.eth.gas_price)
+        return self._gas_price
+
+    async def gas_price_async(self, async_web3) -> int:
+        if self._gas_price is None or not self._fresh(self._gas_price_at):
+            self._set_gas_price(await async_web3.eth.gas_price)
+        return self._gas_price
+
+    def _set_gas_price(self, gas_price: int):
+        self._gas_price = gas_price
+        self._gas_price_at = time.time()
+
+    def fee_history(self) -> Optional[dict]:
+        """
+        :return: Recent base fees and reward percentiles, or None if the chain lacks EIP-1559
+                 or the last request failed (legacy pricing until it is retried after the TTL).
+        """
+        if self._eip1559 is False:
+            return None
+        if not self._fresh(self._fee_history_at):
+            try:
+                history = self.web3.eth.fee_history(FEE_HISTORY_BLOCKS, "latest", list(SPEED_PERCENTILES.values()))
+            except Exception:
+                history = None
+            self._set_fee_history(history)
+        return self._fee_history
+
+    async def fee_history_async(self, async_web3) -> Optional[dict]:
+        if self._eip1559 is False:
+            return None
+        if not self._fresh(self._fee_history_at):
+            try:
+                history = await async_web3.eth.fee_history(
+                    FEE_HISTORY_BLOCKS, "latest", list(SPEED_PERCENTILES.values())
+                )
+            except Exception:
+                history = None
+            self._set_fee_history(history)
+        return self._fee_history
+
+    def _set_fee_history(self, history):
+        # A failed request says nothing about the chain: leave _eip1559 as it was and
+        # price this TTL window with the legacy gas price. Only a node that answers
+        # without base fees marks the chain as non-EIP-1559.
+        if history is not None:
+            self._eip1559 = any(history.get("baseFeePerGas") or [])
+        self._fee_history = history if history is not None and self._eip1559 else None
+        self._fee_history_at = time.time()
+
+    def _fee_params_from(self, gas_price: int, history: Optional[dict], speed: str) -> dict:
+        if speed not in SPEED_PERCENTILES:
+            raise ValueError(f"Unknown gas speed '{speed}'. Use one of: {', '.join(SPEED_PERCENTILES)}")
+        if history is None:
+            return {"gasPrice": int(gas_price * LEGACY_MULTIPLIERS[speed])}
+
+        # The last baseFeePerGas entry is the base fee of the next block
+        base_fee = history["baseFeePerGas"][-1]
+        column = list(SPEED_PERCENTILES).index(speed)
+        rewards = sorted(r[column] for r in history.get("reward") or [] if len(r) > column)
+        priority_fee = rewards[len(rewards) // 2] if rewards else max(gas_price - base_fee, 0)
+        return {
+            "maxPriorityFeePerGas": priority_fee,
+            # Headroom for the base fee to double before the transaction is included
+            "maxFeePerGas": 2 * base_fee + priority_fee,
+        }
+
+    def fee_params(self, speed: str = "standard") -> dict:
+        """
+        :param speed: One of 'low', 'standard' or 'fast'.
+        :return: Either {'maxFeePerGas', 'maxPriorityFeePerGas'} or {'gasPrice'}, ready to merge into a tx.
+        """
+        history = self.fee_history()
+        gas_price = self.gas_price() if history is None or not history.get("reward") else 0
+        return self._fee_params_from(gas_price, history, speed)
+
+    async def fee_params_async(self, async_web3, speed: str = "standard") -> dict:
+        history = await self.fee_history_async(async_web3)
+        gas_price = await self.gas_price_async(async_web3) if history is None or not history.get("reward") else 0
+        return self._fee_params_from(gas_price, history, speed)
+
+    # ------------------------------------------------------------------ #
+    # Gas estimates
+    # ------------------------------------------------------------------ #
+    def _cached_estimate(self, key: tuple) -> Optional[int]:
+        with self._lock:
+            gas = self._estimates.get(key)
+            if gas is not None:
+                self._estimates.move_to_end(key)
+            return gas
+
+    def _store_estimate(self, key: tuple, gas: int):
+        with self._lock:
+            self._estimates[key] = gas
+            if len(self._estimates) > ESTIMATE_CACHE_SIZE:
+                self._estimates.popitem(last=False)
+
+    def estimate_gas(self, tx: dict) -> int:
+        """
+        Memoized eth_estimateGas keyed by (to, from, calldata shape, address arguments).
+        """
+        key = _estimate_key(tx)
+        gas = self._cached_estimate(key)
+        if gas is None:
+            gas = self.web3.eth.estimate_gas(tx)
+            self._store_estimate(key, gas)
+        return gas
+
+    async def estimate_gas_async(self, async_web3, tx: dict) -> int:
+        key = _estimate_key(tx)
+        gas = self._cached_estimate(key)
+        if gas is None:
+            gas = await async_web3.eth.estimate_gas(tx)
+            self._store_estimate(key, gas)
+        return gas
+
+    def invalidate(self):
+        """
+        Drops cached prices and estimates, e.g. after a transaction ran out of gas.
+        """
+        with self._lock:
+            self._gas_price = None
+            self._gas_price_at = 0.0
+            self._fee_history = None
+            self._fee_history_at = 0.0  # otherwise fee_history() keeps serving None until the TTL ends
+            self._estimates.clear()
+
+    def check_receipt(self, receipt, gas_limit: int) -> bool:
+        """
+        Invalidates the cache when a failed receipt used its whole gas limit.
+
+        :return: True if the transaction ran out of gas.
+        """
+        out_of_gas = receipt["status"] != 1 and receipt["gasUsed"] >= gas_limit
+        if out_of_gas:
+            self.invalidate()
+        return out_of_gas
+
+
+# Shared oracle used by the send and swap tools
+gas_oracle = GasOracle()
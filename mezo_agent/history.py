@@ -0,0 +1,371 @@
+import os
+import mmap
+import time
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from .config import query_graph
+
+try:
+    import numpy as np  # Optional: enables memory-mapped arrays and vectorised range queries
+except ImportError:  # pragma: no cover - numpy is an optional extra
+    np = None
+
+DEFAULT_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "mezo_agent", "history")
+PAGE_SIZE = 1000  # maximum page size accepted by the subgraph
+DEFAULT_WORKERS = 8  # concurrent time windows per sync
+FINALITY_LAG = 60  # seconds behind the indexed head; newer swaps wait for the next sync so stored seconds are complete
+DAY = 86400
+HOUR = 3600
+
+# Column type codes: 'q' = int64, 'd' = float64 (same layout for array and numpy)
+TOKEN_DAY_SCHEMA = {
+    "date": "q",
+    "price_usd": "d",
+    "volume_usd": "d",
+    "volume_token": "d",
+    "liquidity_usd": "d",
+    "txns": "q",
+}
+PAIR_HOUR_SCHEMA = {
+    "hour": "q",
+    "reserve0": "d",
+    "reserve1": "d",
+    "reserve_usd": "d",
+    "volume_token0": "d",
+    "volume_token1": "d",
+    "volume_usd": "d",
+    "txns": "q",
+}
+SWAP_SCHEMA = {
+    "timestamp": "q",
+    "amount0_in": "d",
+    "amount1_in": "d",
+    "amount0_out": "d",
+    "amount1_out": "d",
+    "amount_usd": "d",
+}
+
+
+class ColumnStore:
+    """
+    Append-only columnar table: one raw binary file of fixed-width values per column.
+
+    Rows are appended in key order, so range queries binary-search the memory-mapped
+    key column and only read the matching slice of each column. With numpy the result
+    columns are numpy arrays; without it they are array.array objects.
+    """
+
+    def __init__(self, path: str, schema: Dict[str, str], key: str):
+        """
+        :param path: Directory holding the column files.
+        :param schema: Column name -> type code ('q' int64 or 'd' float64).
+        :param key: Sorted column used for range queries.
+        """
+        self.path = path
+        self.schema = schema
+        self.key = key
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._repair()
+
+    def _file(self, column: str) -> str:
+        return os.path.join(self.path, f"{column}.{self.schema[column]}")
+
+    def _rows(self, column: str) -> int:
+        try:
+            return os.path.getsize(self._file(column)) // 8
+        except OSError:
+            return 0
+
+    def _repair(self):
+        """
+        Truncates every column to the shortest one, undoing a partially written append.
+        """
+        rows = len(self)
+        for column in self.schema:
+            if self._rows(column) > rows:
+                with open(self._file(column), "r+b") as f:
+                    f.truncate(rows * 8)
+
+    def __len__(self) -> int:
+        return min(self._rows(column) for column in self.schema)
+
+    def append(self, columns: Dict[str, Sequence]):
+        """
+        Appends rows given as equally long per-column sequences.
+        """
+        with self._lock:
+            for column, code in self.schema.items():
+                with open(self._file(column), "ab") as f:
+                    array(code, columns[column]).tofile(f)
+
+    def last(self, column: Optional[str] = None):
+        """
+        :return: The last value of a column (the key by default), or None if the store is empty.
+        """
+        column = column or self.key
+        rows = len(self)
+        if rows == 0:
+            return None
+        with open(self._file(column), "rb") as f:
+            f.seek((rows - 1) * 8)
+            values = array(self.schema[column])
+            values.frombytes(f.read(8))
+        return values[0]
+
+    def _map(self, column: str, rows: int):
+        if np is not None:
+            return np.memmap(self._file(column), dtype=np.dtype(self.schema[column]), mode="r", shape=(rows,))
+        with open(self._file(column), "rb") as f:
+            buffer = mmap.mmap(f.fileno(), rows * 8, access=mmap.ACCESS_READ)
+        return memoryview(buffer).cast(self.schema[column])
+
+    def range(self, start: int, end: int) -> Dict[str, Sequence]:
+        """
+        Reads rows whose key lies in [start, end] without loading the rest of the table.
+
+        :return: Column name -> values.
+        """
+        rows = len(self)
+        if rows == 0:
+            return {column: array(code) for column, code in self.schema.items()}
+        keys = self._map(self.key, rows)
+        if np is not None:
+            lo = int(np.searchsorted(keys, start, side="left"))
+            hi = int(np.searchsorted(keys, end, side="right"))
+            return {column: np.array(self._map(column, rows)[lo:hi]) for column in self.schema}
+        lo, hi = bisect_left(keys, start), bisect_right(keys, end)
+        result = {}
+        for column, code in self.schema.items():
+            view = keys if column == self.key else self._map(column, rows)
+            result[column] = array(code, view[lo:hi])
+        return result
+
+
+class HistoryStore:
+    """
+    Downloads historical data from the exchange subgraph into local column stores.
+
+    Three datasets are supported: tokenDayDatas per token, pairHourDatas per pair and
+    swaps per pair. Each sync resumes after the last stored row and only appends
+    periods the subgraph has finished indexing (or swaps FINALITY_LAG before its
+    indexed head), so stored data never changes even when the indexer lags.
+    The requested time span is split into windows that are paginated concurrently
+    with timestamp cursors.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_workers: int = DEFAULT_WORKERS):
+        """
+        :param root: Directory for the stores (defaults to MEZO_HISTORY_DIR or ~/.cache).
+        :param max_workers: Time windows fetched concurrently.
+        """
+        self.root = root or os.getenv("MEZO_HISTORY_DIR", DEFAULT_ROOT)
+        self.max_workers = max_workers
+        self._stores: Dict[str, ColumnStore] = {}
+        self._lock = threading.Lock()
+
+    def _store(self, dataset: str, entity_id: str, schema: Dict[str, str], key: str) -> ColumnStore:
+        path = os.path.join(self.root, dataset, entity_id.lower())
+        with self._lock:
+            if path not in self._stores:
+                self._stores[path] = ColumnStore(path, schema, key)
+            return self._stores[path]
+
+    # ------------------------------------------------------------------ #
+    # Paginated fetching
+    # ------------------------------------------------------------------ #
+    def _fetch_window(self, entity: str, fields: str, filters: str, ts_field: str, start: int, end: int) -> List[dict]:
+        """
+        Pages through one time window with a timestamp cursor. Rows sharing the cursor
+        timestamp are de-duplicated by id, so no row is skipped at page boundaries.
+        """
+        rows, seen = [], set()
+        cursor = start
+        while True:
+            query = f'''
+            {{
+              {entity}(first: {PAGE_SIZE}, orderBy: {ts_field}, orderDirection: asc,
+                       where: {{{filters} {ts_field}_gte: {cursor}, {ts_field}_lte: {end}}}) {{
+                id
+                {ts_field}
+                {fields}
+              }}
+            }}
+            '''
+            page = query_graph(query).get("data", {}).get(entity, [])
+            fresh = [r for r in page if r["id"] not in seen]
+            rows.extend(fresh)
+            if len(page) < PAGE_SIZE:
+                return rows
+            last_ts = int(page[-1][ts_field])
+            if last_ts == cursor and not fresh:
+                raise Exception(f"❌ More than {PAGE_SIZE} {entity} share timestamp {cursor}; cannot paginate.")
+            if last_ts != cursor:
+                seen = set()
+            cursor = last_ts
+            seen.update(r["id"] for r in page if int(r[ts_field]) == cursor)
+
+    def _fetch(self, entity: str, fields: str, filters: str, ts_field: str, start: int, end: int) -> List[dict]:
+        """
+        Splits [start, end] into windows fetched concurrently and returns rows in timestamp order.
+        """
+        if end < start:
+            return []
+        span = end - start + 1
+        windows = min(self.max_workers, max(1, span // HOUR))
+        step = -(-span // windows)
+        bounds = [(s, min(s + step - 1, end)) for s in range(start, end + 1, step)]
+        with ThreadPoolExecutor(max_workers=len(bounds)) as pool:
+            pages = pool.map(lambda b: self._fetch_window(entity, fields, filters, ts_field, *b), bounds)
+            return [row for page in pages for row in page]
+
+    @staticmethod
+    def _indexed_until() -> int:
+        """
+        :return: Timestamp of the latest block the subgraph has indexed, capped at the
+                 wall clock (which is also the fallback if _meta is unavailable).
+        """
+        now = int(time.time())
+        try:
+            meta = query_graph("{ _meta { block { timestamp } } }").get("data", {}).get("_meta") or {}
+            timestamp = (meta.get("block") or {}).get("timestamp")
+        except Exception as e:
+            print(f"⚠️ Warning: Could not read the subgraph's indexed block: {str(e)}")
+            return now
+        return min(int(timestamp), now) if timestamp else now
+
+    @staticmethod
+    def _columns(rows: List[dict], mapping: Dict[str, tuple]) -> Dict[str, list]:
+        return {column: [cast(row[field]) for row in rows] for column, (field, cast) in mapping.items()}
+
+    # ------------------------------------------------------------------ #
+    # Incremental sync
+    # ------------------------------------------------------------------ #
+    def sync_token_days(self, token: str, since: int = 0) -> int:
+        """
+        Appends closed tokenDayDatas for a token.
+
+        :param token: Token address.
+        :param since: Earliest date (unix seconds) for an empty store.
+        :return: Number of rows appended.
+        """
+        store = self._store("token_days", token, TOKEN_DAY_SCHEMA, "date")
+        last = store.last()
+        start = since if last is None else last + 1
+        end = (self._indexed_until() // DAY) * DAY - 1  # only days that have closed and been indexed
+        rows = self._fetch(
+            "tokenDayDatas",
+            "priceUSD dailyVolumeUSD dailyVolumeToken totalLiquidityUSD dailyTxns",
+            f'token: "{token.lower()}",', "date", start, end,
+        )
+        if rows:
+            store.append(self._columns(rows, {
+                "date": ("date", int),
+                "price_usd": ("priceUSD", float),
+                "volume_usd": ("dailyVolumeUSD", float),
+                "volume_token": ("dailyVolumeToken", float),
+                "liquidity_usd": ("totalLiquidityUSD", float),
+                "txns": ("dailyTxns", int),
+            }))
+        return len(rows)
+
+    def sync_pair_hours(self, pair: str, since: int = 0) -> int:
+        """
+        Appends closed pairHourDatas for a pair.
+
+        :return: Number of rows appended.
+        """
+        store = self._store("pair_hours", pair, PAIR_HOUR_SCHEMA, "hour")
+        last = store.last()
+        start = since if last is None else last + 1
+        end = (self._indexed_until() // HOUR) * HOUR - 1  # only hours that have closed and been indexed
+        rows = self._fetch(
+            "pairHourDatas",
+            "reserve0 reserve1 reserveUSD hourlyVolumeToken0 hourlyVolumeToken1 hourlyVolumeUSD hourlyTxns",
+            f'pair: "{pair.lower()}",', "hourStartUnix", start, end,
+        )
+        if rows:
+            store.append(self._columns(rows, {
+                "hour": ("hourStartUnix", int),
+                "reserve0": ("reserve0", float),
+                "reserve1": ("reserve1", float),
+                "reserve_usd": ("reserveUSD", float),
+                "volume_token0": ("hourlyVolumeToken0", float),
+                "volume_token1": ("hourlyVolumeToken1", float),
+                "volume_usd": ("hourlyVolumeUSD", float),
+                "txns": ("hourlyTxns", int),
+            }))
+        return len(rows)
+
+    def sync_swaps(self, pair: str, since: int = 0) -> int:
+        """
+        Appends swaps on a pair up to FINALITY_LAG seconds before the subgraph's indexed head.
+
+        :return: Number of rows appended.
+        """
+        store = self._store("swaps", pair, SWAP_SCHEMA, "timestamp")
+        last = store.last()
+        start = since if last is None else last + 1
+        end = self._indexed_until() - FINALITY_LAG
+        rows = self._fetch(
+            "swaps",
+            "amount0In amount1In amount0Out amount1Out amountUSD",
+            f'pair: "{pair.lower()}",', "timestamp", start, end,
+        )
+        if rows:
+            store.append(self._columns(rows, {
+                "timestamp": ("timestamp", int),
+                "amount0_in": ("amount0In", float),
+                "amount1_in": ("amount1In", float),
+                "amount0_out": ("amount0Out", float),
+                "amount1_out": ("amount1Out", float),
+                "amount_usd": ("amountUSD", float),
+            }))
+        return len(rows)
+
+    # ------------------------------------------------------------------ #
+    # Range queries
+    # ------------------------------------------------------------------ #
+    def token_days(self, token: str, start: int, end: int) -> Dict[str, Sequence]:
+        return self._store("token_days", token, TOKEN_DAY_SCHEMA, "date").range(start, end)
+
+    def pair_hours(self, pair: str, start: int, end: int) -> Dict[str, Sequence]:
+        return self._store("pair_hours", pair, PAIR_HOUR_SCHEMA, "hour").range(start, end)
+
+    def swaps(self, pair: str, start: int, end: int) -> Dict[str, Sequence]:
+        return self._store("swaps", pair, SWAP_SCHEMA, "timestamp").range(start, end)
+
+    def ohlc(self, pair: str, start: int, end: int, interval: int = HOUR) -> List[dict]:
+        """
+        Builds OHLC candles of token0's price in token1 from stored swaps.
+
+        :param interval: Candle width in seconds.
+        :return: [{time, open, high, low, close, volume_usd, trades}], oldest first.
+        """
+        swaps = self.swaps(pair, start, end)
+        candles: List[dict] = []
+        for i, ts in enumerate(swaps["timestamp"]):
+            amount0 = swaps["amount0_in"][i] + swaps["amount0_out"][i]
+            if amount0 <= 0:
+                continue
+            price = float((swaps["amount1_in"][i] + swaps["amount1_out"][i]) / amount0)
+            bucket = int(ts) // interval * interval
+            if not candles or candles[-1]["time"] != bucket:
+                candles.append({
+                    "time": bucket, "open": price, "high": price, "low": price,
+                    "close": price, "volume_usd": 0.0, "trades": 0,
+                })
+            candle = candles[-1]
+            candle["high"] = max(candle["high"], price)
+            candle["low"] = min(candle["low"], price)
+            candle["close"] = price
+            candle["volume_usd"] += float(swaps["amount_usd"][i])
+            candle["trades"] += 1
+        return candles
+
+
+# Shared history store
+history_store = HistoryStore()
@@ -0,0 +1,356 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+from . import config
+from .config import MUSD_ADDRESS, WRAPPED_BTC_ADDRESS
+from .rpc_batch import rpc_batch, RpcError
+
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".cache", "mezo_agent", "index.sqlite")
+INITIAL_RANGE = 2000  # blocks per eth_getLogs range to start with
+MIN_RANGE = 1
+MAX_RANGE = 50000
+GROW_BELOW_LOGS = 1000  # ranges returning fewer logs than this double the next range
+HASH_HISTORY = 256  # recent checkpoint hashes kept for reorg detection
+INCONSISTENT_RETRIES = 3  # re-fetches of a range whose logs and headers disagree
+
+# Event signatures (keccak256 of the canonical declarations)
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+APPROVAL_TOPIC = "0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"
+# Swap(address indexed sender, uint amount0In, uint amount1In, uint amount0Out, uint amount1Out, address indexed to)
+SWAP_TOPIC = "0xd78ad95fa46c994b6551d0da85fc275fe613ce37657fb8d5e3d130840159d822"
+
+RANGE_ERROR_MARKERS = ("range", "limit", "too many", "too large", "exceed", "timeout", "timed out")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    block_number INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    tx_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    event TEXT NOT NULL,
+    from_address TEXT,
+    to_address TEXT,
+    amount TEXT,
+    data TEXT,
+    PRIMARY KEY (tx_hash, log_index)
+);
+CREATE INDEX IF NOT EXISTS logs_block ON logs (block_number);
+CREATE INDEX IF NOT EXISTS logs_event ON logs (event, address);
+CREATE TABLE IF NOT EXISTS balances (token TEXT PRIMARY KEY, balance TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS block_hashes (number INTEGER PRIMARY KEY, hash TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS checkpoint (id INTEGER PRIMARY KEY CHECK (id = 0), block INTEGER NOT NULL);
+"""
+
+
+def _topic(address: str) -> str:
+    return "0x" + "0" * 24 + address.lower()[2:]
+
+
+class InconsistentRangeError(Exception):
+    """
+    Raised when a range's logs do not belong to the block headers fetched with them,
+    e.g. because a reorg landed between the calls or they were served by nodes at
+    different heads.
+    """
+
+
+def _is_range_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(marker in message for marker in RANGE_ERROR_MARKERS)
+
+
+class LogIndexer:
+    """
+    Incrementally indexes our wallet's token and swap activity into SQLite.
+
+    For each block range it fetches, in one JSON-RPC batch: Transfer logs of the
+    configured ERC-20s from and to the wallet, their Approval logs by the wallet, Swap
+    logs paying the wallet, and the range's last block hash. Every log's blockHash is
+    checked against the canonical header of its block, and the range is re-fetched if
+    they disagree. The range grows while results are small and halves when the node
+    rejects it. Token balances are kept as
+    running totals, so balance and activity queries are local reads.
+
+    Every checkpoint stores its block hash. Before the next range the checkpoint hash
+    is compared with the chain; on a mismatch the index rolls back to the newest
+    stored block that still matches and re-indexes from there.
+    """
+
+    def __init__(
+        self,
+        wallet: Optional[str] = None,
+        tokens: Optional[List[str]] = None,
+        db_path: Optional[str] = None,
+        start_block: int = 0,
+    ):
+        """
+        :param wallet: Address to index (defaults to config.sender_address).
+        :param tokens: ERC-20 addresses to follow (defaults to mUSD and Wrapped BTC).
+        :param db_path: SQLite file (defaults to MEZO_INDEX_DB or ~/.cache).
+        :param start_block: First block to index for an empty database.
+        """
+        self._wallet = wallet
+        self.tokens = [t.lower() for t in (tokens or [MUSD_ADDRESS, WRAPPED_BTC_ADDRESS])]
+        self.db_path = db_path or os.getenv("MEZO_INDEX_DB", DEFAULT_DB_PATH)
+        self.start_block = start_block
+        self.range_size = INITIAL_RANGE
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+
+    @property
+    def wallet(self) -> str:
+        return (self._wallet or config.sender_address).lower()
+
+    # ------------------------------------------------------------------ #
+    # Checkpoint and reorg handling
+    # ------------------------------------------------------------------ #
+    def checkpoint(self) -> Optional[int]:
+        """
+        :return: The last fully indexed block, or None if nothing has been indexed.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT block FROM checkpoint WHERE id = 0").fetchone()
+        return row[0] if row else None
+
+    def _chain_hashes(self, numbers: List[int]) -> List[Optional[str]]:
+        results = rpc_batch([("eth_getBlockByNumber", [hex(n), False]) for n in numbers])
+        return [None if isinstance(r, RpcError) or r is None else r["hash"] for r in results]
+
+    def _check_reorg(self) -> bool:
+        """
+        Rolls back to the newest stored block whose hash still matches the chain.
+
+        :return: True if a reorg was found and rolled back.
+        """
+        with self._lock:
+            stored = self._conn.execute(
+                "SELECT number, hash FROM block_hashes ORDER BY number DESC"
+            ).fetchall()
+        if not stored:
+            return False
+        chain = self._chain_hashes([stored[0][0]])
+        if chain[0] == stored[0][1]:
+            return False
+
+        chain = self._chain_hashes([number for number, _ in stored])
+        ancestor = None
+        for (number, stored_hash), chain_hash in zip(stored, chain):
+            if stored_hash == chain_hash:
+                ancestor = number
+                break
+        if ancestor is None:
+            ancestor = self.start_block - 1  # Deeper than the kept history: rebuild the index
+        print(f"⚠️ Warning: Chain reorganisation detected; rolling the index back to block {ancestor}.")
+        self._rollback(ancestor)
+        return True
+
+    def _rollback(self, block: int):
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT address, event, from_address, to_address, amount FROM logs WHERE block_number > ?", (block,)
+            ).fetchall()
+            deltas: Dict[str, int] = {}
+            for address, event, sender, recipient, amount in rows:
+                if event == "Transfer":
+                    deltas[address] = deltas.get(address, 0) - self._transfer_delta(sender, recipient, int(amount))
+            self._apply_deltas(deltas)
+            self._conn.execute("DELETE FROM logs WHERE block_number > ?", (block,))
+            self._conn.execute("DELETE FROM block_hashes WHERE number > ?", (block,))
+            self._conn.execute("INSERT OR REPLACE INTO checkpoint (id, block) VALUES (0, ?)", (block,))
+
+    # ------------------------------------------------------------------ #
+    # Indexing
+    # ------------------------------------------------------------------ #
+    def _range_calls(self, from_block: int, to_block: int) -> list:
+        wallet = _topic(self.wallet)
+        bounds = {"fromBlock": hex(from_block), "toBlock": hex(to_block)}
+        return [
+            ("eth_getLogs", [dict(bounds, address=self.tokens, topics=[TRANSFER_TOPIC, wallet])]),
+            ("eth_getLogs", [dict(bounds, address=self.tokens, topics=[TRANSFER_TOPIC, None, wallet])]),
+            ("eth_getLogs", [dict(bounds, address=self.tokens, topics=[APPROVAL_TOPIC, wallet])]),
+            ("eth_getLogs", [dict(bounds, topics=[SWAP_TOPIC, None, wallet])]),
+            ("eth_getBlockByNumber", [hex(to_block), False]),
+        ]
+
+    def _transfer_delta(self, sender: str, recipient: str, amount: int) -> int:
+        delta = 0
+        if recipient == self.wallet:
+            delta += amount
+        if sender == self.wallet:
+            delta -= amount
+        return delta
+
+    def _apply_deltas(self, deltas: Dict[str, int]):
+        for token, delta in deltas.items():
+            row = self._conn.execute("SELECT balance FROM balances WHERE token = ?", (token,)).fetchone()
+            balance = (int(row[0]) if row else 0) + delta
+            self._conn.execute("INSERT OR REPLACE INTO balances (token, balance) VALUES (?, ?)", (token, str(balance)))
+
+    def _decode(self, log: dict, event: str) -> tuple:
+        topics = log["topics"]
+        data = log.get("data") or "0x"
+        if event == "Swap":
+            sender, recipient, amount = "0x" + topics[1][-40:], "0x" + topics[2][-40:], None
+        else:
+            sender, recipient = "0x" + topics[1][-40:], "0x" + topics[2][-40:]
+            amount = str(int(data, 16)) if len(data) > 2 else "0"
+        return (
+            int(log["blockNumber"], 16),
+            log["blockHash"],
+            log["transactionHash"],
+            int(log["logIndex"], 16),
+            log["address"].lower(),
+            event,
+            sender,
+            recipient,
+            amount,
+            data,
+        )
+
+    def _verify_block_hashes(self, rows, to_block: int, to_block_hash: str):
+        """
+        Checks every log's blockHash against the chain, so logs from a block that was
+        reorganised away between the batched calls are never stored. The last block's
+        header came with the batch; any other blocks with logs are fetched in one batch.
+        """
+        expected = {to_block: to_block_hash}
+        others = sorted({row[0] for row in rows} - {to_block})
+        if others:
+            expected.update(zip(others, self._chain_hashes(others)))
+        for row in rows:
+            if expected.get(row[0]) != row[1]:
+                raise InconsistentRangeError(
+                    f"❌ Log in block {row[0]} has hash {row[1]}, but the chain has {expected.get(row[0])}."
+                )
+
+    def _index_range(self, from_block: int, to_block: int) -> int:
+        results = rpc_batch(self._range_calls(from_block, to_block))
+        for result in results:
+            if isinstance(result, RpcError):
+                raise result
+        sent, received, approvals, swaps, block = results
+
+        if block is None:
+            raise InconsistentRangeError(f"❌ Block {to_block} is not available yet.")
+
+        rows = {}
+        for logs, event in ((sent, "Transfer"), (received, "Transfer"), (approvals, "Approval"), (swaps, "Swap")):
+            for log in logs:
+                if log.get("removed"):
+                    continue
+                row = self._decode(log, event)
+                rows[(row[2], row[3])] = row  # self-transfers appear in both Transfer queries
+        self._verify_block_hashes(rows.values(), to_block, block["hash"])
+
+        with self._lock, self._conn:
+            deltas: Dict[str, int] = {}
+            for row in rows.values():
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO logs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+                ).rowcount
+                if inserted and row[5] == "Transfer":
+                    deltas[row[4]] = deltas.get(row[4], 0) + self._transfer_delta(row[6], row[7], int(row[8]))
+            self._apply_deltas(deltas)
+            self._conn.execute("INSERT OR REPLACE INTO block_hashes (number, hash) VALUES (?, ?)", (to_block, block["hash"]))
+            self._conn.execute(
+                "DELETE FROM block_hashes WHERE number NOT IN "
+                "(SELECT number FROM block_hashes ORDER BY number DESC LIMIT ?)", (HASH_HISTORY,)
+            )
+            self._conn.execute("INSERT OR REPLACE INTO checkpoint (id, block) VALUES (0, ?)", (to_block,))
+        return len(rows)
+
+    def sync(self, to_block: Optional[int] = None) -> int:
+        """
+        Indexes from the checkpoint up to to_block (default: the chain head).
+
+        :return: Number of logs indexed.
+        """
+        self._check_reorg()
+        head = to_block if to_block is not None else config.web3_instance.eth.block_number
+        checkpoint = self.checkpoint()
+        next_block = self.start_block if checkpoint is None else checkpoint + 1
+        indexed = 0
+        inconsistent = 0
+        while next_block <= head:
+            end = min(next_block + self.range_size - 1, head)
+            try:
+                count = self._index_range(next_block, end)
+            except InconsistentRangeError:
+                inconsistent += 1
+                if inconsistent > INCONSISTENT_RETRIES:
+                    raise
+                if self._check_reorg():
+                    checkpoint = self.checkpoint()
+                    next_block = self.start_block if checkpoint is None else checkpoint + 1
+                continue
+            except Exception as e:
+                if not _is_range_error(e) or self.range_size <= MIN_RANGE:
+                    raise
+                self.range_size = max(self.range_size // 2, MIN_RANGE)
+                continue
+            inconsistent = 0
+            indexed += count
+            if count < GROW_BELOW_LOGS:
+                self.range_size = min(self.range_size * 2, MAX_RANGE)
+            next_block = end + 1
+        return indexed
+
+    def start(self, interval: float = 5.0):
+        """
+        Keeps the index in sync on a background thread, every interval seconds.
+        """
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.sync()
+                except Exception as e:
+                    print(f"⚠️ Warning: Log indexer sync failed: {e}")
+
+        threading.Thread(target=run, name="mezo-log-indexer", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ------------------------------------------------------------------ #
+    # Local queries
+    # ------------------------------------------------------------------ #
+    def balance(self, token: str) -> int:
+        """
+        :return: The wallet's indexed balance of a token, in its smallest unit.
+        Only complete if indexing started at or before the wallet's first transfer.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT balance FROM balances WHERE token = ?", (token.lower(),)).fetchone()
+        return int(row[0]) if row else 0
+
+    def activity(self, limit: int = 50, event: Optional[str] = None, token: Optional[str] = None) -> List[dict]:
+        """
+        :param limit: Maximum number of entries.
+        :param event: Only 'Transfer', 'Approval' or 'Swap' events.
+        :param token: Only logs emitted by this contract.
+        :return: Indexed logs, newest first.
+        """
+        query = "SELECT block_number, tx_hash, log_index, address, event, from_address, to_address, amount FROM logs"
+        clauses, params = [], []
+        if event:
+            clauses.append("event = ?")
+            params.append(event)
+        if token:
+            clauses.append("address = ?")
+            params.append(token.lower())
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY block_number DESC, log_index DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        keys = ("block_number", "tx_hash", "log_index", "address", "event", "from", "to", "amount")
+        return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,145 @@
+"""
+One-call intent extraction for every Mezo tool.
+
+extract_intent classifies a request (transfer, swap, balance, price or chat) and pulls
+all of its fields in a single LLM round trip, or none when the fast path can parse it
+locally. The result (or its JSON string) can be passed straight to any tool, whose
+extract_* step then makes no further LLM call.
+"""
+import re
+import json
+from typing import Union
+from langchain.prompts import PromptTemplate
+from .config import ROUTER_ADDRESS
+from .context import get_context
+from . import fast_parser
+from .parsing import _known_token_symbols
+
+INTENTS = ("transfer", "swap", "balance", "price", "chat")
+FIELDS = ("amount", "currency", "recipient", "token_symbol", "from_currency", "to_currency")
+
+# Keywords that let the fast path pick an intent without the LLM
+INTENT_KEYWORDS = {
+    "transfer": re.compile(r"\b(send|transfer|pay)\b", re.IGNORECASE),
+    "swap": re.compile(r"\b(swap|exchange|convert|trade)\b", re.IGNORECASE),
+    "balance": re.compile(r"\b(balance|holdings?)\b", re.IGNORECASE),
+    "price": re.compile(r"\b(price|worth|cost|value)\b", re.IGNORECASE),
+}
+
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+intent_prompt_template = PromptTemplate(
+    template="""Classify the request and extract its details. Output a JSON object with these keys:
+- intent: (string) one of "transfer" (send tokens to an address), "swap" (swap one token for another),
+  "balance" (check a token balance), "price" (check a token price) or "chat" (anything else).
+- amount: (string or null) the amount to transfer or swap.
+- currency: (string or null) for transfers, "BTC" or "mUSD".
+- recipient: (string or null) for transfers, the recipient's 0x wallet address.
+- token_symbol: (string or null) for balance and price checks, the token symbol (e.g. "MUSD").
+- from_currency: (string or null) for swaps, the symbol of the token given, exactly as requested.
+- to_currency: (string or null) for swaps, the symbol of the token received, exactly as requested.
+
+Request:
+{input}
+
+Your output must be a valid JSON object with no additional text.
+""",
+    input_variables=["input"],
+)
+
+
+def _empty_intent(intent: str) -> dict:
+    return dict({"intent": intent}, **{f: None for f in FIELDS})
+
+
+def _fast_intent(prompt: str):
+    """
+    Resolves the intent locally when exactly one intent's keywords match and that
+    intent's deterministic parser accepts the prompt.
+    """
+    matches = [intent for intent, pattern in INTENT_KEYWORDS.items() if pattern.search(prompt)]
+    if len(matches) != 1:
+        return None
+    intent = _empty_intent(matches[0])
+    if matches[0] == "transfer":
+        parsed = fast_parser.parse_transaction(prompt)
+    elif matches[0] == "swap":
+        parsed = fast_parser.parse_swap(prompt, ROUTER_ADDRESS)
+        parsed = parsed and {f: parsed[f] for f in ("amount", "from_currency", "to_currency")}
+    else:
+        parsed = fast_parser.parse_token_symbol(prompt, _known_token_symbols())
+    if parsed is None:
+        return None
+    intent.update(parsed)
+    intent["source"] = "fast_path"
+    return intent
+
+
+def extract_intent(prompt: str) -> Union[dict, str]:
+    """
+    Classifies a request and extracts every field its tool needs.
+
+    :param prompt: The user's request.
+    :return: {intent, amount, currency, recipient, token_symbol, from_currency, to_currency, source}
+             or an error message.
+    """
+    fast = _fast_intent(prompt)
+    if fast is not None:
+        return fast
+
+    response = get_context().llm.invoke(intent_prompt_template.format(input=prompt))
+    match = _JSON_OBJECT_RE.search(response.content)
+    try:
+        parsed = json.loads(match.group(0) if match else response.content)
+    except ValueError as e:
+        return f"❌ Failed to extract intent: {str(e)}"
+
+    intent = _empty_intent(str(parsed.get("intent", "chat")).lower())
+    if intent["intent"] not in INTENTS:
+        intent["intent"] = "chat"
+    for field in FIELDS:
+        if parsed.get(field) not in (None, ""):
+            intent[field] = str(parsed[field])
+    intent["source"] = "llm"
+    return intent
+
+
+def run_intent(prompt: str, character: str = "DigAIJoe") -> str:
+    """
+    Extracts the intent once and dispatches to the matching tool with the pre-parsed result.
+
+    :param prompt: The user's request.
+    :param character: Personality used when the request is plain chat.
+    :return: The tool's response.
+    """
+    intent = extract_intent(prompt)
+    if isinstance(intent, str):
+        return intent
+
+    kind = intent["intent"]
+    if kind == "chat":
+        from .chat import mezo_character_chat
+
+        return mezo_character_chat.invoke({"prompt": prompt, "character": character})
+
+    payload = json.dumps(intent)
+    if kind == "transfer":
+        from .transaction import mezo_agent_transaction_btc, mezo_agent_musd_transaction
+
+        currency = (intent["currency"] or "").lower()
+        if currency == "btc":
+            return mezo_agent_transaction_btc.invoke(payload)
+        if currency == "musd":
+            return mezo_agent_musd_transaction.invoke(payload)
+        return f"❌ Unsupported transfer currency: {intent['currency']}"
+    if kind == "swap":
+        from .swap_musd_btc import mezo_agent_swap_musd_btc
+
+        return mezo_agent_swap_musd_btc.invoke(payload)
+    if kind == "balance":
+        from .token_balance_tool import mezo_agent_token_balance_tool
+
+        return mezo_agent_token_balance_tool.invoke(payload)
+    from .token_price_tool import mezo_agent_token_price_tool
+
+    return mezo_agent_token_price_tool.invoke(payload)
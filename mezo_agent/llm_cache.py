@@ -0,0 +1,295 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional
+
+DEFAULT_TTL = 3600  # seconds a cached completion is served
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_DISK_PATH = os.path.join(os.path.expanduser("~"), ".cache", "mezo_agent", "llm_cache.sqlite")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Collapses runs of whitespace so prompts differing only in spacing share an entry.
+    Case is kept: addresses and symbols in the prompt are echoed back by the model.
+    """
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+def _prompt_text(prompt) -> str:
+    if isinstance(prompt, str):
+        return prompt
+    if hasattr(prompt, "to_string"):  # LangChain PromptValue
+        return prompt.to_string()
+    return json.dumps([getattr(m, "content", str(m)) for m in prompt])  # Message list
+
+
+class MemoryBackend:
+    """
+    Bounded LRU of key -> (expires_at, content).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, content: str, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """
+    On-disk cache shared across processes and restarts.
+    """
+
+    def __init__(self, path: str = DEFAULT_DISK_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, content TEXT, expires_at REAL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM completions WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, content: str, ttl: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, content, expires_at) VALUES (?, ?, ?)",
+                (key, content, time.time() + ttl),
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM completions")
+
+
+class CachedChatModel:
+    """
+    Drop-in wrapper around a chat model that caches invoke() results.
+
+    Entries are keyed on the model name, a namespace (the prompt template or caller)
+    and the whitespace-normalized prompt, and expire after a TTL. Lookups go to an
+    in-memory LRU first and then to an optional disk backend. Concurrent identical
+    requests share one in-flight call. Only deterministic models (temperature 0)
+    are cached; anything else passes straight through. Every other attribute is
+    forwarded to the wrapped model.
+    """
+
+    def __init__(
+        self,
+        llm,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        disk_backend: Optional[SQLiteBackend] = None,
+    ):
+        """
+        :param llm: Chat model with an invoke() method (e.g. ChatOpenAI).
+        :param ttl: Seconds a cached completion is served.
+        :param max_entries: Size of the in-memory LRU.
+        :param disk_backend: Optional second-level cache (e.g. SQLiteBackend).
+        """
+        self.llm = llm
+        self.ttl = ttl
+        self.memory = MemoryBackend(max_entries)
+        self.disk = disk_backend
+        self.enabled = getattr(llm, "temperature", None) == 0
+        self.model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "bypassed": 0}
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def cache_key(self, prompt, namespace: str = "") -> str:
+        payload = json.dumps([self.model, namespace, normalize_prompt(_prompt_text(prompt))])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[str]:
+        content = self.memory.get(key)
+        if content is not None:
+            self._count("hits")
+            return content
+        if self.disk is not None:
+            content = self.disk.get(key)
+            if content is not None:
+                self._count("disk_hits")
+                self.memory.set(key, content, self.ttl)
+                return content
+        return None
+
+    def invoke(self, prompt, namespace: str = "", **kwargs):
+        """
+        :param prompt: Prompt string, PromptValue or message list.
+        :param namespace: Template or caller name included in the cache key.
+        :return: An AI message, served from the cache when possible.
+        """
+        if not self.enabled or kwargs:
+            self._count("bypassed")
+            return self.llm.invoke(prompt, **kwargs)
+
+        from langchain_core.messages import AIMessage
+
+        key = self.cache_key(prompt, namespace)
+        content = self._lookup(key)
+        if content is not None:
+            return AIMessage(content=content)
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        if not leader:
+            self._count("coalesced")
+            return AIMessage(content=future.result())
+
+        self._count("misses")
+        try:
+            content = self.llm.invoke(prompt).content
+            self._store(key, content)
+            future.set_result(content)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        return AIMessage(content=content)
+
+    def _store(self, key: str, content: str):
+        self.memory.set(key, content, self.ttl)
+        if self.disk is not None:
+            self.disk.set(key, content, self.ttl)
+
+    def stream(self, prompt, namespace: str = "", **kwargs):
+        """
+        Streams message chunks; a cached completion is yielded as one chunk and a
+        streamed one is cached once it completes.
+        """
+        if not self.enabled or kwargs:
+            self._count("bypassed")
+            yield from self.llm.stream(prompt, **kwargs)
+            return
+
+        from langchain_core.messages import AIMessageChunk
+
+        key = self.cache_key(prompt, namespace)
+        content = self._lookup(key)
+        if content is not None:
+            yield AIMessageChunk(content=content)
+            return
+        self._count("misses")
+        parts = []
+        for chunk in self.llm.stream(prompt):
+            parts.append(chunk.content)
+            yield chunk
+        self._store(key, "".join(parts))
+
+    async def astream(self, prompt, namespace: str = "", **kwargs):
+        """
+        Async variant of stream().
+        """
+        if not self.enabled or kwargs:
+            self._count("bypassed")
+            async for chunk in self.llm.astream(prompt, **kwargs):
+                yield chunk
+            return
+
+        from langchain_core.messages import AIMessageChunk
+
+        key = self.cache_key(prompt, namespace)
+        content = self._lookup(key)
+        if content is not None:
+            yield AIMessageChunk(content=content)
+            return
+        self._count("misses")
+        parts = []
+        async for chunk in self.llm.astream(prompt):
+            parts.append(chunk.content)
+            yield chunk
+        self._store(key, "".join(parts))
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def get_stats(self) -> dict:
+        """
+        :return: Hit/miss counters plus the overall hit rate.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        served = stats["hits"] + stats["disk_hits"] + stats["coalesced"]
+        total = served + stats["misses"]
+        stats["hit_rate"] = served / total if total else 0.0
+        stats["enabled"] = self.enabled
+        return stats
+
+
+def wrap_llm(llm):
+    """
+    Wraps a chat model in a CachedChatModel configured from the environment:
+    MEZO_LLM_CACHE ('memory' (default), 'sqlite' or 'off'), MEZO_LLM_CACHE_TTL
+    and MEZO_LLM_CACHE_PATH.
+    """
+    mode = os.getenv("MEZO_LLM_CACHE", "memory").lower()
+    if mode == "off":
+        return llm
+    disk = None
+    if mode == "sqlite":
+        try:
+            disk = SQLiteBackend(os.getenv("MEZO_LLM_CACHE_PATH", DEFAULT_DISK_PATH))
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Warning: Could not open the LLM disk cache, using memory only: {e}")
+    return CachedChatModel(llm, ttl=float(os.getenv("MEZO_LLM_CACHE_TTL", DEFAULT_TTL)), disk_backend=disk)
+
+
+def get_llm_cache_stats() -> dict:
+    """
+    :return: Cache statistics for the shared context's LLM, or {} if it is not cached.
+    """
+    from .context import get_context
+
+    llm = get_context().llm
+    return llm.get_stats() if isinstance(llm, CachedChatModel) else {}
@@ -0,0 +1,215 @@
+import threading
+from typing import Awaitable, Callable, Optional, TypeVar
+from web3 import Web3
+from . import config
+
+T = TypeVar("T")
+
+# Node error fragments that mean our local nonce view disagrees with the chain.
+# "already known" is deliberately absent: it means a retried broadcast of the same
+# signed transaction reached the pool, and must not be re-sent under a new nonce.
+NONCE_ERROR_MARKERS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "replacement transaction underpriced",
+)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """
+    :return: True if the node rejected a transaction because of its nonce.
+    """
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERROR_MARKERS)
+
+
+def is_already_known(error: Exception) -> bool:
+    """
+    :return: True if the node already holds this exact signed transaction.
+    """
+    message = str(error).lower()
+    return "already known" in message or "already imported" in message
+
+
+class NonceManager:
+    """
+    Hands out nonces for one account locally so many sends can be in flight at once.
+
+    The chain's pending transaction count is read once; after that every send takes
+    the next nonce from a counter guarded by a lock (never held across an await, so
+    it is safe from threads and coroutines alike). The counter is re-read from the
+    chain when the node reports a nonce error, a broadcast fails with an unknown
+    outcome, or an allocated nonce goes unused.
+    """
+
+    def __init__(self, address: Optional[str] = None, web3=None):
+        """
+        :param address: Account whose nonces are managed (defaults to config.sender_address).
+        :param web3: Web3 instance used for resyncs (defaults to config.web3_instance).
+        """
+        self._address = address
+        self._web3 = web3
+        self._next: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def address(self) -> str:
+        return self._address or config.sender_address
+
+    @property
+    def web3(self):
+        return self._web3 or config.web3_instance
+
+    def _chain_nonce(self) -> int:
+        return self.web3.eth.get_transaction_count(self.address, "pending")
+
+    def _take(self, count: int = 1) -> int:
+        nonce = self._next
+        self._next += count
+        return nonce
+
+    def next_nonce(self) -> int:
+        """
+        :return: The next unused nonce, syncing with the chain on first use.
+        """
+        with self._lock:
+            if self._next is None:
+                self._next = self._chain_nonce()
+            return self._take()
+
+    async def next_nonce_async(self, async_web3) -> int:
+        """
+        Async variant of next_nonce(); the initial chain read is awaited outside the lock.
+        """
+        while True:
+            with self._lock:
+                if self._next is not None:
+                    return self._take()
+            chain_nonce = await async_web3.eth.get_transaction_count(self.address, "pending")
+            with self._lock:
+                if self._next is None:
+                    self._next = chain_nonce
+
+    def reserve(self, count: int) -> range:
+        """
+        Allocates a block of consecutive nonces, e.g. for a batch submission.
+        """
+        with self._lock:
+            if self._next is None:
+                self._next = self._chain_nonce()
+            start = self._take(count)
+        return range(start, start + count)
+
+    def release(self, nonce: int):
+        """
+        Returns a nonce that was allocated but never broadcast. The most recent nonce is
+        simply handed out again; an older one leaves a gap, so the next send resyncs.
+        """
+        with self._lock:
+            if self._next is None:
+                return
+            if nonce == self._next - 1:
+                self._next = nonce
+            elif nonce < self._next:
+                self._next = None
+
+    def resync(self, chain_nonce: Optional[int] = None):
+        """
+        Resets the local counter to the chain's pending transaction count.
+        """
+        if chain_nonce is None:
+            chain_nonce = self._chain_nonce()
+        with self._lock:
+            self._next = chain_nonce
+
+    async def resync_async(self, async_web3):
+        self.resync(await async_web3.eth.get_transaction_count(self.address, "pending"))
+
+    def _broadcast_failed(self):
+        """
+        Forgets the local counter after a broadcast whose outcome is unknown (timeout,
+        connection error, rejection): the transaction may or may not be in the pool, so
+        the next send re-reads the chain's pending count instead of reusing the nonce.
+        """
+        with self._lock:
+            self._next = None
+
+    def send(
+        self,
+        sign_fn: Callable[[int], bytes],
+        nonce: Optional[int] = None,
+        retries: int = 1,
+        broadcast_fn: Optional[Callable[[bytes], T]] = None,
+    ) -> T:
+        """
+        Signs a transaction with sign_fn(nonce) and broadcasts it.
+
+        A signing (or building) failure happens before anything reaches the node, so
+        the nonce is released. On a nonce error the counter is resynced and the send
+        retried. "already known" means an earlier attempt of this exact transaction
+        reached the pool, so its hash is returned. Any other broadcast failure may have
+        been accepted anyway, so the nonce is never reused: the counter is resynced.
+
+        :param sign_fn: Builds and signs the transaction for the given nonce, returning the raw bytes.
+        :param nonce: A nonce already allocated for this send, if any.
+        :param retries: Number of resync-and-retry attempts after a nonce error.
+        :param broadcast_fn: Sends raw bytes (defaults to eth.send_raw_transaction).
+        :return: The transaction hash.
+        """
+        broadcast_fn = broadcast_fn or self.web3.eth.send_raw_transaction
+        if nonce is None:
+            nonce = self.next_nonce()
+        while True:
+            try:
+                raw_tx = sign_fn(nonce)
+            except Exception:
+                self.release(nonce)
+                raise
+            try:
+                return broadcast_fn(raw_tx)
+            except Exception as e:
+                if is_already_known(e):
+                    return Web3.keccak(raw_tx)
+                if not is_nonce_error(e) or retries <= 0:
+                    self._broadcast_failed()
+                    raise
+                retries -= 1
+                self.resync()
+                nonce = self.next_nonce()
+
+    async def send_async(
+        self,
+        async_web3,
+        sign_fn: Callable[[int], bytes],
+        nonce: Optional[int] = None,
+        retries: int = 1,
+        broadcast_fn: Optional[Callable[[bytes], Awaitable[T]]] = None,
+    ) -> T:
+        """
+        Async variant of send(); broadcast_fn defaults to async_web3.eth.send_raw_transaction.
+        """
+        broadcast_fn = broadcast_fn or async_web3.eth.send_raw_transaction
+        if nonce is None:
+            nonce = await self.next_nonce_async(async_web3)
+        while True:
+            try:
+                raw_tx = sign_fn(nonce)
+            except Exception:
+                self.release(nonce)
+                raise
+            try:
+                return await broadcast_fn(raw_tx)
+            except Exception as e:
+                if is_already_known(e):
+                    return Web3.keccak(raw_tx)
+                if not is_nonce_error(e) or retries <= 0:
+                    self._broadcast_failed()
+                    raise
+                retries -= 1
+                await self.resync_async(async_web3)
+                nonce = await self.next_nonce_async(async_web3)
+
+
+# Shared manager for the configured sender account
+nonce_manager = NonceManager()
@@ -1,7 +1,113 @@
 from langchain.output_parsers import StructuredOutputParser, ResponseSchema
 from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
-from .config import OPENAI_API_KEY
+import json
+import threading
+from web3 import Web3
+from .config import ROUTER_ADDRESS
+from .context import get_context
+from . import fast_parser
+from .token_registry import token_registry
+
+# Hit-rate counters: how many extractions were served locally, pre-parsed or by the LLM
+_parse_stats = {}
+_parse_stats_lock = threading.Lock()
+
+def _record_parse(kind: str, source: str):
+    with _parse_stats_lock:
+        counts = _parse_stats.setdefault(kind, {"fast_path": 0, "intent": 0, "llm": 0})
+        counts[source] += 1
+
+def get_parse_stats() -> dict:
+    """
+    Returns per-extractor counts of fast-path, pre-parsed intent and LLM extractions,
+    plus the hit rate (share of extractions that needed no LLM call of their own).
+    """
+    with _parse_stats_lock:
+        stats = {}
+        for kind, counts in _parse_stats.items():
+            total = sum(counts.values())
+            hits = counts["fast_path"] + counts["intent"]
+            stats[kind] = dict(counts, hit_rate=hits / total if total else 0.0)
+        return stats
+
+# Intent each extractor accepts, and the intent fields it needs
+INTENT_FIELDS = {
+    "transaction": ("transfer", ("amount", "currency", "recipient")),
+    "swap": ("swap", ("amount", "from_currency", "to_currency")),
+    "balance": ("balance", ("token_symbol",)),
+    "price": ("price", ("token_symbol",)),
+}
+
+def _preparsed(kind: str, prompt):
+    """
+    Accepts a result from intent.extract_intent (a dict, or its JSON string) in place of
+    a free-text prompt, so a tool can run without a second extraction call.
+
+    :return: The extractor's result shape, an error string, or None if prompt is plain text.
+    """
+    intent = prompt
+    if isinstance(prompt, str):
+        text = prompt.strip()
+        if not text.startswith("{"):
+            return None
+        try:
+            intent = json.loads(text)
+        except ValueError:
+            return None
+    if not isinstance(intent, dict) or "intent" not in intent:
+        return None
+
+    expected, fields = INTENT_FIELDS[kind]
+    if intent["intent"] != expected:
+        return f"❌ Expected a {expected} request, got '{intent['intent']}'."
+    missing = [f for f in fields if not intent.get(f)]
+    if missing:
+        return f"❌ Missing {', '.join(missing)} in {expected} request."
+
+    # Same checks the local parser applies, so a bad pre-parsed value never reaches Web3.to_wei
+    if "amount" in fields and not fast_parser.is_positive_amount(intent["amount"]):
+        return f"❌ Invalid amount '{intent['amount']}' in {expected} request: expected a positive number."
+    if "recipient" in fields and not Web3.is_address(str(intent["recipient"])):
+        return f"❌ Invalid recipient address '{intent['recipient']}' in {expected} request."
+
+    result = {f: intent[f] for f in fields}
+    if kind == "swap":
+        # The swap tool only trades mUSD for BTC; any other pair must not be coerced into it
+        direction = (str(intent["from_currency"]).lower(), str(intent["to_currency"]).lower())
+        if direction[0] != "musd" or direction[1] not in fast_parser.BTC_SYMBOLS:
+            return f"❌ Only mUSD to BTC swaps are supported, got {intent['from_currency']} to {intent['to_currency']}."
+        result.update(from_currency="mUSD", to_currency="BTC", router_address=ROUTER_ADDRESS)
+    _record_parse(kind, "intent")
+    result["source"] = "intent"
+    return result
+
+def _fast_path(kind: str, result):
+    """
+    Tags a locally parsed result and counts it, or returns None when the local parse was ambiguous.
+    """
+    if result is None:
+        return None
+    _record_parse(kind, "fast_path")
+    result["source"] = "fast_path"
+    return result
+
+def _llm_path(kind: str, parser, content: str):
+    _record_parse(kind, "llm")
+    result = parser.parse(content)
+    result["source"] = "llm"
+    return result
+
+def _known_token_symbols() -> set:
+    """
+    Lowercase token symbols the fast path may match: the registry's list plus user-facing aliases.
+    Only symbols already cached are used, so a cold start does not wait on the subgraph.
+    """
+    symbols = {"btc", "musd"}
+    try:
+        symbols.update(s.lower() for s in token_registry.cached_symbols())
+    except Exception:
+        pass  # Registry unreachable: fall back to the built-in symbols
+    return symbols
 
 # Define the expected response schema for extracting transaction details
 response_schemas = [
@@ -13,9 +119,6 @@ response_schemas = [
 # Initialize the structured output parser
 output_parser = StructuredOutputParser.from_response_schemas(response_schemas)
 
-# Instantiate the ChatOpenAI LLM
-llm = ChatOpenAI(temperature=0, openai_api_key=OPENAI_API_KEY)
-
 # Prepare the prompt template
 prompt_template = PromptTemplate(
     template="Extract transaction details from this request:\n{input}\n{format_instructions}",
@@ -25,13 +128,22 @@ prompt_template = PromptTemplate(
 
 def extract_transaction_details(prompt: str):
     """
-    Uses LLM to extract structured transaction details from user input.
+    Extracts structured transaction details from user input, using the LLM only
+    when the local parse is ambiguous. A pre-parsed intent is used as-is.
     """
+    preparsed = _preparsed("transaction", prompt)
+    if preparsed is not None:
+        return preparsed
+
+    fast = _fast_path("transaction", fast_parser.parse_transaction(prompt))
+    if fast is not None:
+        return fast
+
     formatted_prompt = prompt_template.format(input=prompt)
-    response = llm.invoke(formatted_prompt)
+    response = get_context().llm.invoke(formatted_prompt)
 
     try:
-        return output_parser.parse(response.content)
+        return _llm_path("transaction", output_parser, response.content)
     except Exception as e:
         return f"❌ Failed to extract transaction details: {str(e)}"
     
@@ -57,10 +169,18 @@ swap_prompt_template = PromptTemplate(
 )
 
 def extract_swap_details(prompt: str):
+    preparsed = _preparsed("swap", prompt)
+    if preparsed is not None:
+        return preparsed
+
+    fast = _fast_path("swap", fast_parser.parse_swap(prompt, ROUTER_ADDRESS))
+    if fast is not None:
+        return fast
+
     formatted_prompt = swap_prompt_template.format(input=prompt)
-    response = llm.invoke(formatted_prompt)
+    response = get_context().llm.invoke(formatted_prompt)
     try:
-        return swap_output_parser.parse(response.content)
+        return _llm_path("swap", swap_output_parser, response.content)
     except Exception as e:
         return f"Failed to extract swap details: {str(e)}"
     
@@ -85,11 +205,19 @@ Your output must be a valid JSON object with no additional text.
 )
 
 def extract_balance_details(prompt: str):
+    preparsed = _preparsed("balance", prompt)
+    if preparsed is not None:
+        return preparsed
+
+    fast = _fast_path("balance", fast_parser.parse_token_symbol(prompt, _known_token_symbols()))
+    if fast is not None:
+        return fast
+
     formatted_prompt = balance_prompt_template.format(input=prompt)
-    response = llm.invoke(formatted_prompt)
+    response = get_context().llm.invoke(formatted_prompt)
     print("LLM raw balance response:", response.content)
     try:
-        return balance_output_parser.parse(response.content)
+        return _llm_path("balance", balance_output_parser, response.content)
     except Exception as e:
         return f"Failed to extract balance details: {str(e)}"
     
@@ -118,10 +246,18 @@ def extract_price_details(prompt: str):
     :param prompt: User input asking for a token price.
     :return: Dictionary containing the token symbol or an error message.
     """
+    preparsed = _preparsed("price", prompt)
+    if preparsed is not None:
+        return preparsed
+
+    fast = _fast_path("price", fast_parser.parse_token_symbol(prompt, _known_token_symbols()))
+    if fast is not None:
+        return fast
+
     formatted_prompt = price_prompt_template.format(input=prompt)
-    response = llm.invoke(formatted_prompt)
+    response = get_context().llm.invoke(formatted_prompt)
     print("LLM raw price response:", response.content)  # Debugging
     try:
-        return price_output_parser.parse(response.content)
+        return _llm_path("price", price_output_parser, response.content)
     except Exception as e:
         return f"❌ Failed to extract price details: {str(e)}"
@@ -0,0 +1,153 @@
+import os
+from typing import Iterable, List, Optional, Tuple
+from eth_abi import decode, encode
+from web3 import Web3
+from . import config
+from .rpc_batch import rpc_batch, RpcError
+from .token_registry import token_registry
+
+MULTICALL3_ADDRESS = Web3.to_checksum_address(
+    os.getenv("MEZO_MULTICALL3_ADDRESS", "0xcA11bde05977b3631167028862bE2a173976CA11")
+)
+MULTICALL_CHUNK = 1000  # calls packed into one aggregate3 eth_call
+
+# Function selectors, encoded by hand so building thousands of calls stays cheap
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")  # aggregate3((address,bool,bytes)[])
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")  # balanceOf(address)
+DECIMALS_SELECTOR = bytes.fromhex("313ce567")  # decimals()
+GET_ETH_BALANCE_SELECTOR = bytes.fromhex("4d2301cc")  # Multicall3.getEthBalance(address)
+
+NATIVE_SYMBOL = "BTC"
+
+_multicall_available: Optional[bool] = None
+
+Call = Tuple[str, bytes]
+
+
+def _address_call(selector: bytes, address: str) -> bytes:
+    return selector + bytes(12) + bytes.fromhex(address[2:])
+
+
+def _has_multicall() -> bool:
+    """
+    Checks once whether Multicall3 is deployed on the connected chain.
+    """
+    global _multicall_available
+    if _multicall_available is None:
+        try:
+            _multicall_available = len(config.web3_instance.eth.get_code(MULTICALL3_ADDRESS)) > 0
+        except Exception:
+            _multicall_available = False
+    return _multicall_available
+
+
+def _execute_multicall(calls: List[Call]) -> List[Optional[bytes]]:
+    """
+    Packs calls into aggregate3 eth_calls and sends all of them in one JSON-RPC batch.
+    """
+    requests = []
+    for start in range(0, len(calls), MULTICALL_CHUNK):
+        chunk = [(target, True, data) for target, data in calls[start:start + MULTICALL_CHUNK]]
+        calldata = AGGREGATE3_SELECTOR + encode(["(address,bool,bytes)[]"], [chunk])
+        requests.append(("eth_call", [{"to": MULTICALL3_ADDRESS, "data": "0x" + calldata.hex()}, "latest"]))
+
+    results: List[Optional[bytes]] = []
+    for response in rpc_batch(requests):
+        if isinstance(response, RpcError):
+            raise response
+        (decoded,) = decode(["(bool,bytes)[]"], bytes.fromhex(response[2:]))
+        results.extend(data if success else None for success, data in decoded)
+    return results
+
+
+def _execute_batch(calls: List[Call]) -> List[Optional[bytes]]:
+    """
+    Fallback without Multicall3: one eth_call per call, sent as JSON-RPC batches.
+    """
+    requests = [("eth_call", [{"to": target, "data": "0x" + data.hex()}, "latest"]) for target, data in calls]
+    return [
+        None if isinstance(response, RpcError) or not response else bytes.fromhex(response[2:])
+        for response in rpc_batch(requests)
+    ]
+
+
+def _uint(data: Optional[bytes]) -> Optional[int]:
+    return int.from_bytes(data[:32], "big") if data and len(data) >= 32 else None
+
+
+def get_portfolio(
+    wallets: Iterable[str],
+    symbols: Optional[Iterable[str]] = None,
+    include_native: bool = True,
+    as_dataframe: bool = False,
+):
+    """
+    Reads every token balance for many wallets in a handful of requests.
+
+    balanceOf and decimals calls for N tokens x M wallets are packed into Multicall3
+    aggregate3 calls (all sent as one JSON-RPC batch). Chains without Multicall3
+    fall back to plain eth_call JSON-RPC batches.
+
+    :param wallets: Wallet addresses to read.
+    :param symbols: Token symbols to include (defaults to every token in the registry).
+    :param include_native: Also read native BTC balances (requires Multicall3).
+    :param as_dataframe: Return a pandas DataFrame instead of a list of rows.
+    :return: Rows of {wallet, symbol, token, decimals, balance_raw, balance}.
+    """
+    wallets = [Web3.to_checksum_address(w) for w in wallets]
+    if symbols is None:
+        tokens = token_registry.tokens()
+    else:
+        symbols = list(symbols)
+        tokens = [token_registry.get(s) for s in symbols]
+        missing = [s for s, t in zip(symbols, tokens) if t is None]
+        if missing:
+            raise Exception(f"❌ Unknown token(s): {', '.join(missing)}")
+
+    use_multicall = _has_multicall()
+    calls: List[Call] = [(t["address"], DECIMALS_SELECTOR) for t in tokens]
+    calls += [(t["address"], _address_call(BALANCE_OF_SELECTOR, w)) for w in wallets for t in tokens]
+    native = include_native and use_multicall
+    if native:
+        calls += [(MULTICALL3_ADDRESS, _address_call(GET_ETH_BALANCE_SELECTOR, w)) for w in wallets]
+
+    raw = _execute_multicall(calls) if use_multicall else _execute_batch(calls)
+
+    # Decode every return value in one pass, then lay the flat results out as rows
+    values = [_uint(data) for data in raw]
+    n_tokens = len(tokens)
+    decimals = [
+        d if d is not None else t["decimals"]
+        for d, t in zip(values[:n_tokens], tokens)
+    ]
+    balances = values[n_tokens:n_tokens + n_tokens * len(wallets)]
+
+    rows = []
+    for w_index, wallet in enumerate(wallets):
+        offset = w_index * n_tokens
+        for t_index, token in enumerate(tokens):
+            balance_raw = balances[offset + t_index]
+            rows.append({
+                "wallet": wallet,
+                "symbol": token["symbol"],
+                "token": token["address"],
+                "decimals": decimals[t_index],
+                "balance_raw": balance_raw,
+                "balance": balance_raw / 10 ** decimals[t_index] if balance_raw is not None else None,
+            })
+        if native:
+            balance_raw = values[n_tokens + n_tokens * len(wallets) + w_index]
+            rows.append({
+                "wallet": wallet,
+                "symbol": NATIVE_SYMBOL,
+                "token": None,
+                "decimals": 18,
+                "balance_raw": balance_raw,
+                "balance": balance_raw / 10 ** 18 if balance_raw is not None else None,
+            })
+
+    if as_dataframe:
+        import pandas as pd  # Optional dependency, only needed for DataFrame output
+
+        return pd.DataFrame(rows)
+    return rows
@@ -0,0 +1,199 @@
+import os
+import time
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+from .config import query_graph
+from .token_registry import token_registry, normalize_symbol
+
+DEFAULT_TTL = float(os.getenv("MEZO_PRICE_TTL", 5))  # seconds a price is served from cache
+DEFAULT_REFRESH_INTERVAL = 5.0  # seconds between background refreshes
+ID_IN_CHUNK = 500  # token ids per tokens(where: {id_in: [...]}) query
+
+PRICES_QUERY = '''
+{{
+  tokens(first: {first}, where: {{id_in: [{ids}]}}) {{
+    id
+    symbol
+    derivedUSD
+    derivedETH
+  }}
+}}
+'''
+
+Subscriber = Callable[[str, dict], None]
+
+
+class PriceFeed:
+    """
+    Cached token prices from the exchange subgraph.
+
+    Prices for many tokens are fetched with one tokens(where: {id_in: [...]}) query and
+    kept as numbers for a short TTL. Every token ever requested is tracked, so a
+    background thread (start()) can refresh them all on a schedule and notify
+    subscribers whenever a price changes.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        """
+        :param ttl: Seconds a fetched price is served without refetching.
+        """
+        self.ttl = ttl
+        self._prices: Dict[str, dict] = {}  # lowercase address -> price entry
+        self._watched: Dict[str, str] = {}  # lowercase address -> symbol
+        self._subscribers: List[tuple] = []  # (callback, lowercase addresses or None)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------ #
+    # Fetching
+    # ------------------------------------------------------------------ #
+    def fetch(self, addresses: Iterable[str]) -> Dict[str, dict]:
+        """
+        Fetches current prices for token addresses in batched subgraph queries and updates the cache.
+
+        :return: {lowercase address: entry} for every token the subgraph knows.
+        """
+        addresses = list(dict.fromkeys(a.lower() for a in addresses))
+        fetched = {}
+        for start in range(0, len(addresses), ID_IN_CHUNK):
+            chunk = addresses[start:start + ID_IN_CHUNK]
+            ids = ", ".join(f'"{a}"' for a in chunk)
+            data = query_graph(PRICES_QUERY.format(first=len(chunk), ids=ids))
+            now = time.time()
+            for t in data.get("data", {}).get("tokens", []):
+                fetched[t["id"].lower()] = {
+                    "address": t["id"].lower(),
+                    "symbol": t["symbol"],
+                    "usd": float(t["derivedUSD"]) if t.get("derivedUSD") is not None else None,
+                    "eth": float(t["derivedETH"]) if t.get("derivedETH") is not None else None,
+                    "updated_at": now,
+                }
+
+        changed = []
+        with self._lock:
+            for address, entry in fetched.items():
+                previous = self._prices.get(address)
+                if previous is None or (previous["usd"], previous["eth"]) != (entry["usd"], entry["eth"]):
+                    changed.append(entry)
+                self._prices[address] = entry
+        for entry in changed:
+            self._notify(entry)
+        return fetched
+
+    def _resolve(self, symbols: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        :return: {normalized symbol: lowercase address or None if unknown}.
+        """
+        resolved = {}
+        for symbol in symbols:
+            entry = token_registry.get(symbol)
+            resolved[normalize_symbol(symbol)] = entry["address"].lower() if entry else None
+        return resolved
+
+    # ------------------------------------------------------------------ #
+    # Lookups
+    # ------------------------------------------------------------------ #
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """
+        Returns prices for many symbols; all stale or missing ones are fetched in one batch.
+
+        :param symbols: Token symbols (e.g. ['MUSD', 'BTC']).
+        :return: {normalized symbol: {address, symbol, usd, eth, updated_at} or None}.
+        """
+        resolved = self._resolve(symbols)
+        now = time.time()
+        with self._lock:
+            for symbol, address in resolved.items():
+                if address is not None:
+                    self._watched[address] = symbol
+            stale = [
+                address for address in resolved.values()
+                if address is not None
+                and (address not in self._prices or now - self._prices[address]["updated_at"] > self.ttl)
+            ]
+        if stale:
+            self.fetch(stale)
+        return {symbol: self._prices.get(address) if address else None for symbol, address in resolved.items()}
+
+    def get_price(self, symbol: str) -> Optional[dict]:
+        """
+        :return: {address, symbol, usd, eth, updated_at} for one token, or None if unknown.
+        """
+        return self.get_prices([symbol])[normalize_symbol(symbol)]
+
+    # ------------------------------------------------------------------ #
+    # Subscriptions and background refresh
+    # ------------------------------------------------------------------ #
+    def subscribe(self, callback: Subscriber, symbols: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """
+        Registers a callback invoked with (symbol, entry) whenever a price changes.
+
+        :param callback: Function called on every change.
+        :param symbols: Only report these tokens (default: every tracked token). They are tracked from now on.
+        :return: A function that removes the subscription.
+        """
+        addresses = None
+        if symbols is not None:
+            resolved = self._resolve(symbols)
+            addresses = {a for a in resolved.values() if a is not None}
+            with self._lock:
+                for symbol, address in resolved.items():
+                    if address is not None:
+                        self._watched[address] = symbol
+        subscription = (callback, addresses)
+        with self._lock:
+            self._subscribers.append(subscription)
+
+        def unsubscribe():
+            with self._lock:
+                if subscription in self._subscribers:
+                    self._subscribers.remove(subscription)
+
+        return unsubscribe
+
+    def _notify(self, entry: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            symbol = self._watched.get(entry["address"], entry["symbol"])
+        for callback, addresses in subscribers:
+            if addresses is not None and entry["address"] not in addresses:
+                continue
+            try:
+                callback(symbol, entry)
+            except Exception as e:
+                print(f"⚠️ Warning: Price subscriber failed: {e}")
+
+    def refresh(self):
+        """
+        Re-fetches every tracked token in one batch.
+        """
+        with self._lock:
+            watched = list(self._watched)
+        if watched:
+            self.fetch(watched)
+
+    def start(self, interval: float = DEFAULT_REFRESH_INTERVAL):
+        """
+        Starts refreshing every tracked token in the background every interval seconds.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️ Warning: Background price refresh failed: {e}")
+
+        self._thread = threading.Thread(target=run, name="mezo-price-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+# Shared price feed used by the price tool
+price_feed = PriceFeed()
@@ -0,0 +1,216 @@
+import os
+import time
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from web3 import Web3
+from . import config
+from .rpc_batch import rpc_batch, RpcError
+
+DEFAULT_SLIPPAGE_BPS = int(os.getenv("MEZO_SLIPPAGE_BPS", 50))  # 0.5%
+DEFAULT_FEE_BPS = int(os.getenv("MEZO_SWAP_FEE_BPS", 30))  # Uniswap-v2 style 0.3% LP fee
+BLOCK_NUMBER_TTL = 1.0  # seconds a block number reading is reused across quotes
+
+GET_PAIR_SELECTOR = bytes.fromhex("e6a43905")  # getPair(address,address)
+GET_RESERVES_SELECTOR = "0x0902f1ac"  # getReserves()
+TOKEN0_SELECTOR = "0x0dfe1681"  # token0()
+ZERO_ADDRESS = "0x" + "0" * 40
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee_bps: int = DEFAULT_FEE_BPS) -> int:
+    """
+    Constant-product output for one hop, matching UniswapV2Library.getAmountOut.
+    """
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_with_fee = amount_in * (10000 - fee_bps)
+    return amount_in_with_fee * reserve_out // (reserve_in * 10000 + amount_in_with_fee)
+
+
+def apply_slippage(amount_out: int, slippage_bps: int = DEFAULT_SLIPPAGE_BPS) -> int:
+    """
+    :return: The minimum acceptable output for a quoted amount and slippage tolerance.
+    """
+    return amount_out * (10000 - slippage_bps) // 10000
+
+
+def _word(hex_data: str, index: int) -> int:
+    data = hex_data[2:] if hex_data.startswith("0x") else hex_data
+    return int(data[index * 64:(index + 1) * 64], 16)
+
+
+class SwapQuoter:
+    """
+    Quotes router swaps locally from cached pair reserves.
+
+    Pair addresses and token orderings never change, so they are cached for good.
+    Reserves are cached per block: the first quote in a new block refreshes every
+    pair it needs in one JSON-RPC batch, and every further quote in that block (any
+    size, any path over the same pairs) is pure arithmetic.
+    """
+
+    def __init__(self, fee_bps: int = DEFAULT_FEE_BPS):
+        """
+        :param fee_bps: LP fee charged per hop, in basis points.
+        """
+        self.fee_bps = fee_bps
+        self._factory: Optional[str] = None
+        self._pairs: Dict[Tuple[str, str], Optional[str]] = {}
+        self._token0: Dict[str, str] = {}
+        self._reserves: Dict[str, Tuple[int, int, int]] = {}  # pair -> (block, reserve0, reserve1)
+        self._block = (0, 0.0)  # (block number, fetched at)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Pair discovery
+    # ------------------------------------------------------------------ #
+    @property
+    def factory(self) -> str:
+        if self._factory is None:
+            self._factory = config.router_contract.functions.factory().call()
+        return self._factory
+
+    def pair_for(self, token_a: str, token_b: str) -> Optional[str]:
+        """
+        :return: The pair contract for two tokens, or None if no pool exists.
+        """
+        key = tuple(sorted((token_a.lower(), token_b.lower())))
+        if key not in self._pairs:
+            self._load_pairs([key])
+        return self._pairs[key]
+
+    def _load_pairs(self, keys: List[Tuple[str, str]]):
+        calls = []
+        for a, b in keys:
+            data = GET_PAIR_SELECTOR + bytes(12) + bytes.fromhex(a[2:]) + bytes(12) + bytes.fromhex(b[2:])
+            calls.append(("eth_call", [{"to": self.factory, "data": "0x" + data.hex()}, "latest"]))
+        for key, result in zip(keys, rpc_batch(calls)):
+            if isinstance(result, RpcError):
+                raise result
+            pair = "0x" + result[-40:]
+            self._pairs[key] = None if pair == ZERO_ADDRESS else Web3.to_checksum_address(pair)
+
+    # ------------------------------------------------------------------ #
+    # Reserves
+    # ------------------------------------------------------------------ #
+    def current_block(self) -> int:
+        number, fetched_at = self._block
+        if time.time() - fetched_at > BLOCK_NUMBER_TTL:
+            number = config.web3_instance.eth.block_number
+            self._block = (number, time.time())
+        return number
+
+    def update_reserves(self, pair: str, reserve0: int, reserve1: int, block: int):
+        """
+        Feeds reserves observed elsewhere (e.g. a Sync event) into the cache.
+        """
+        with self._lock:
+            cached = self._reserves.get(pair)
+            if cached is None or cached[0] <= block:
+                self._reserves[pair] = (block, reserve0, reserve1)
+
+    def refresh_reserves(self, pairs: Iterable[str], block: Optional[int] = None):
+        """
+        Reads getReserves() (and token0() for unseen pairs) for many pairs in one batch.
+        """
+        pairs = list(pairs)
+        block = self.current_block() if block is None else block
+        block_tag = hex(block)
+        calls = [("eth_call", [{"to": p, "data": GET_RESERVES_SELECTOR}, block_tag]) for p in pairs]
+        new_pairs = [p for p in pairs if p not in self._token0]
+        calls += [("eth_call", [{"to": p, "data": TOKEN0_SELECTOR}, "latest"]) for p in new_pairs]
+
+        results = rpc_batch(calls)
+        for pair, result in zip(new_pairs, results[len(pairs):]):
+            if isinstance(result, RpcError):
+                raise result
+            self._token0[pair] = Web3.to_checksum_address("0x" + result[-40:])
+        for pair, result in zip(pairs, results[:len(pairs)]):
+            if isinstance(result, RpcError):
+                raise result
+            self.update_reserves(pair, _word(result, 0), _word(result, 1), block)
+
+    def reserves_for(self, token_in: str, token_out: str, block: int) -> Tuple[int, int]:
+        """
+        :return: (reserve_in, reserve_out) for a hop, from the cache when it matches block.
+        """
+        pair = self.pair_for(token_in, token_out)
+        if pair is None:
+            raise Exception(f"❌ No liquidity pool for {token_in} -> {token_out}.")
+        cached = self._reserves.get(pair)
+        if cached is None or cached[0] < block:
+            self.refresh_reserves([pair], block)
+            cached = self._reserves[pair]
+        _, reserve0, reserve1 = cached
+        if self._token0[pair].lower() == token_in.lower():
+            return reserve0, reserve1
+        return reserve1, reserve0
+
+    def prefetch(self, paths: Iterable[Sequence[str]]):
+        """
+        Loads pair addresses and current reserves for every hop of every path in two batches.
+        """
+        hops = {tuple(sorted((a.lower(), b.lower()))) for path in paths for a, b in zip(path, path[1:])}
+        unknown = [key for key in hops if key not in self._pairs]
+        if unknown:
+            self._load_pairs(unknown)
+        block = self.current_block()
+        stale = [
+            self._pairs[key] for key in hops
+            if self._pairs[key] is not None
+            and (self._pairs[key] not in self._reserves or self._reserves[self._pairs[key]][0] < block)
+        ]
+        if stale:
+            self.refresh_reserves(stale, block)
+
+    # ------------------------------------------------------------------ #
+    # Quotes
+    # ------------------------------------------------------------------ #
+    def get_amounts_out(self, amount_in: int, path: Sequence[str], block: Optional[int] = None) -> List[int]:
+        """
+        Local equivalent of router.getAmountsOut(amount_in, path).
+        """
+        block = self.current_block() if block is None else block
+        amounts = [amount_in]
+        for token_in, token_out in zip(path, path[1:]):
+            reserve_in, reserve_out = self.reserves_for(token_in, token_out, block)
+            amounts.append(get_amount_out(amounts[-1], reserve_in, reserve_out, self.fee_bps))
+        return amounts
+
+    def quote(self, amount_in: int, path: Sequence[str], slippage_bps: int = DEFAULT_SLIPPAGE_BPS) -> dict:
+        """
+        :param amount_in: Input amount in the first token's smallest unit.
+        :param path: Token addresses from input to output.
+        :param slippage_bps: Tolerated slippage in basis points.
+        :return: {amounts, amount_out, min_amount_out, block}.
+        """
+        block = self.current_block()
+        amounts = self.get_amounts_out(amount_in, path, block)
+        return {
+            "amounts": amounts,
+            "amount_out": amounts[-1],
+            "min_amount_out": apply_slippage(amounts[-1], slippage_bps),
+            "block": block,
+        }
+
+    def quote_many(self, amounts_in: Iterable[int], paths: Iterable[Sequence[str]]) -> Dict[Tuple, List[int]]:
+        """
+        Quotes every size along every path from one reserve snapshot.
+
+        :return: {(amount_in, tuple(path)): amounts}.
+        """
+        paths = [tuple(p) for p in paths]
+        amounts_in = list(amounts_in)
+        self.prefetch(paths)
+        block = self.current_block()
+        quotes = {}
+        for path in paths:
+            for amount_in in amounts_in:
+                try:
+                    quotes[(amount_in, path)] = self.get_amounts_out(amount_in, path, block)
+                except Exception:
+                    quotes[(amount_in, path)] = None  # No pool along this path
+        return quotes
+
+
+# Shared quoter used by the swap tool
+swap_quoter = SwapQuoter()
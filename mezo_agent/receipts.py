@@ -0,0 +1,185 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+from web3.datastructures import AttributeDict
+from .rpc_batch import rpc_batch, RpcError
+from . import telemetry
+
+POLL_INTERVAL = 1.0  # seconds between eth_blockNumber polls
+DEFAULT_CONFIRMATIONS = 1
+DROP_TIMEOUT = 600  # seconds without a receipt before a transaction counts as dropped
+
+
+class TransactionDropped(Exception):
+    """
+    Raised through a receipt future when a transaction never made it into a block.
+    """
+
+
+class _Pending:
+    def __init__(self, tx_hash: str, confirmations: int, on_confirmed, on_reorg, on_dropped):
+        self.tx_hash = tx_hash
+        self.confirmations = confirmations
+        self.on_confirmed = on_confirmed
+        self.on_reorg = on_reorg
+        self.on_dropped = on_dropped
+        self.future: Future = Future()
+        self.submitted_at = time.time()
+        self.receipt: Optional[dict] = None
+        self.checked = False  # receipt looked up at least once
+
+
+class ReceiptWatcher:
+    """
+    One background poller that resolves receipts for every in-flight transaction.
+
+    Each poll reads eth_blockNumber; when a new block appears, receipts for all
+    pending hashes are fetched in a single JSON-RPC batch. A transaction resolves
+    once it has the requested number of confirmations. If its receipt disappears
+    or moves to another block before then, on_reorg fires and it is tracked again.
+    Transactions with no receipt after drop_timeout fail with TransactionDropped.
+    """
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL, drop_timeout: float = DROP_TIMEOUT):
+        """
+        :param poll_interval: Seconds between block number polls.
+        :param drop_timeout: Seconds without a receipt before a transaction is reported dropped.
+        """
+        self.poll_interval = poll_interval
+        self.drop_timeout = drop_timeout
+        self._pending: Dict[str, _Pending] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_block = -1
+
+    def watch(
+        self,
+        tx_hash,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+        on_confirmed: Optional[Callable[[dict], None]] = None,
+        on_reorg: Optional[Callable[[str], None]] = None,
+        on_dropped: Optional[Callable[[str], None]] = None,
+    ) -> Future:
+        """
+        Starts tracking a transaction.
+
+        :param tx_hash: Transaction hash (bytes or hex string).
+        :param confirmations: Blocks (including the inclusion block) required before resolving.
+        :param on_confirmed: Called with the receipt once confirmed.
+        :param on_reorg: Called with the hash when its receipt is reorganised away.
+        :param on_dropped: Called with the hash when it is considered dropped.
+        :return: A concurrent.futures.Future resolving to the receipt.
+        """
+        if isinstance(tx_hash, (bytes, bytearray)):
+            tx_hash = "0x" + bytes(tx_hash).hex()
+        elif not tx_hash.startswith("0x"):
+            tx_hash = "0x" + tx_hash
+        pending = _Pending(tx_hash.lower(), confirmations, on_confirmed, on_reorg, on_dropped)
+        with self._lock:
+            existing = self._pending.get(pending.tx_hash)
+            if existing is not None:
+                return existing.future
+            self._pending[pending.tx_hash] = pending
+        self._ensure_running()
+        self._wakeup.set()
+        return pending.future
+
+    async def wait(self, tx_hash, confirmations: int = DEFAULT_CONFIRMATIONS) -> dict:
+        """
+        Awaitable variant of watch() for asyncio callers.
+        """
+        with telemetry.span("receipt", "wait"):
+            return await asyncio.wrap_future(self.watch(tx_hash, confirmations))
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="mezo-receipt-watcher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+            try:
+                self._poll()
+            except Exception as e:
+                print(f"⚠️ Warning: Receipt watcher poll failed: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _poll(self):
+        block_number = rpc_batch([("eth_blockNumber", [])])[0]
+        if isinstance(block_number, RpcError):
+            raise block_number
+        block_number = int(block_number, 16)
+        with self._lock:
+            pending = list(self._pending.values())
+        if block_number == self._last_block:
+            # No new block: only newly watched hashes can have changed state
+            to_check = [p for p in pending if not p.checked]
+        else:
+            to_check = pending
+            self._last_block = block_number
+
+        if to_check:
+            receipts = rpc_batch([("eth_getTransactionReceipt", [p.tx_hash]) for p in to_check])
+            for p, receipt in zip(to_check, receipts):
+                if isinstance(receipt, RpcError):
+                    continue
+                p.checked = True
+                self._update(p, receipt, block_number)
+        self._expire(pending)
+
+    def _update(self, p: _Pending, receipt: Optional[dict], block_number: int):
+        if p.receipt is not None and (receipt is None or receipt["blockHash"] != p.receipt["blockHash"]):
+            # Previously mined receipt vanished or moved: the inclusion block was reorganised
+            p.receipt = None
+            self._callback(p.on_reorg, p.tx_hash)
+        if receipt is None:
+            return
+        p.receipt = receipt
+        depth = block_number - int(receipt["blockNumber"], 16) + 1
+        if depth >= p.confirmations:
+            with self._lock:
+                self._pending.pop(p.tx_hash, None)
+            receipt = AttributeDict(dict(
+                receipt,
+                status=int(receipt["status"], 16),
+                blockNumber=int(receipt["blockNumber"], 16),
+                gasUsed=int(receipt["gasUsed"], 16),
+            ))
+            telemetry.observe("receipt", "confirmation", time.time() - p.submitted_at, receipt.status != 1)
+            p.future.set_result(receipt)
+            self._callback(p.on_confirmed, receipt)
+
+    def _expire(self, pending):
+        now = time.time()
+        for p in pending:
+            if p.receipt is None and now - p.submitted_at > self.drop_timeout:
+                with self._lock:
+                    self._pending.pop(p.tx_hash, None)
+                p.future.set_exception(TransactionDropped(f"Transaction {p.tx_hash} was not mined."))
+                self._callback(p.on_dropped, p.tx_hash)
+
+    @staticmethod
+    def _callback(callback, argument):
+        if callback is None:
+            return
+        try:
+            callback(argument)
+        except Exception as e:
+            print(f"⚠️ Warning: Receipt watcher callback failed: {e}")
+
+
+# Shared watcher serving every in-flight transaction
+receipt_watcher = ReceiptWatcher()
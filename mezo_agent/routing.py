@@ -0,0 +1,207 @@
+import time
+import threading
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from web3 import Web3
+from .config import query_graph
+from .quoting import get_amount_out, swap_quoter, DEFAULT_FEE_BPS
+
+DEFAULT_MAX_HOPS = 3
+DEFAULT_TTL = 300  # seconds before the pair graph is reloaded from the subgraph
+PAGE_SIZE = 1000
+VERIFY_CANDIDATES = 3  # best routes re-priced against on-chain reserves
+
+PAIRS_PAGE_QUERY = '''
+{{
+  pairs(first: {first}, orderBy: id, orderDirection: asc, where: {{id_gt: "{last_id}"}}) {{
+    id
+    reserve0
+    reserve1
+    token0 {{ id decimals }}
+    token1 {{ id decimals }}
+  }}
+}}
+'''
+
+
+def _to_raw(amount: str, decimals: int) -> int:
+    """
+    Converts a subgraph BigDecimal reserve into the token's smallest unit.
+    """
+    return int(Decimal(amount) * (Decimal(10) ** decimals))
+
+
+class PairGraph:
+    """
+    In-memory token graph built from every pair in the exchange-v2 subgraph.
+
+    Nodes are token addresses and edges are pairs carrying their reserves. Route
+    search relaxes the best output amount per token one hop at a time (O(hops x
+    pairs)), and the top candidates are re-priced with on-chain reserves from the
+    shared SwapQuoter before a route is returned.
+
+    Only the first load blocks. Once the graph is older than the TTL it is rebuilt
+    in a background thread while searches keep using the current graph, whose
+    reserves on the chosen paths are kept fresh by the on-chain verification.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, fee_bps: int = DEFAULT_FEE_BPS):
+        """
+        :param ttl: Seconds before the graph is reloaded from the subgraph.
+        :param fee_bps: LP fee charged per hop, in basis points.
+        """
+        self.ttl = ttl
+        self.fee_bps = fee_bps
+        self._adjacency: Dict[str, List[Tuple[str, str]]] = {}  # token -> [(neighbour, pair)]
+        self._pairs: Dict[str, list] = {}  # pair -> [token0, token1, reserve0, reserve1]
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Loading and updates
+    # ------------------------------------------------------------------ #
+    def refresh(self):
+        """
+        Pages through every pair in the subgraph and rebuilds the graph.
+        """
+        pairs, adjacency = {}, {}
+        last_id = ""
+        while True:
+            data = query_graph(PAIRS_PAGE_QUERY.format(first=PAGE_SIZE, last_id=last_id))
+            page = data.get("data", {}).get("pairs", [])
+            for p in page:
+                token0, token1 = p["token0"]["id"].lower(), p["token1"]["id"].lower()
+                pair = p["id"].lower()
+                pairs[pair] = [
+                    token0,
+                    token1,
+                    _to_raw(p["reserve0"], int(p["token0"]["decimals"])),
+                    _to_raw(p["reserve1"], int(p["token1"]["decimals"])),
+                ]
+                adjacency.setdefault(token0, []).append((token1, pair))
+                adjacency.setdefault(token1, []).append((token0, pair))
+            if len(page) < PAGE_SIZE:
+                break
+            last_id = page[-1]["id"]
+
+        with self._lock:
+            self._pairs = pairs
+            self._adjacency = adjacency
+            self._loaded_at = time.time()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"⚠️ Warning: Could not refresh the pair graph: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _ensure_loaded(self):
+        if not self._pairs:
+            self.refresh()
+            return
+        if time.time() - self._loaded_at <= self.ttl:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name="mezo-pair-graph", daemon=True).start()
+
+    def update_reserves(self, pair: str, reserve0: int, reserve1: int):
+        """
+        Applies an incremental reserve update (e.g. from a Sync event or an on-chain read).
+        """
+        entry = self._pairs.get(pair.lower())
+        if entry is not None:
+            entry[2], entry[3] = reserve0, reserve1
+
+    @staticmethod
+    def _reserves(entry: list, token_in: str) -> Tuple[int, int]:
+        token0, _, reserve0, reserve1 = entry
+        return (reserve0, reserve1) if token_in == token0 else (reserve1, reserve0)
+
+    # ------------------------------------------------------------------ #
+    # Route search
+    # ------------------------------------------------------------------ #
+    def candidate_routes(
+        self, token_in: str, token_out: str, amount_in: int, max_hops: int = DEFAULT_MAX_HOPS
+    ) -> List[Tuple[int, List[str], List[str]]]:
+        """
+        Finds the best output per hop count using cached reserves.
+
+        :return: (amount_out, token path, pair path) tuples, best first.
+        """
+        self._ensure_loaded()
+        # A background refresh swaps both maps at once; search one consistent snapshot
+        with self._lock:
+            adjacency, pair_entries = self._adjacency, self._pairs
+        token_in, token_out = token_in.lower(), token_out.lower()
+        frontier = {token_in: (amount_in, [token_in], [])}
+        found = []
+        for _ in range(max_hops):
+            next_frontier = {}
+            for token, (amount, path, pairs) in frontier.items():
+                for neighbour, pair in adjacency.get(token, ()):
+                    if neighbour in path:
+                        continue  # never revisit a token within one route
+                    reserve_in, reserve_out = self._reserves(pair_entries[pair], token)
+                    out = get_amount_out(amount, reserve_in, reserve_out, self.fee_bps)
+                    if out <= 0:
+                        continue
+                    best = next_frontier.get(neighbour)
+                    if best is None or out > best[0]:
+                        next_frontier[neighbour] = (out, path + [neighbour], pairs + [pair])
+            if token_out in next_frontier:
+                found.append(next_frontier.pop(token_out))
+            frontier = next_frontier
+            if not frontier:
+                break
+        return sorted(found, key=lambda route: route[0], reverse=True)
+
+    def best_route(
+        self, token_in: str, token_out: str, amount_in: int, max_hops: int = DEFAULT_MAX_HOPS, verify: bool = True
+    ) -> Optional[dict]:
+        """
+        :param token_in: Input token address.
+        :param token_out: Output token address.
+        :param amount_in: Input amount in the smallest unit.
+        :param max_hops: Maximum number of pools to route through.
+        :param verify: Re-price the best candidates with current on-chain reserves.
+        :return: {path, pairs, amount_out} with checksum addresses, or None if no route exists.
+        """
+        candidates = self.candidate_routes(token_in, token_out, amount_in, max_hops)
+        if not candidates:
+            return None
+        if verify:
+            top = candidates[:VERIFY_CANDIDATES]
+            swap_quoter.prefetch([path for _, path, _ in top])
+            block = swap_quoter.current_block()
+            verified = []
+            for _, path, pairs in top:
+                amounts = swap_quoter.get_amounts_out(amount_in, path, block)
+                # Feed the fresh on-chain reserves back into the graph
+                for pair, hop_in, hop_out in zip(pairs, path, path[1:]):
+                    reserve_in, reserve_out = swap_quoter.reserves_for(hop_in, hop_out, block)
+                    entry = self._pairs.get(pair)
+                    if entry is None:
+                        continue  # the graph was rebuilt since the search
+                    if hop_in == entry[0]:
+                        self.update_reserves(pair, reserve_in, reserve_out)
+                    else:
+                        self.update_reserves(pair, reserve_out, reserve_in)
+                verified.append((amounts[-1], path, pairs))
+            candidates = sorted(verified, key=lambda route: route[0], reverse=True)
+        amount_out, path, pairs = candidates[0]
+        return {
+            "path": [Web3.to_checksum_address(t) for t in path],
+            "pairs": [Web3.to_checksum_address(p) for p in pairs],
+            "amount_out": amount_out,
+        }
+
+
+# Shared pair graph used by the swap tool
+pair_graph = PairGraph()
@@ -0,0 +1,62 @@
+import itertools
+from typing import List, Optional, Sequence, Tuple
+
+DEFAULT_BATCH_SIZE = 500  # JSON-RPC requests per HTTP POST
+
+_ids = itertools.count(1)
+
+
+class RpcError(Exception):
+    """
+    Error object returned for one request inside a JSON-RPC batch.
+    """
+
+    def __init__(self, error: dict):
+        self.code = error.get("code")
+        self.data = error.get("data")
+        super().__init__(error.get("message", str(error)))
+
+
+def rpc_batch(
+    calls: Sequence[Tuple[str, list]],
+    url: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[object]:
+    """
+    Sends many JSON-RPC requests as batched HTTP POSTs over the shared transport.
+
+    :param calls: (method, params) pairs.
+    :param url: JSON-RPC endpoint (defaults to the context's RPC URL).
+    :param batch_size: Maximum requests per HTTP POST.
+    :return: One entry per call, in order: the result, or an RpcError for failed requests.
+    """
+    from .transport import transport
+    from .context import get_context
+    from .telemetry import span
+
+    url = url or get_context().rpc_url
+    results: List[object] = []
+    for start in range(0, len(calls), batch_size):
+        chunk = calls[start:start + batch_size]
+        ids = [next(_ids) for _ in chunk]
+        payload = [
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            for request_id, (method, params) in zip(ids, chunk)
+        ]
+        with span("rpc", "batch", size=len(chunk)):
+            response = transport.post_json(url, payload)
+        if response.status_code != 200:
+            raise Exception(f"JSON-RPC batch failed with status code {response.status_code}")
+        body = response.json()
+        if isinstance(body, dict):  # Some nodes answer a rejected batch with a single error object
+            raise RpcError(body.get("error") or body)
+        by_id = {item.get("id"): item for item in body}
+        for request_id in ids:
+            item = by_id.get(request_id)
+            if item is None:
+                results.append(RpcError({"message": "missing response in JSON-RPC batch"}))
+            elif "error" in item:
+                results.append(RpcError(item["error"]))
+            else:
+                results.append(item.get("result"))
+    return results
@@ -1,18 +1,55 @@
 from web3.exceptions import Web3Exception
 import json
-from mezo_agent.config import web3_instance, sender_address, account
+from typing import AsyncIterator, Iterator, Union
+from mezo_agent import config
 from mezo_agent.parsing import extract_transaction_details
-from langchain_openai import ChatOpenAI
-from .config import OPENAI_API_KEY
+from mezo_agent.nonce_manager import nonce_manager
+from mezo_agent.gas_oracle import gas_oracle, max_fee_per_gas
+from mezo_agent.streaming import stream_llm, astream_llm
 from langchain.tools import tool
 
+def build_analysis_prompt(recipient: str, amount: float, gas_price: int, gas_limit: int, nonce: Union[int, str]) -> str:
+    """
+    Builds the prompt asking the LLM to explain a pending BTC transaction.
+    """
+    return f"""
+You are given the following transaction data on Mezo Matsnet:
+- Recipient: {recipient}
+- Amount (BTC): {amount}
+- Gas Price (max per unit): {gas_price}
+- Gas Limit: {gas_limit}
+- Nonce: {nonce}
+- Chain ID: 31611 (Mezo Testnet)
+
+Explain these details in a user-friendly way, covering:
+1. The purpose of each field (nonce, gas, etc.).
+2. Potential fees (approximate cost) or any known risks.
+3. A short summary of what will happen if the user confirms.
+
+Use a concise and helpful tone.
+"""
+
+def stream_transaction_analysis(recipient: str, amount: float, gas_price: int, gas_limit: int, nonce: Union[int, str]) -> Iterator[str]:
+    """
+    Yields the safe-mode explanation of a pending transaction token by token.
+    """
+    yield from stream_llm(build_analysis_prompt(recipient, amount, gas_price, gas_limit, nonce), name="safe_mode_analysis")
+
+async def astream_transaction_analysis(recipient: str, amount: float, gas_price: int, gas_limit: int, nonce: Union[int, str]) -> AsyncIterator[str]:
+    """
+    Async variant of stream_transaction_analysis, e.g. for a websocket handler.
+    """
+    prompt = build_analysis_prompt(recipient, amount, gas_price, gas_limit, nonce)
+    async for token in astream_llm(prompt, name="safe_mode_analysis"):
+        yield token
+
 @tool
 def mezo_agent_safe_mode_btc_transaction(prompt: str) -> str:
     """
     Sends BTC on Mezo Matsnet with a Human-in-the-Loop confirmation step.
 
     1) Parses user prompt for transaction details.
-    2) Calls LLM to provide a verbose explanation of the transaction data.
+    2) Streams an LLM explanation of the transaction data as it is generated.
     3) Shows both raw data and LLM explanation to the user.
     4) ALWAYS prompts the user for confirmation before broadcasting.
     
@@ -34,60 +71,51 @@ def mezo_agent_safe_mode_btc_transaction(prompt: str) -> str:
         return "❌ This function only handles BTC transactions."
 
     # 2) Convert to Wei (Mezo uses 18 decimals for BTC)
-    amount_wei = web3_instance.to_wei(amount, "ether")
+    amount_wei = config.web3_instance.to_wei(amount, "ether")
 
     # 3) Build transaction (do NOT send yet)
-    nonce = web3_instance.eth.get_transaction_count(sender_address)
-    gas_price = web3_instance.eth.gas_price
-    gas_limit = web3_instance.eth.estimate_gas({"to": recipient, "value": amount_wei, "from": sender_address})
+    fees = gas_oracle.fee_params()
+    gas_price = max_fee_per_gas(fees)
+    gas_limit = gas_oracle.estimate_gas({"to": recipient, "value": amount_wei, "from": config.sender_address})
+    # The nonce is only allocated once the user confirms, so other sends never queue
+    # behind a transaction that is waiting on a human
+    nonce = "assigned when sent"
 
     tx_data = {
         "to": recipient,
         "value": amount_wei,
         "gas": gas_limit,
-        "gasPrice": gas_price,
         "nonce": nonce,
         "chainId": 31611,  # Mezo Testnet chain ID
+        **fees,
     }
 
-    # 4) Generate LLM Explanation
-    analysis_prompt = f"""
-You are given the following transaction data on Mezo Matsnet:
-- Recipient: {recipient}
-- Amount (BTC): {amount}
-- Gas Price: {gas_price}
-- Gas Limit: {gas_limit}
-- Nonce: {nonce}
-- Chain ID: 31611 (Mezo Testnet)
-
-Explain these details in a user-friendly way, covering:
-1. The purpose of each field (nonce, gas, etc.).
-2. Potential fees (approximate cost) or any known risks.
-3. A short summary of what will happen if the user confirms.
-
-Use a concise and helpful tone.
-"""
-    llm = ChatOpenAI(temperature=0, openai_api_key=OPENAI_API_KEY)
-    analysis_response = llm.invoke(analysis_prompt)
-    explanation_text = analysis_response.content if analysis_response else "❌ LLM explanation unavailable."
-
-    # 5) ALWAYS confirm with the user before sending
+    # 4) Show the raw data, then stream the LLM explanation as it is generated
     print("\n--- BTC Transaction Data ---")
     print(json.dumps(tx_data, indent=2))
     print("----------------------------")
 
     print("\n--- LLM Analysis ---")
-    print(explanation_text)
+    analysis_prompt = build_analysis_prompt(recipient, amount, gas_price, gas_limit, nonce)
+    try:
+        for token in stream_llm(analysis_prompt, name="safe_mode_analysis"):
+            print(token, end="", flush=True)
+        print()
+    except Exception as e:
+        print(f"❌ LLM explanation unavailable: {e}")
     print("--------------------")
 
+    # 5) ALWAYS confirm with the user before sending
     choice = input("Do you want to proceed with this BTC transaction? [y/n]: ").strip().lower()
     if choice != 'y':
         return "❌ Transaction aborted by user."
 
-    # 6) Sign & send
+    # 6) Allocate the nonce, sign & send
+    def sign(tx_nonce: int) -> bytes:
+        return config.account.sign_transaction(dict(tx_data, nonce=tx_nonce)).raw_transaction
+
     try:
-        signed_tx = account.sign_transaction(tx_data)
-        tx_hash = web3_instance.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = nonce_manager.send(sign)
         return f"✅ BTC transaction successful! Hash: {tx_hash.hex()}"
     except Web3Exception as e:
         return f"❌ Transaction failed: {str(e)}"
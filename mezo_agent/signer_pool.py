@@ -0,0 +1,263 @@
+import os
+import glob
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from web3 import Web3
+from . import config
+from .config import CHAIN_ID
+from .nonce_manager import NonceManager, nonce_manager
+from .rpc_batch import rpc_batch, RpcError
+
+BALANCE_TTL = 10  # seconds tracked balances are trusted before a batched refresh
+BALANCE_OF_SELECTOR = "0x70a08231"  # balanceOf(address)
+TRANSFER_GAS = 21000
+TOKEN_TRANSFER_GAS = 100000  # upper bound for an ERC-20 transfer, used to reserve gas when choosing a signer
+
+
+class Signer:
+    """
+    One pool account: its key, its own nonce stream and locally tracked balances.
+    Balance writes (refreshes, debits and credits) are made under the signer's lock.
+    """
+
+    def __init__(self, account, manager: Optional[NonceManager] = None):
+        self.account = account
+        self.address = account.address
+        self.nonce_manager = manager or NonceManager(address=account.address)
+        self.in_flight = 0
+        self.balance: Optional[int] = None  # native BTC, in wei
+        self.token_balances: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def key(self) -> str:
+        return self.account.key.hex()
+
+    def sign(self, tx: dict):
+        return self.account.sign_transaction(tx)
+
+    def debit(self, amount: int, token: Optional[str] = None):
+        """
+        Deducts a send from the tracked balance until the next refresh.
+        """
+        with self._lock:
+            if token is None:
+                if self.balance is not None:
+                    self.balance -= amount
+            elif token.lower() in self.token_balances:
+                self.token_balances[token.lower()] -= amount
+
+    def credit(self, amount: int):
+        """
+        Adds an incoming native transfer to the tracked balance until the next refresh.
+        """
+        with self._lock:
+            if self.balance is not None:
+                self.balance += amount
+
+    def set_balances(self, balance: Optional[int] = None, token_balances: Optional[Dict[str, int]] = None):
+        """
+        Stores freshly read balances (None leaves the native balance unchanged).
+        """
+        with self._lock:
+            if balance is not None:
+                self.balance = balance
+            self.token_balances.update(token_balances or {})
+
+
+def _load_keys() -> List[str]:
+    """
+    Reads keys from PRIVATE_KEYS (comma separated), falling back to PRIVATE_KEY, plus
+    every keystore file in MEZO_KEYSTORE_DIR (decrypted with MEZO_KEYSTORE_PASSWORD).
+    """
+    config.load_env()
+    keys = [k.strip() for k in (os.getenv("PRIVATE_KEYS") or "").split(",") if k.strip()]
+    if not keys and os.getenv("PRIVATE_KEY"):
+        keys.append(os.getenv("PRIVATE_KEY"))
+
+    keystore_dir = os.getenv("MEZO_KEYSTORE_DIR")
+    if keystore_dir:
+        from eth_account import Account
+
+        password = os.getenv("MEZO_KEYSTORE_PASSWORD") or ""
+        for path in sorted(glob.glob(os.path.join(keystore_dir, "*"))):
+            try:
+                with open(path, "r") as f:
+                    keys.append(Account.decrypt(json.load(f), password).hex())
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Warning: Could not load keystore {path}: {e}")
+    return keys
+
+
+class SignerPool:
+    """
+    Spreads sends across several accounts so each has its own nonce stream.
+
+    Each send picks the least busy account (fewest sends in flight) among those whose
+    tracked native and token balances cover it. Balances for every account are
+    refreshed together in one JSON-RPC batch once they are BALANCE_TTL old, and are
+    debited locally after each send. The configured PRIVATE_KEY account shares the
+    module-level nonce_manager, so single-account setups behave exactly as before.
+    """
+
+    def __init__(self, keys: Optional[List[str]] = None):
+        """
+        :param keys: Private keys (defaults to PRIVATE_KEYS / PRIVATE_KEY / MEZO_KEYSTORE_DIR).
+        """
+        self._keys = keys
+        self._signers: Optional[List[Signer]] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def signers(self) -> List[Signer]:
+        if self._signers is None:
+            with self._lock:
+                if self._signers is None:
+                    self._signers = self._load()
+        return self._signers
+
+    def _load(self) -> List[Signer]:
+        from eth_account import Account
+
+        keys = self._keys if self._keys is not None else _load_keys()
+        if not keys:
+            raise ValueError("❌ PRIVATE_KEY not set. Please create a `.env` file in your project with your keys.")
+        signers, seen = [], set()
+        config.load_env()
+        primary = os.getenv("PRIVATE_KEY")
+        primary_address = Account.from_key(primary).address if primary else None
+        for key in keys:
+            account = Account.from_key(key)
+            if account.address in seen:
+                continue
+            seen.add(account.address)
+            # The primary account keeps the shared nonce stream used by the other tools
+            is_primary = account.address == primary_address
+            signers.append(Signer(account, nonce_manager if is_primary else None))
+        return signers
+
+    def __len__(self) -> int:
+        return len(self.signers)
+
+    # ------------------------------------------------------------------ #
+    # Balances
+    # ------------------------------------------------------------------ #
+    def refresh_balances(self, tokens: Optional[List[str]] = None):
+        """
+        Reads the native balance (and any token balances) of every account in one batch.
+        """
+        tokens = [t.lower() for t in (tokens or [])]
+        for signer in self.signers:
+            tokens.extend(t for t in signer.token_balances if t not in tokens)
+        calls = [("eth_getBalance", [s.address, "latest"]) for s in self.signers]
+        for signer in self.signers:
+            data = BALANCE_OF_SELECTOR + "0" * 24 + signer.address[2:].lower()
+            calls += [("eth_call", [{"to": token, "data": data}, "latest"]) for token in tokens]
+
+        results = rpc_batch(calls)
+        n = len(self.signers)
+        for index, signer in enumerate(self.signers):
+            balance = None if isinstance(results[index], RpcError) else int(results[index], 16)
+            token_balances = {}
+            for t_index, token in enumerate(tokens):
+                result = results[n + index * len(tokens) + t_index]
+                if not isinstance(result, RpcError):
+                    token_balances[token] = int(result, 16) if result != "0x" else 0
+            signer.set_balances(balance, token_balances)
+        self._refreshed_at = time.time()
+
+    # ------------------------------------------------------------------ #
+    # Dispatch
+    # ------------------------------------------------------------------ #
+    def select(self, min_balance: int = 0, token: Optional[str] = None, min_token_balance: int = 0) -> Signer:
+        """
+        Picks the least busy account that can cover a send and marks it busy.
+        If none can, the least busy account is returned so the caller reports the shortfall.
+
+        :param min_balance: Native balance (wei) the send needs, including gas.
+        :param token: ERC-20 the send spends, if any.
+        :param min_token_balance: Token amount (smallest unit) the send needs.
+        """
+        signers = self.signers
+        if len(signers) > 1:
+            token_key = token.lower() if token else None
+            stale = time.time() - self._refreshed_at > BALANCE_TTL
+            if stale or (token_key and any(token_key not in s.token_balances for s in signers)):
+                try:
+                    self.refresh_balances([token_key] if token_key else None)
+                except Exception as e:
+                    print(f"⚠️ Warning: Could not refresh signer balances: {e}")
+
+        def can_cover(s: Signer) -> bool:
+            if s.balance is not None and s.balance < min_balance:
+                return False
+            if token and s.token_balances.get(token.lower(), min_token_balance) < min_token_balance:
+                return False
+            return True
+
+        with self._lock:
+            candidates = [s for s in signers if can_cover(s)] or signers
+            signer = min(candidates, key=lambda s: (s.in_flight, -(s.balance or 0)))
+            signer.in_flight += 1
+        return signer
+
+    def release(self, signer: Signer):
+        with self._lock:
+            signer.in_flight -= 1
+
+    @contextmanager
+    def acquire(self, min_balance: int = 0, token: Optional[str] = None, min_token_balance: int = 0):
+        """
+        Context manager around select() / release().
+        """
+        signer = self.select(min_balance, token, min_token_balance)
+        try:
+            yield signer
+        finally:
+            self.release(signer)
+
+    # ------------------------------------------------------------------ #
+    # Gas rebalancing
+    # ------------------------------------------------------------------ #
+    def rebalance_gas(self, min_balance: int, top_up: int) -> List[str]:
+        """
+        Tops up every account below min_balance to top_up, funded by the richest account.
+
+        :param min_balance: Native balance (wei) below which an account is topped up.
+        :param top_up: Native balance (wei) a topped-up account ends with.
+        :return: Hashes of the funding transactions.
+        """
+        self.refresh_balances()
+        donor = max(self.signers, key=lambda s: s.balance or 0)
+        fees = None
+        tx_hashes = []
+        for signer in self.signers:
+            if signer is donor or signer.balance is None or signer.balance >= min_balance:
+                continue
+            amount = top_up - signer.balance
+            if fees is None:
+                from .gas_oracle import gas_oracle, max_fee_per_gas
+
+                fees = gas_oracle.fee_params()
+                gas_cost = TRANSFER_GAS * max_fee_per_gas(fees)
+            if (donor.balance or 0) - amount - gas_cost < min_balance:
+                print(f"⚠️ Warning: {donor.address} cannot fund {signer.address} without dropping below the minimum.")
+                break
+            tx = {"to": signer.address, "value": amount, "gas": TRANSFER_GAS, "chainId": CHAIN_ID, **fees}
+
+            def sign(tx_nonce: int, tx=tx) -> bytes:
+                return donor.sign(dict(tx, nonce=tx_nonce)).raw_transaction
+
+            tx_hash = donor.nonce_manager.send(sign)
+            donor.debit(amount + gas_cost)
+            signer.credit(amount)
+            tx_hashes.append(Web3.to_hex(tx_hash))
+        return tx_hashes
+
+
+# Shared pool used by the transfer and swap tools
+signer_pool = SignerPool()
@@ -0,0 +1,71 @@
+import time
+import threading
+from collections import deque
+from typing import AsyncIterator, Dict, Iterator
+from .context import get_context
+
+TTFT_SAMPLES = 1000  # most recent time-to-first-token readings kept per stream name
+
+_ttft: Dict[str, deque] = {}
+_ttft_lock = threading.Lock()
+
+
+def _record_ttft(name: str, seconds: float):
+    with _ttft_lock:
+        _ttft.setdefault(name, deque(maxlen=TTFT_SAMPLES)).append(seconds)
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+def get_streaming_stats() -> dict:
+    """
+    :return: Per-stream time-to-first-token statistics in milliseconds (count, last, p50, p95).
+    """
+    with _ttft_lock:
+        samples = {name: list(values) for name, values in _ttft.items()}
+    return {
+        name: {
+            "count": len(values),
+            "last_ms": values[-1] * 1000,
+            "p50_ms": _percentile(values, 0.5) * 1000,
+            "p95_ms": _percentile(values, 0.95) * 1000,
+        }
+        for name, values in samples.items()
+        if values
+    }
+
+
+def stream_llm(prompt: str, name: str = "llm") -> Iterator[str]:
+    """
+    Yields completion text as the model produces it and records time to first token.
+
+    :param prompt: Prompt sent to the context's LLM.
+    :param name: Metric name the time to first token is recorded under.
+    """
+    start = time.perf_counter()
+    first = True
+    for chunk in get_context().llm.stream(prompt):
+        if not chunk.content:
+            continue
+        if first:
+            _record_ttft(name, time.perf_counter() - start)
+            first = False
+        yield chunk.content
+
+
+async def astream_llm(prompt: str, name: str = "llm") -> AsyncIterator[str]:
+    """
+    Async variant of stream_llm(), e.g. for forwarding tokens over a websocket.
+    """
+    start = time.perf_counter()
+    first = True
+    async for chunk in get_context().llm.astream(prompt):
+        if not chunk.content:
+            continue
+        if first:
+            _record_ttft(name, time.perf_counter() - start)
+            first = False
+        yield chunk.content
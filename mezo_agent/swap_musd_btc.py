@@ -1,42 +1,40 @@
 import time
 from langchain.tools import tool
-from .config import (
-    web3_instance,
-    sender_address,
-    account,
-    PRIVATE_KEY,
-    musd_contract,
-    ROUTER_ADDRESS,
-    router_contract,
-    MUSD_ADDRESS,
-    WRAPPED_BTC_ADDRESS
-)
+from . import config
+from .config import ROUTER_ADDRESS, MUSD_ADDRESS, WRAPPED_BTC_ADDRESS
 from .parsing import extract_swap_details
+from .signer_pool import signer_pool
+from .gas_oracle import gas_oracle, max_fee_per_gas
+from .quoting import swap_quoter
+from .routing import pair_graph
+from .receipts import receipt_watcher
+from .allowances import allowance_manager
 
-def approve_if_needed(token_contract, amount_wei):
+SWAP_GAS_FALLBACK = 250000  # single-hop swap
+SWAP_GAS_PER_EXTRA_HOP = 100000
+APPROVAL_WAIT_TIMEOUT = 120  # seconds
+
+def swap_gas_fallback(path) -> int:
+    """
+    :return: Gas limit to use when the swap cannot be estimated, scaled by the number of hops.
+    """
+    return SWAP_GAS_FALLBACK + SWAP_GAS_PER_EXTRA_HOP * max(len(path) - 2, 0)
+
+def approve_if_needed(token_contract, amount_wei, signer=None):
     """
     Checks if the router has enough allowance to spend tokens.
-    If not, sends an approval transaction.
+    If not, sends an approval transaction under the configured approval policy and
+    waits for it to be mined, so the swap's gas estimate runs against the new
+    allowance instead of reverting. Allowances are cached, so with the default 'max'
+    policy steady-state swaps make no allowance call and send no approval.
     """
-    current_allowance = token_contract.functions.allowance(sender_address, ROUTER_ADDRESS).call()
-    if current_allowance < amount_wei:
-        print(f"Current allowance ({current_allowance}) is less than required ({amount_wei}). Approving...")
-        nonce = web3_instance.eth.get_transaction_count(sender_address)
-        gas_price = web3_instance.eth.gas_price
-        approve_tx = token_contract.functions.approve(ROUTER_ADDRESS, amount_wei).build_transaction({
-            "from": sender_address,
-            "nonce": nonce,
-            "gas": 50000,
-            "gasPrice": gas_price,
-        })
-        signed_tx = web3_instance.eth.account.sign_transaction(approve_tx, PRIVATE_KEY)
-        tx_hash = web3_instance.eth.send_raw_transaction(signed_tx.raw_transaction)
-        receipt = web3_instance.eth.wait_for_transaction_receipt(tx_hash)
-        if receipt.status != 1:
-            raise Exception("Approval transaction failed.")
-        print(f"Approval successful. TX Hash: {tx_hash.hex()}")
-    else:
+    tx_hash = allowance_manager.ensure_allowance(token_contract, ROUTER_ADDRESS, amount_wei, signer=signer)
+    if tx_hash is None:
         print("Sufficient allowance already set.")
+        return
+    receipt = receipt_watcher.watch(tx_hash).result(timeout=APPROVAL_WAIT_TIMEOUT)
+    if receipt.status != 1:
+        raise Exception(f"approval transaction reverted. TX Hash: {tx_hash.hex()}")
 
 @tool
 def mezo_agent_swap_musd_btc(prompt: str) -> str:
@@ -57,56 +55,114 @@ def mezo_agent_swap_musd_btc(prompt: str) -> str:
     except KeyError as e:
         return f"❌ Missing key in swap details: {str(e)}"
 
-    # For demonstration, we use a dummy minimum Wrapped BTC amount.
-    min_wrapped_btc = 0.000000000000001  # in BTC
-
     # Convert amounts to Wei (assuming 18 decimals)
     amount_musd_wei = int(amount_musd * 10**18)
-    min_wrapped_btc_wei = int(min_wrapped_btc * 10**18)
     deadline = int(time.time()) + 600  # 10 minutes from now
 
+    # Find the best mUSD -> Wrapped BTC route (direct or multi-hop), falling back to the direct pool
+    try:
+        route = pair_graph.best_route(MUSD_ADDRESS, WRAPPED_BTC_ADDRESS, amount_musd_wei)
+    except Exception as e:
+        print(f"⚠️ Route search failed, using the direct pool: {e}")
+        route = None
+    path = route["path"] if route else [MUSD_ADDRESS, WRAPPED_BTC_ADDRESS]
+
+    # Quote locally from cached pair reserves and derive the slippage-protected minimum
+    try:
+        quote = swap_quoter.quote(amount_musd_wei, path)
+    except Exception as e:
+        return f"❌ Failed to quote swap: {str(e)}"
+    min_wrapped_btc_wei = quote["min_amount_out"]
+    if min_wrapped_btc_wei <= 0:
+        return "❌ Swap amount too small: the quoted output is zero."
+
+    # Run the swap from the least busy pool account holding enough mUSD and gas
+    try:
+        fees = gas_oracle.fee_params()
+    except Exception as e:
+        return f"❌ Failed to fetch gas fees: {str(e)}"
+    try:
+        signer = signer_pool.select(
+            min_balance=swap_gas_fallback(path) * max_fee_per_gas(fees),
+            token=MUSD_ADDRESS,
+            min_token_balance=amount_musd_wei,
+        )
+    except ValueError as e:  # No keys configured
+        return str(e)
+    try:
+        return _execute_swap(signer, amount_musd_wei, min_wrapped_btc_wei, path, deadline, quote)
+    finally:
+        signer_pool.release(signer)
+
+def _execute_swap(signer, amount_musd_wei, min_wrapped_btc_wei, path, deadline, quote) -> str:
+    """
+    Approves (if needed), signs and broadcasts the swap from one pool account.
+    """
+    nonce_manager = signer.nonce_manager
+    # The swapped BTC goes back to the account that paid for it, which works whether the
+    # pool was configured from PRIVATE_KEY, PRIVATE_KEYS or a keystore
+    recipient = signer.address
+
     # Approve the router to spend mUSD if needed
     try:
-        approve_if_needed(musd_contract, amount_musd_wei)
+        approve_if_needed(config.musd_contract, amount_musd_wei, signer=signer)
     except Exception as e:
         return f"❌ Approval failed: {str(e)}"
 
-    # Define the swap path: mUSD -> Wrapped BTC
-    path = [MUSD_ADDRESS, WRAPPED_BTC_ADDRESS]
-
-    nonce = web3_instance.eth.get_transaction_count(sender_address)
-    gas_price = web3_instance.eth.gas_price
+    fees = gas_oracle.fee_params()
+    nonce = nonce_manager.next_nonce()
 
     try:
-        swap_tx = router_contract.functions.swapExactTokensForTokens(
+        swap_tx = config.router_contract.functions.swapExactTokensForTokens(
             amount_musd_wei,        # mUSD amount
             min_wrapped_btc_wei,     # Minimum Wrapped BTC to receive
             path,                   # Swap path
-            sender_address,         # Recipient address
+            recipient,              # Recipient
             deadline                # Transaction deadline
         ).build_transaction({
-            "from": sender_address,
+            "from": signer.address,
             "nonce": nonce,
-            "gasPrice": gas_price,
+            "gas": swap_gas_fallback(path),  # placeholder so building makes no RPC call
+            **fees,
         })
     except Exception as e:
+        nonce_manager.release(nonce)
         return f"❌ Failed to build swap transaction: {str(e)}"
 
-    # Estimate gas and add a buffer
+    # Estimate gas (memoized per calldata shape) and add a buffer
     try:
-        estimated_gas = web3_instance.eth.estimate_gas(swap_tx)
+        estimate_tx = {k: swap_tx[k] for k in ("to", "from", "data", "value") if k in swap_tx}
+        estimated_gas = gas_oracle.estimate_gas(estimate_tx)
         swap_tx["gas"] = estimated_gas + 10000
     except Exception as e:
-        swap_tx["gas"] = 250000  # Fallback gas limit
+        swap_tx["gas"] = swap_gas_fallback(path)  # Fallback gas limit
+
+    def sign(tx_nonce: int) -> bytes:
+        return signer.sign(dict(swap_tx, nonce=tx_nonce)).raw_transaction
 
     try:
-        signed_swap_tx = web3_instance.eth.account.sign_transaction(swap_tx, PRIVATE_KEY)
-        tx_hash = web3_instance.eth.send_raw_transaction(signed_swap_tx.raw_transaction)
+        tx_hash = nonce_manager.send(sign, nonce=nonce)
     except Exception as e:
         return f"❌ Swap transaction failed: {str(e)}"
 
-    receipt = web3_instance.eth.wait_for_transaction_receipt(tx_hash)
-    if receipt.status != 1:
-        return f"❌ Swap transaction failed. Receipt: {receipt}"
-    
-    return f"✅ Swap Successful! TX Hash: {tx_hash.hex()}"
\ No newline at end of file
+    # The router pulls the input via transferFrom, so the cached allowance and balance shrink
+    allowance_manager.record_spend(MUSD_ADDRESS, ROUTER_ADDRESS, amount_musd_wei, owner=signer.address)
+    signer.debit(amount_musd_wei, token=MUSD_ADDRESS)
+
+    def on_confirmed(receipt):
+        if receipt.status == 1:
+            print(f"✅ Swap confirmed. TX Hash: {tx_hash.hex()}")
+        else:
+            allowance_manager.invalidate(MUSD_ADDRESS, ROUTER_ADDRESS, owner=signer.address)
+            gas_oracle.check_receipt(receipt, swap_tx["gas"])
+            print(f"❌ Swap reverted. TX Hash: {tx_hash.hex()}")
+
+    # Track confirmation in the background instead of blocking the agent
+    receipt_watcher.watch(
+        tx_hash,
+        on_confirmed=on_confirmed,
+        on_dropped=lambda h: print(f"❌ Swap transaction was dropped. TX Hash: {h}"),
+    )
+
+    expected_btc = quote["amount_out"] / 10**18
+    return f"✅ Swap Submitted! Expected ~{expected_btc} Wrapped BTC. TX Hash: {tx_hash.hex()}"
\ No newline at end of file
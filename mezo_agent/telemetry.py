@@ -0,0 +1,459 @@
+"""
+Tracing and metrics for the Mezo tools.
+
+Spans time every LLM call, subgraph query, Web3 JSON-RPC request and receipt wait.
+With MEZO_TELEMETRY set ('1', or 'otel' to also export to OpenTelemetry) each span
+feeds a call counter and a latency histogram, readable as Prometheus text from
+prometheus_text() or serve_metrics(). invoke_with_trace() runs one tool and returns
+its result together with a Trace of every span it caused, whether or not metrics
+are enabled. With neither active, span() returns a shared no-op object.
+"""
+import os
+import time
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from opentelemetry import metrics as otel_metrics, trace as otel_trace  # Optional: OpenTelemetry export
+except ImportError:
+    otel_metrics = otel_trace = None
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_mode = (os.getenv("MEZO_TELEMETRY") or "").strip().lower()
+_enabled = _mode not in ("", "0", "false", "off")
+_otel = None  # (tracer, call counter, duration histogram) once OpenTelemetry export is on
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("mezo_agent_trace", default=None)
+
+
+# ---------------------------------------------------------------------- #
+# Metrics
+# ---------------------------------------------------------------------- #
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+
+
+class Metrics:
+    """
+    Call counters (by kind, name and status) and latency histograms (by kind and name).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[str, str, str], int] = {}
+        self._durations: Dict[Tuple[str, str], _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, kind: str, name: str, seconds: float, error: bool = False):
+        status = "error" if error else "ok"
+        with self._lock:
+            self._calls[(kind, name, status)] = self._calls.get((kind, name, status), 0) + 1
+            histogram = self._durations.get((kind, name))
+            if histogram is None:
+                histogram = self._durations[(kind, name)] = _Histogram()
+            histogram.observe(seconds)
+
+    def as_dict(self) -> dict:
+        """
+        :return: {kind: {name: {calls, errors, avg_ms, total_s}}}.
+        """
+        with self._lock:
+            calls, durations = dict(self._calls), {k: (h.count, h.sum) for k, h in self._durations.items()}
+        summary: Dict[str, dict] = {}
+        for (kind, name), (count, total) in durations.items():
+            summary.setdefault(kind, {})[name] = {
+                "calls": count,
+                "errors": calls.get((kind, name, "error"), 0),
+                "avg_ms": total / count * 1000 if count else 0.0,
+                "total_s": total,
+            }
+        return summary
+
+    def prometheus_text(self) -> str:
+        with self._lock:
+            calls = sorted(self._calls.items())
+            durations = sorted((k, list(h.counts), h.count, h.sum) for k, h in self._durations.items())
+        lines = [
+            "# HELP mezo_agent_calls_total Calls made by the Mezo tools.",
+            "# TYPE mezo_agent_calls_total counter",
+        ]
+        for (kind, name, status), count in calls:
+            lines.append(f'mezo_agent_calls_total{{kind="{kind}",name="{_escape(name)}",status="{status}"}} {count}')
+        lines += [
+            "# HELP mezo_agent_call_duration_seconds Latency of calls made by the Mezo tools.",
+            "# TYPE mezo_agent_call_duration_seconds histogram",
+        ]
+        for (kind, name), counts, count, total in durations:
+            labels = f'kind="{kind}",name="{_escape(name)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS, counts):
+                cumulative += bucket_count
+                lines.append(f'mezo_agent_call_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'mezo_agent_call_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"mezo_agent_call_duration_seconds_sum{{{labels}}} {total}")
+            lines.append(f"mezo_agent_call_duration_seconds_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._calls.clear()
+            self._durations.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Shared registry fed by every span while telemetry is enabled
+metrics = Metrics()
+
+
+# ---------------------------------------------------------------------- #
+# Spans and traces
+# ---------------------------------------------------------------------- #
+class Trace:
+    """
+    Every span recorded during one tool invocation.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.spans: List["Span"] = []
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add(self, span: "Span"):
+        with self._lock:
+            self.spans.append(span)
+
+    def breakdown(self) -> Dict[str, dict]:
+        """
+        :return: {kind: {"count", "seconds"}}, e.g. how long the invocation spent in the LLM.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        totals: Dict[str, dict] = {}
+        for span in spans:
+            entry = totals.setdefault(span.kind, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += span.duration or 0.0
+        return totals
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "name": self.name,
+            "duration": self.duration,
+            "breakdown": self.breakdown(),
+            "spans": [
+                {
+                    "kind": s.kind,
+                    "name": s.name,
+                    "offset": s.start - self.start,
+                    "duration": s.duration,
+                    "error": s.error,
+                    "attributes": s.attributes,
+                }
+                for s in sorted(spans, key=lambda s: s.start)
+            ],
+        }
+
+
+class Span:
+    """
+    Times one call; records into the active trace, the metrics and OpenTelemetry.
+    """
+
+    __slots__ = ("kind", "name", "attributes", "start", "duration", "error", "_trace", "_otel_span")
+
+    def __init__(self, kind: str, name: str, attributes: dict, trace: Optional[Trace]):
+        self.kind = kind
+        self.name = name
+        self.attributes = attributes
+        self.start = 0.0
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self._trace = trace
+        self._otel_span = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        if _otel is not None:
+            self._otel_span = _otel[0].start_span(f"{self.kind} {self.name}")
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            self.error = f"{exc_type.__name__}: {exc}"
+        if self._trace is not None:
+            self._trace.add(self)
+        if _enabled:
+            metrics.observe(self.kind, self.name, self.duration, self.error is not None)
+            if _otel is not None:
+                labels = {"kind": self.kind, "name": self.name, "status": "error" if self.error else "ok"}
+                _otel[1].add(1, labels)
+                _otel[2].record(self.duration, labels)
+        if self._otel_span is not None:
+            for key, value in self.attributes.items():
+                self._otel_span.set_attribute(key, str(value))
+            self._otel_span.end()
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(kind: str, name: str, **attributes):
+    """
+    Context manager timing one call, e.g. span("rpc", "eth_estimateGas").
+
+    :param kind: Category shown in trace breakdowns and metric labels (llm, graph, rpc, receipt, tool).
+    :param name: The specific call within the kind.
+    """
+    trace = _current_trace.get()
+    if trace is None and not _enabled:
+        return _NOOP_SPAN
+    return Span(kind, name, attributes, trace)
+
+
+def observe(kind: str, name: str, seconds: float, error: bool = False):
+    """
+    Records a duration measured elsewhere (e.g. time from broadcast to confirmation).
+    """
+    if _enabled:
+        metrics.observe(kind, name, seconds, error)
+
+
+@contextmanager
+def trace(name: str):
+    """
+    Collects every span in this context (and in work handed off with bind()) into a Trace.
+    """
+    current = Trace(name)
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        current.duration = time.perf_counter() - current.start
+        _current_trace.reset(token)
+
+
+def bind(fn):
+    """
+    Wraps fn so spans it records on another thread join the caller's trace.
+    """
+    current = _current_trace.get()
+    if current is None:
+        return fn
+
+    def run(*args, **kwargs):
+        token = _current_trace.set(current)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_trace.reset(token)
+
+    return run
+
+
+def bind_coroutine(coro):
+    """
+    Wraps a coroutine so spans it records on another event loop join the caller's trace.
+    """
+    current = _current_trace.get()
+    if current is None:
+        return coro
+
+    async def run():
+        _current_trace.set(current)  # Local to the task running this coroutine
+        return await coro
+
+    return run()
+
+
+def invoke_with_trace(tool, tool_input, **kwargs):
+    """
+    Runs a tool (a LangChain tool or a plain function) and traces everything it does.
+
+    :param tool: e.g. mezo_agent_transaction_btc.
+    :param tool_input: The tool's input (prompt string or argument dict).
+    :return: (result, Trace).
+    """
+    name = getattr(tool, "name", None) or getattr(tool, "__name__", "tool")
+    with trace(name) as current:
+        with span("tool", name):
+            result = tool.invoke(tool_input, **kwargs) if hasattr(tool, "invoke") else tool(tool_input, **kwargs)
+    return result, current
+
+
+# ---------------------------------------------------------------------- #
+# Instrumentation helpers
+# ---------------------------------------------------------------------- #
+class TracedLLM:
+    """
+    Forwards to a chat model, timing every invoke and stream as an "llm" span.
+    """
+
+    def __init__(self, llm, name: str = "chat"):
+        self.llm = llm
+        self.name = name
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def invoke(self, prompt, **kwargs):
+        with span("llm", self.name):
+            return self.llm.invoke(prompt, **kwargs)
+
+    async def ainvoke(self, prompt, **kwargs):
+        with span("llm", self.name):
+            return await self.llm.ainvoke(prompt, **kwargs)
+
+    def stream(self, prompt, **kwargs):
+        with span("llm", f"{self.name}.stream") as s:
+            first = True
+            for chunk in self.llm.stream(prompt, **kwargs):
+                if first:
+                    s.set(ttft=time.perf_counter() - s.start if isinstance(s, Span) else None)
+                    first = False
+                yield chunk
+
+    async def astream(self, prompt, **kwargs):
+        with span("llm", f"{self.name}.stream") as s:
+            first = True
+            async for chunk in self.llm.astream(prompt, **kwargs):
+                if first:
+                    s.set(ttft=time.perf_counter() - s.start if isinstance(s, Span) else None)
+                    first = False
+                yield chunk
+
+
+def instrument_provider(provider):
+    """
+    Times every JSON-RPC request a Web3 provider (sync or async) makes, named by method.
+    """
+    make_request = provider.make_request
+    if asyncio.iscoroutinefunction(make_request):
+        async def traced(method, params):
+            with span("rpc", str(method)):
+                return await make_request(method, params)
+    else:
+        def traced(method, params):
+            with span("rpc", str(method)):
+                return make_request(method, params)
+    provider.make_request = traced
+    return provider
+
+
+# ---------------------------------------------------------------------- #
+# Configuration and export
+# ---------------------------------------------------------------------- #
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable(otel: bool = False):
+    """
+    Turns metrics on at runtime (as MEZO_TELEMETRY does at import).
+
+    :param otel: Also export spans and metrics through the OpenTelemetry API.
+    """
+    global _enabled, _otel
+    _enabled = True
+    if otel and _otel is None:
+        if otel_trace is None:
+            print("⚠️ Warning: opentelemetry-api is not installed; exporting Prometheus text only.")
+            return
+        meter = otel_metrics.get_meter("mezo_agent")
+        _otel = (
+            otel_trace.get_tracer("mezo_agent"),
+            meter.create_counter("mezo_agent.calls", description="Calls made by the Mezo tools."),
+            meter.create_histogram("mezo_agent.call.duration", unit="s", description="Latency of calls made by the Mezo tools."),
+        )
+
+
+def disable():
+    global _enabled, _otel
+    _enabled = False
+    _otel = None
+
+
+def get_metrics() -> dict:
+    """
+    :return: {kind: {name: {calls, errors, avg_ms, total_s}}} recorded since start-up.
+    """
+    return metrics.as_dict()
+
+
+def prometheus_text() -> str:
+    """
+    :return: The metrics in the Prometheus text exposition format.
+    """
+    return metrics.prometheus_text()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_metrics(port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serves /metrics for Prometheus to scrape from a background thread.
+
+    :return: The server (call shutdown() to stop it).
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mezo-metrics", daemon=True).start()
+    return server
+
+
+if _mode == "otel":
+    enable(otel=True)
@@ -1,5 +1,6 @@
 from langchain.tools import tool
-from mezo_agent.config import web3_instance, sender_address, ERC20_ABI
+from mezo_agent import config
+from mezo_agent.config import ERC20_ABI
 from mezo_agent.parsing import extract_balance_details
 from mezo_agent.token_utils import get_token_address_by_symbol  
 
@@ -25,11 +26,11 @@ def mezo_agent_token_balance_tool(balance_prompt: str) -> str:
         token_address = get_token_address_by_symbol(token_symbol)
         print(f"✅ Using token address: {token_address}")  # Debugging
 
-        token_contract = web3_instance.eth.contract(address=token_address, abi=ERC20_ABI)
+        token_contract = config.web3_instance.eth.contract(address=token_address, abi=ERC20_ABI)
 
         # Fetch balance
-        balance_wei = token_contract.functions.balanceOf(sender_address).call()
-        balance = web3_instance.from_wei(balance_wei, "ether")
+        balance_wei = token_contract.functions.balanceOf(config.sender_address).call()
+        balance = config.web3_instance.from_wei(balance_wei, "ether")
         return f"✅ {token_symbol.upper()} Balance: {balance}"
     except Exception as e:
         return f"❌ Failed to fetch balance: {str(e)}"
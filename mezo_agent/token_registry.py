@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional
+from web3 import Web3
+from mezo_agent.config import query_graph
+
+# Symbols users type that map onto a different on-chain token symbol
+SYMBOL_ALIASES = {
+    "btc": "wtbtc",
+}
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "mezo_agent", "tokens.json")
+DEFAULT_TTL = 3600  # seconds before a snapshot is considered stale
+PAGE_SIZE = 1000  # maximum page size accepted by the subgraph
+MISS_REFRESH_INTERVAL = 60  # minimum seconds between refreshes forced by unknown symbols
+
+TOKENS_PAGE_QUERY = '''
+{{
+  tokens(first: {first}, orderBy: id, orderDirection: asc, where: {{id_gt: "{last_id}"}}) {{
+    id
+    symbol
+    decimals
+  }}
+}}
+'''
+
+
+def normalize_symbol(symbol: str) -> str:
+    """
+    Lowercases a token symbol and applies the user-facing aliases (e.g. BTC -> WTBTC).
+    """
+    symbol = symbol.strip().lower()
+    return SYMBOL_ALIASES.get(symbol, symbol)
+
+
+class TokenRegistry:
+    """
+    In-memory symbol -> token index backed by the Goldsky subgraph.
+
+    The full token list is paged through once and indexed by lowercase symbol, so lookups
+    are dictionary reads. The index is persisted to disk so warm starts skip the network,
+    and a stale index is refreshed on a background thread while the old one keeps serving.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        :param cache_path: Location of the on-disk snapshot (defaults to MEZO_TOKEN_CACHE or ~/.cache).
+        :param ttl: Seconds before the index is refreshed (defaults to MEZO_TOKEN_TTL or one hour).
+        """
+        self.cache_path = cache_path or os.getenv("MEZO_TOKEN_CACHE", DEFAULT_CACHE_PATH)
+        self.ttl = float(ttl if ttl is not None else os.getenv("MEZO_TOKEN_TTL", DEFAULT_TTL))
+        self._by_symbol: Dict[str, dict] = {}
+        self._fetched_at = 0.0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._refreshing = threading.Event()
+
+    # ------------------------------------------------------------------ #
+    # Loading
+    # ------------------------------------------------------------------ #
+    def _fetch_all(self) -> List[dict]:
+        """
+        Pages through every token in the subgraph using id cursors.
+        """
+        tokens = []
+        last_id = ""
+        while True:
+            data = query_graph(TOKENS_PAGE_QUERY.format(first=PAGE_SIZE, last_id=last_id))
+            page = data.get("data", {}).get("tokens", [])
+            tokens.extend(page)
+            if len(page) < PAGE_SIZE:
+                return tokens
+            last_id = page[-1]["id"]
+
+    def _index(self, tokens: List[dict]) -> Dict[str, dict]:
+        index = {}
+        for t in tokens:
+            symbol = (t.get("symbol") or "").lower()
+            if not symbol or symbol in index:
+                continue  # First token wins, matching the previous lookup behaviour
+            index[symbol] = {
+                "symbol": t["symbol"],
+                "address": Web3.to_checksum_address(t["id"]),
+                "decimals": int(t.get("decimals") or 18),
+            }
+        return index
+
+    def _load_snapshot(self) -> bool:
+        try:
+            with open(self.cache_path, "r") as f:
+                snapshot = json.load(f)
+            self._by_symbol = snapshot["tokens"]
+            self._fetched_at = float(snapshot["fetched_at"])
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+    def _save_snapshot(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"fetched_at": self._fetched_at, "tokens": self._by_symbol}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️ Warning: Could not persist token registry snapshot: {e}")
+
+    def refresh(self):
+        """
+        Re-fetches the full token list from the subgraph and swaps in the new index.
+        """
+        index = self._index(self._fetch_all())
+        with self._lock:
+            self._by_symbol = index
+            self._fetched_at = time.time()
+            self._loaded = True
+        self._save_snapshot()
+
+    def _refresh_in_background(self):
+        if self._refreshing.is_set():
+            return
+        self._refreshing.set()
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Warning: Background token registry refresh failed: {e}")
+            finally:
+                self._refreshing.clear()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._loaded = self._load_snapshot()
+            if not self._loaded:
+                self.refresh()
+                return
+        if self.is_stale():
+            self._refresh_in_background()
+
+    def is_stale(self) -> bool:
+        return time.time() - self._fetched_at > self.ttl
+
+    # ------------------------------------------------------------------ #
+    # Lookups
+    # ------------------------------------------------------------------ #
+    def get(self, symbol: str) -> Optional[dict]:
+        """
+        Returns the indexed entry ({symbol, address, decimals}) for a symbol, or None.
+
+        An unknown symbol triggers one synchronous refresh (rate limited) so newly listed
+        tokens are picked up without waiting for the TTL.
+        """
+        self._ensure_loaded()
+        key = normalize_symbol(symbol)
+        entry = self._by_symbol.get(key)
+        if entry is None and time.time() - self._fetched_at > MISS_REFRESH_INTERVAL:
+            self.refresh()
+            entry = self._by_symbol.get(key)
+        return entry
+
+    def address(self, symbol: str) -> str:
+        """
+        :param symbol: Token symbol (e.g., 'MUSD', 'BTC').
+        :return: Ethereum checksum address of the token.
+        """
+        entry = self.get(symbol)
+        if entry is None:
+            raise Exception(f"❌ Token '{normalize_symbol(symbol)}' not found. Available: {', '.join(self.symbols())}")
+        return entry["address"]
+
+    def decimals(self, symbol: str) -> int:
+        entry = self.get(symbol)
+        if entry is None:
+            raise Exception(f"❌ Token '{normalize_symbol(symbol)}' not found.")
+        return entry["decimals"]
+
+    def tokens(self) -> List[dict]:
+        """
+        :return: Every indexed token entry ({symbol, address, decimals}).
+        """
+        self._ensure_loaded()
+        return list(self._by_symbol.values())
+
+    def symbols(self) -> List[str]:
+        """
+        :return: The on-chain symbols of every indexed token.
+        """
+        self._ensure_loaded()
+        return [entry["symbol"] for entry in self._by_symbol.values()]
+
+    def cached_symbols(self) -> List[str]:
+        """
+        Like symbols(), but never waits on the network: the disk snapshot is used if there
+        is one, and a missing or stale index is fetched on a background thread.
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._loaded = self._load_snapshot()
+        if self.is_stale():
+            self._refresh_in_background()
+        return [entry["symbol"] for entry in self._by_symbol.values()]
+
+
+# Shared registry used by the tools
+token_registry = TokenRegistry()
@@ -0,0 +1,213 @@
+import os
+import time
+import random
+import threading
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx  # Optional: enables HTTP/2 for the Goldsky client
+except ImportError:
+    httpx = None
+
+DEFAULT_TIMEOUT = float(os.getenv("MEZO_HTTP_TIMEOUT", 10))
+DEFAULT_RETRIES = int(os.getenv("MEZO_HTTP_RETRIES", 3))
+DEFAULT_POOL_SIZE = int(os.getenv("MEZO_HTTP_POOL_SIZE", 32))
+BACKOFF_BASE = 0.25  # seconds
+BACKOFF_CAP = 8.0  # seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Requests that must reach the node at most once: a retried broadcast whose first try
+# did land comes back "already known", which the caller cannot tell from a rejection
+NON_IDEMPOTENT_METHODS = (b"eth_sendRawTransaction", b"eth_sendTransaction")
+
+
+def _is_non_idempotent(body) -> bool:
+    if body is None:
+        return False
+    if not isinstance(body, (bytes, str)):
+        body = repr(body)
+    if isinstance(body, str):
+        body = body.encode()
+    return any(method in body for method in NON_IDEMPOTENT_METHODS)
+
+
+class EndpointStats:
+    """
+    Request, error and latency counters for one endpoint (host + path).
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.status_codes: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, status: Optional[int] = None, error: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if status is not None:
+                self.status_codes[status] = self.status_codes.get(status, 0) + 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "avg_latency": self.total_latency / self.requests if self.requests else 0.0,
+                "max_latency": self.max_latency,
+                "status_codes": dict(self.status_codes),
+            }
+
+
+class _PooledSession(requests.Session):
+    """
+    requests.Session whose every request goes through the transport's retry and
+    stats logic. Passing it to Web3.HTTPProvider routes JSON-RPC through the same path.
+    """
+
+    def __init__(self, transport: "HttpTransport"):
+        super().__init__()
+        self._transport = transport
+        adapter = HTTPAdapter(pool_connections=transport.pool_size, pool_maxsize=transport.pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self._transport.timeout)
+        retries = 0 if _is_non_idempotent(kwargs.get("data") or kwargs.get("json")) else None
+        return self._transport._with_retries(
+            url, lambda: requests.Session.request(self, method, url, **kwargs), retries
+        )
+
+
+class HttpTransport:
+    """
+    Shared HTTP layer for the Goldsky client and the Web3 provider.
+
+    Keeps pooled keep-alive connections, applies timeouts, retries 429/5xx responses
+    and connection errors with jittered exponential backoff (honouring Retry-After),
+    and records per-endpoint latency and error counters. Transaction broadcasts are
+    never retried. HTTP/2 is used for post_json() when enabled and httpx is
+    installed; the sync Web3 provider always uses the pooled requests session. The
+    async Web3 provider (aiohttp) does not go through this transport, so async sends
+    get aiohttp's own pooling but no retries or stats.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        http2: Optional[bool] = None,
+    ):
+        """
+        :param timeout: Per-request timeout in seconds.
+        :param retries: Retry attempts after the first try.
+        :param pool_size: Maximum pooled connections per host.
+        :param http2: Use HTTP/2 for post_json() (defaults to MEZO_HTTP2=1).
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.pool_size = pool_size
+        self._stats: Dict[str, EndpointStats] = {}
+        self._stats_lock = threading.Lock()
+        self.session = _PooledSession(self)
+
+        if http2 is None:
+            http2 = os.getenv("MEZO_HTTP2") == "1"
+        self._http2_client = None
+        if http2:
+            if httpx is None:
+                print("⚠️ Warning: MEZO_HTTP2 is set but httpx is not installed; using HTTP/1.1.")
+            else:
+                self._http2_client = httpx.Client(
+                    http2=True,
+                    timeout=timeout,
+                    limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                )
+
+    def _stats_for(self, url: str) -> EndpointStats:
+        parsed = urlparse(url)
+        endpoint = f"{parsed.netloc}{parsed.path}"
+        with self._stats_lock:
+            if endpoint not in self._stats:
+                self._stats[endpoint] = EndpointStats()
+            return self._stats[endpoint]
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_CAP)
+            except ValueError:
+                pass
+        # Full jitter: spread retries from many callers instead of synchronising them
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    def _with_retries(self, url: str, send: Callable, retries: Optional[int] = None):
+        retries = self.retries if retries is None else retries
+        stats = self._stats_for(url)
+        transient = (requests.ConnectionError, requests.Timeout)
+        if httpx is not None:
+            transient += (httpx.TransportError,)
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            retry_after = None
+            try:
+                response = send()
+            except transient:
+                stats.record(time.perf_counter() - start, error=True)
+                if attempt >= retries:
+                    raise
+            else:
+                status = response.status_code
+                retryable = status in RETRY_STATUSES
+                stats.record(time.perf_counter() - start, status=status, error=status >= 400)
+                if not retryable or attempt >= retries:
+                    return response
+                retry_after = response.headers.get("Retry-After")
+            attempt += 1
+            stats.record_retry()
+            time.sleep(self._backoff(attempt, retry_after))
+
+    def post_json(self, url: str, payload) -> "requests.Response":
+        """
+        POSTs a JSON payload with pooling, retries and stats. Uses HTTP/2 when enabled.
+        """
+        if self._http2_client is not None:
+            retries = 0 if _is_non_idempotent(payload) else None
+            return self._with_retries(url, lambda: self._http2_client.post(url, json=payload), retries)
+        return self.session.post(url, json=payload)
+
+    def stats(self) -> dict:
+        """
+        :return: Per-endpoint request, error, retry and latency counters.
+        """
+        with self._stats_lock:
+            endpoints = dict(self._stats)
+        return {endpoint: s.as_dict() for endpoint, s in endpoints.items()}
+
+
+# Shared transport for every outbound HTTP call
+transport = HttpTransport()
+
+
+def get_transport_stats() -> dict:
+    """
+    :return: Per-endpoint latency and error counters for the shared transport.
+    """
+    return transport.stats()
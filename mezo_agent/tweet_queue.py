@@ -0,0 +1,187 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from typing import Dict, List, Optional
+from .characters import get_character_prompt
+from .context import get_context
+
+DEFAULT_QUEUE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "mezo_agent", "tweet_queue.json")
+BATCH_SIZE = 10  # tweets requested per LLM call
+LOW_WATER = 3  # queued tweets below which a background refill starts
+MAX_TWEET_LENGTH = 280
+SIMHASH_DISTANCE = 6  # max differing bits (of 64) for two tweets to count as near-duplicates
+FINGERPRINT_HISTORY = 500  # fingerprints of queued and posted tweets kept per character
+
+_WORD_RE = re.compile(r"[a-z0-9#@$']+")
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+BATCH_PROMPT = """{character_prompt}
+
+Personality for this account: {personality}
+
+Write {count} distinct tweets in this character's voice about Bitcoin, DeFi and the Mezo network.
+Vary the topics and the wording. Each tweet must be under {max_length} characters.
+Output a JSON array of {count} strings with no additional text.
+"""
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash over word bigrams; similar texts get fingerprints a few bits apart.
+    """
+    words = _WORD_RE.findall(text.lower())
+    features = [" ".join(words[i:i + 2]) for i in range(max(len(words) - 1, 1))]
+    weights = [0] * 64
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def is_near_duplicate(fingerprint: int, others: List[int], distance: int = SIMHASH_DISTANCE) -> bool:
+    return any(bin(fingerprint ^ other).count("1") <= distance for other in others)
+
+
+class TweetQueue:
+    """
+    Persistent per-character queue of pre-generated tweets.
+
+    Tweets are written by the character's LLM persona in batches (one call per
+    BATCH_SIZE tweets) ahead of time. Near-duplicates of anything queued or recently
+    posted are dropped using SimHash fingerprints. Posting pops from the queue, and a
+    background refill starts once the queue runs low, so no LLM call sits on the
+    posting path.
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: int = BATCH_SIZE, low_water: int = LOW_WATER):
+        """
+        :param path: JSON file holding the queues (defaults to MEZO_TWEET_QUEUE or ~/.cache).
+        :param batch_size: Tweets requested per LLM call.
+        :param low_water: Queue length below which a refill is started.
+        """
+        self.path = path or os.getenv("MEZO_TWEET_QUEUE", DEFAULT_QUEUE_PATH)
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self._lock = threading.Lock()
+        self._refilling = set()
+        self._state: Dict[str, dict] = self._load()
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._state, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Warning: Could not persist the tweet queue: {e}")
+
+    def _entry(self, character: str) -> dict:
+        return self._state.setdefault(character, {"queue": [], "fingerprints": []})
+
+    # ------------------------------------------------------------------ #
+    # Generation
+    # ------------------------------------------------------------------ #
+    def generate_batch(self, character: str, personality: str = "", count: Optional[int] = None) -> List[str]:
+        """
+        Asks the character's LLM persona for a batch of tweets in one call.
+        """
+        count = count or self.batch_size
+        prompt = BATCH_PROMPT.format(
+            character_prompt=get_character_prompt(character),
+            personality=personality or character,
+            count=count,
+            max_length=MAX_TWEET_LENGTH,
+        )
+        response = get_context().creative_llm.invoke(prompt)
+        match = _JSON_ARRAY_RE.search(response.content)
+        try:
+            tweets = json.loads(match.group(0) if match else response.content)
+        except ValueError:
+            # Not JSON: fall back to one tweet per line
+            tweets = [line.strip(" -•\"") for line in response.content.splitlines()]
+        return [str(t).strip()[:MAX_TWEET_LENGTH] for t in tweets if str(t).strip()]
+
+    def add(self, character: str, tweets: List[str]) -> int:
+        """
+        Queues tweets, skipping near-duplicates of queued or recently posted ones.
+
+        :return: Number of tweets queued.
+        """
+        added = 0
+        with self._lock:
+            entry = self._entry(character)
+            for tweet in tweets:
+                fingerprint = simhash(tweet)
+                if is_near_duplicate(fingerprint, entry["fingerprints"]):
+                    continue
+                entry["queue"].append(tweet)
+                entry["fingerprints"].append(fingerprint)
+                added += 1
+            entry["fingerprints"] = entry["fingerprints"][-FINGERPRINT_HISTORY:]
+            self._save()
+        return added
+
+    def refill(self, character: str, personality: str = "") -> int:
+        """
+        Generates one batch for a character and queues the distinct tweets.
+
+        :return: Number of tweets queued.
+        """
+        return self.add(character, self.generate_batch(character, personality))
+
+    def refill_in_background(self, character: str, personality: str):
+        with self._lock:
+            if character in self._refilling:
+                return
+            self._refilling.add(character)
+
+        def run():
+            try:
+                self.refill(character, personality)
+            except Exception as e:
+                print(f"⚠️ Warning: Tweet pre-generation for {character} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refilling.discard(character)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # ------------------------------------------------------------------ #
+    # Posting
+    # ------------------------------------------------------------------ #
+    def size(self, character: str) -> int:
+        with self._lock:
+            return len(self._state.get(character, {}).get("queue", []))
+
+    def pop(self, character: str, personality: str = "") -> Optional[str]:
+        """
+        Takes the next queued tweet (None if the queue is empty) and tops the queue
+        up in the background when it runs low.
+        """
+        with self._lock:
+            queue = self._entry(character)["queue"]
+            tweet = queue.pop(0) if queue else None
+            remaining = len(queue)
+            if tweet is not None:
+                self._save()
+        if remaining < self.low_water:
+            self.refill_in_background(character, personality)
+        return tweet
+
+
+# Shared queue used by TwitterClient
+tweet_queue = TweetQueue()
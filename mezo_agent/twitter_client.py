@@ -2,8 +2,9 @@ import tweepy
 import time
 import random
 from datetime import datetime, timedelta
-from threading import Thread
 from mezo_agent.config import load_dotenv
+from mezo_agent.twitter_scheduler import tweet_scheduler, DEFAULT_INTERVAL
+from mezo_agent.tweet_queue import tweet_queue
 import os
 
 # Load environment variables
@@ -33,16 +34,25 @@ class TwitterClient:
         auth.set_access_token(access_token, access_secret)
         self.api = tweepy.API(auth, wait_on_rate_limit=True)
 
+        # Pre-generate tweets so posting never waits on the LLM
+        if tweet_queue.size(character_name) < tweet_queue.low_water:
+            tweet_queue.refill_in_background(character_name, personality)
+
         # Schedule tweets
         self.schedule_tweets()
 
     def generate_tweet(self) -> str:
         """
         Generates a tweet using AI for the character based on its personality.
-        This function can be modified to pull from AI-generated content.
+        Tweets are pre-generated in batches by the character LLM and dequeued here;
+        a fixed template is used only when the queue is empty.
 
         :return: A string containing the tweet.
         """
+        tweet = tweet_queue.pop(self.character_name, self.personality)
+        if tweet:
+            return tweet
+
         tweet_templates = [
             f"{self.character_name} - {self.personality}: \"Thinking about the future of DeFi... 🚀\"",
             f"{self.character_name} - {self.personality}: \"GM! Stay bullish today. 🌞\"",
@@ -66,15 +76,9 @@ class TwitterClient:
     def schedule_tweets(self):
         """
         Schedules tweets to be sent 5 times per 24-hour period.
-        Runs in a separate thread to avoid blocking the main agent process.
+        Posts are driven by the shared scheduler thread, which applies the app-wide
+        rate limit, jitters post times and persists the next slot across restarts.
         """
-        def tweet_scheduler():
-            while True:
-                for _ in range(5):  # Post 5 tweets per day
-                    self.post_tweet()
-                    sleep_time = (24 * 60 * 60) // 5  # Spread tweets across 24 hours
-                    print(f"⏳ Next tweet in {sleep_time // 60} minutes...")
-                    time.sleep(sleep_time)
-
-        thread = Thread(target=tweet_scheduler, daemon=True)
-        thread.start()
+        tweet_scheduler.register(self.character_name, self.post_tweet, interval=DEFAULT_INTERVAL)
+        next_fire = tweet_scheduler.next_fire_time(self.character_name)
+        print(f"⏳ Next tweet for {self.character_name} in {int(max(next_fire - time.time(), 0)) // 60} minutes...")
@@ -14,6 +14,7 @@ class TwitterManager:
         """
         self.config_file = config_file
         self.characters = {}
+        self.clients = {}
         self.load_characters()
 
     def load_characters(self):
@@ -58,6 +59,36 @@ class TwitterManager:
         self.save_characters()
         print(f"✅ Character '{character_name}' registered for Twitter with personality!")
 
-        # Start the Twitter client with personality
-        TwitterClient(character_name, api_key, api_secret, access_token, access_secret, personality)
+        # Start the Twitter client with personality (it registers with the shared tweet scheduler)
+        self.clients[character_name] = TwitterClient(character_name, api_key, api_secret, access_token, access_secret, personality)
+
+    def start_clients(self):
+        """
+        Starts a Twitter client for every saved character that is not running yet.
+        Their posting slots resume from the persisted schedule.
+        """
+        from mezo_agent.twitter_client import TwitterClient
+
+        for character_name, creds in self.characters.items():
+            if character_name in self.clients:
+                continue
+            self.clients[character_name] = TwitterClient(
+                character_name,
+                creds["api_key"],
+                creds["api_secret"],
+                creds["access_token"],
+                creds["access_secret"],
+                creds["personality"],
+            )
+
+    def remove_character(self, character_name: str):
+        """
+        Stops a character's scheduled tweets and removes its saved credentials.
+        """
+        from mezo_agent.twitter_scheduler import tweet_scheduler
+
+        tweet_scheduler.unregister(character_name)
+        self.clients.pop(character_name, None)
+        if self.characters.pop(character_name, None) is not None:
+            self.save_characters()
 
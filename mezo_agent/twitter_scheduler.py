@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import heapq
+import random
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+DEFAULT_STATE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "mezo_agent", "twitter_schedule.json")
+TWEETS_PER_DAY = 5
+DEFAULT_INTERVAL = (24 * 60 * 60) // TWEETS_PER_DAY
+DEFAULT_JITTER = 0.1  # fraction of the interval each post time may move either way
+DEFAULT_WORKERS = 4  # posts that may run at once, so one slow character does not delay the others
+
+# Shared posting budget for the app (X API v1.1 statuses/update: 300 posts per 3 hours)
+RATE_LIMIT_POSTS = int(os.getenv("MEZO_TWEET_RATE_LIMIT", 300))
+RATE_LIMIT_WINDOW = float(os.getenv("MEZO_TWEET_RATE_WINDOW", 3 * 60 * 60))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: capacity tokens, refilled continuously over window seconds.
+    """
+
+    def __init__(self, capacity: int = RATE_LIMIT_POSTS, window: float = RATE_LIMIT_WINDOW):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Takes one token, sleeping until one is available.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class TweetScheduler:
+    """
+    One timer thread that drives every character's posts.
+
+    Jobs sit in a heap ordered by next fire time, and the thread sleeps until the
+    earliest one is due. Due posts run on a small worker pool, each first taking a
+    token from the app-wide bucket; a job whose previous post is still running skips
+    its slot. Fire times are jittered and persisted to a JSON file before each post.
+    After a restart each job resumes its saved slot: an overdue slot fires once and
+    is never repeated.
+    """
+
+    def __init__(self, state_path: Optional[str] = None, bucket: Optional[TokenBucket] = None, max_workers: int = DEFAULT_WORKERS):
+        """
+        :param state_path: JSON file of next fire times (defaults to MEZO_TWITTER_SCHEDULE or ~/.cache).
+        :param bucket: Rate limiter shared by all jobs.
+        :param max_workers: Posts that may run at the same time.
+        """
+        self.state_path = state_path or os.getenv("MEZO_TWITTER_SCHEDULE", DEFAULT_STATE_PATH)
+        self.bucket = bucket or TokenBucket()
+        self.max_workers = max_workers
+        self._jobs: Dict[str, dict] = {}
+        self._running = set()  # names whose callback is executing
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._heap = []
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._next_fire = self._load_state()
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+    def _load_state(self) -> Dict[str, float]:
+        try:
+            with open(self.state_path, "r") as f:
+                return {name: float(t) for name, t in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _save_state(self):
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._next_fire, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"⚠️ Warning: Could not persist the tweet schedule: {e}")
+
+    # ------------------------------------------------------------------ #
+    # Jobs
+    # ------------------------------------------------------------------ #
+    def _jittered(self, base: float, job: dict) -> float:
+        spread = job["interval"] * job["jitter"]
+        return base + random.uniform(-spread, spread)
+
+    def register(self, name: str, callback: Callable[[], None], interval: float = DEFAULT_INTERVAL, jitter: float = DEFAULT_JITTER):
+        """
+        Schedules callback every interval seconds (with jitter) under a unique name.
+
+        A new job's first post lands at a random point within one interval, so jobs
+        registered together are spread out. Registering an existing name replaces its
+        callback and settings but keeps its scheduled slot.
+        """
+        job = {"callback": callback, "interval": interval, "jitter": jitter}
+        with self._condition:
+            scheduled = name in self._jobs
+            self._jobs[name] = job
+            if scheduled:
+                return  # Already in the heap; a second entry would post twice
+            fire_at = self._next_fire.get(name)
+            if fire_at is None:
+                fire_at = time.time() + random.uniform(0, interval)
+                self._next_fire[name] = fire_at
+                self._save_state()
+            heapq.heappush(self._heap, (fire_at, next(self._seq), name))
+            self._condition.notify()
+        self._ensure_running()
+
+    def unregister(self, name: str):
+        """
+        Stops a job; its heap entry is discarded when it comes due.
+        """
+        with self._condition:
+            self._jobs.pop(name, None)
+            self._next_fire.pop(name, None)
+            self._save_state()
+
+    def next_fire_time(self, name: str) -> Optional[float]:
+        with self._condition:
+            return self._next_fire.get(name)
+
+    def _ensure_running(self):
+        with self._condition:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mezo-tweet")
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="mezo-tweet-scheduler", daemon=True)
+                self._thread.start()
+
+    def _post(self, name: str, job: dict):
+        try:
+            self.bucket.acquire()
+            job["callback"]()
+        except Exception as e:
+            print(f"❌ Scheduled tweet for {name} failed: {e}")
+        finally:
+            with self._condition:
+                self._running.discard(name)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    fire_at, _, name = self._heap[0]
+                    job = self._jobs.get(name)
+                    if job is None or self._next_fire.get(name) != fire_at:
+                        heapq.heappop(self._heap)  # Unregistered or rescheduled job
+                        continue
+                    delay = fire_at - time.time()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                heapq.heappop(self._heap)
+                # Next slot is one interval on; after downtime it restarts from now
+                base = fire_at + job["interval"]
+                if base < time.time():
+                    base = time.time() + job["interval"]
+                next_fire = self._jittered(base, job)
+                self._next_fire[name] = next_fire
+                heapq.heappush(self._heap, (next_fire, next(self._seq), name))
+                self._save_state()  # Persisted before posting, so a crash cannot double-post
+
+                if name in self._running:
+                    print(f"⚠️ Warning: Previous tweet for {name} is still running; skipping this slot.")
+                    continue
+                self._running.add(name)
+            # Posting runs on the pool so a blocked callback cannot stall the other jobs
+            self._pool.submit(self._post, name, job)
+
+
+# Shared scheduler driving every TwitterClient
+tweet_scheduler = TweetScheduler()
@@ -13,7 +13,14 @@ setup(
         "web3",
         "langchain",
         "langchain_openai",
+        "requests",
     ],
+    extras_require={
+        "http2": ["httpx[http2]"],
+        "history": ["numpy"],
+        "bench": ["eth-tester[py-evm]", "py-solc-x"],
+        "test": ["pytest"],
+    },
     author="Dreadwulf, Duck, Digi",
     description="A Python package for Mezo Agent tools with LangChain tools",
 )
\ No newline at end of file
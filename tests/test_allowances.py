@@ -0,0 +1,98 @@
+from decimal import Decimal
+
+import pytest
+
+from mezo_agent.allowances import APPROVAL_TOPIC, MAX_UINT256, AllowanceManager, parse_policy
+
+OWNER = "0x" + "11" * 20
+TOKEN = "0x" + "22" * 20
+SPENDER = "0x" + "33" * 20
+
+
+class FakeCall:
+    def __init__(self, contract):
+        self.contract = contract
+
+    def call(self):
+        self.contract.reads += 1
+        return self.contract.onchain
+
+
+class FakeFunctions:
+    def __init__(self, contract):
+        self.contract = contract
+
+    def allowance(self, owner, spender):
+        return FakeCall(self.contract)
+
+
+class FakeToken:
+    address = TOKEN
+
+    def __init__(self, onchain: int):
+        self.onchain = onchain
+        self.reads = 0
+        self.functions = FakeFunctions(self)
+
+
+def _topic(address: str) -> str:
+    return "0x" + address[2:].rjust(64, "0")
+
+
+def test_parse_policy():
+    assert parse_policy(" Exact ") == ("exact", None)
+    assert parse_policy("max") == ("max", None)
+    assert parse_policy("budget:5000") == ("budget", Decimal(5000))
+    with pytest.raises(ValueError):
+        parse_policy("budget:lots")
+
+
+def test_policy_defaults_to_environment(monkeypatch):
+    monkeypatch.setenv("MEZO_APPROVAL_POLICY", "exact")
+    assert AllowanceManager().policy == "exact"
+    assert AllowanceManager("max").policy == "max"
+
+
+def test_approval_amount_follows_policy():
+    assert AllowanceManager("exact").approval_amount(10) == 10
+    assert AllowanceManager("max").approval_amount(10) == MAX_UINT256
+    assert AllowanceManager("budget:2").approval_amount(10, decimals=2) == 200
+    assert AllowanceManager("budget:2").approval_amount(500, decimals=2) == 500
+
+
+def test_allowance_is_read_from_chain_once():
+    manager = AllowanceManager("exact")
+    token = FakeToken(100)
+    assert manager.allowance(token, SPENDER, OWNER) == 100
+    token.onchain = 0
+    assert manager.allowance(token, SPENDER, OWNER) == 100
+    assert token.reads == 1
+    assert manager.allowance(token, SPENDER, OWNER, refresh=True) == 0
+
+
+def test_spends_are_deducted_except_from_max_approvals():
+    manager = AllowanceManager("exact")
+    manager.record_approval(TOKEN, SPENDER, 100, OWNER)
+    manager.record_spend(TOKEN, SPENDER, 30, OWNER)
+    assert manager.allowance(FakeToken(0), SPENDER, OWNER) == 70
+    manager.record_approval(TOKEN, SPENDER, MAX_UINT256, OWNER)
+    manager.record_spend(TOKEN, SPENDER, 30, OWNER)
+    assert manager.allowance(FakeToken(0), SPENDER, OWNER) == MAX_UINT256
+
+
+def test_approval_logs_update_cached_keys_only():
+    manager = AllowanceManager("exact")
+    manager.record_approval(TOKEN, SPENDER, 100, OWNER)
+    other = "0x" + "44" * 20
+    log = {"address": TOKEN, "topics": [APPROVAL_TOPIC, _topic(OWNER), _topic(SPENDER)], "data": hex(5)}
+    manager.apply_logs([log, dict(log, topics=[APPROVAL_TOPIC, _topic(OWNER), _topic(other)])])
+    assert manager.allowance(FakeToken(0), SPENDER, OWNER) == 5
+    token = FakeToken(9)
+    assert manager.allowance(token, other, OWNER) == 9 and token.reads == 1
+
+
+def test_invalidate_forces_a_chain_read():
+    manager = AllowanceManager("exact")
+    manager.record_approval(TOKEN, SPENDER, 100, OWNER)
+    manager.invalidate(token=TOKEN)
+    assert manager.allowance(FakeToken(7), SPENDER, OWNER) == 7
@@ -0,0 +1,129 @@
+import pytest
+from web3 import Web3
+
+from mezo_agent import batch_payout as batch_payout_module
+from mezo_agent import bulk_signing
+from mezo_agent.batch_payout import batch_payout
+from mezo_agent.nonce_manager import NonceManager
+from mezo_agent.rpc_batch import RpcError
+
+RECIPIENTS = ["0x" + f"{i:02x}" * 20 for i in (1, 2, 3)]
+
+
+class FakeEth:
+    def __init__(self, pending: int):
+        self.pending = pending
+
+    def get_transaction_count(self, address, block_identifier):
+        return self.pending
+
+
+class FakeWeb3:
+    def __init__(self, pending: int):
+        self.eth = FakeEth(pending)
+
+
+class FakeGasOracle:
+    def fee_params(self):
+        return {"gasPrice": 1}
+
+
+def _raw(item: dict) -> bytes:
+    return f"raw-{item['nonce']}".encode()
+
+
+def _hash(nonce: int) -> str:
+    return Web3.to_hex(Web3.keccak(f"raw-{nonce}".encode()))
+
+
+def _sign_all(valid, nonces, gas, fees):
+    for item, nonce in zip(valid, nonces):
+        item["nonce"] = nonce
+    return [_raw(item) for item in valid]
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = NonceManager(address="0x000000000000000000000000000000000000dEaD", web3=FakeWeb3(pending=5))
+    monkeypatch.setattr(batch_payout_module, "nonce_manager", manager)
+    monkeypatch.setattr(batch_payout_module, "gas_oracle", FakeGasOracle())
+    monkeypatch.setattr(batch_payout_module, "_estimate_gas_by_shape", lambda items: {"btc": 21000})
+    monkeypatch.setattr(batch_payout_module, "_check_funds", lambda items, gas, fees: None)
+    monkeypatch.setattr(batch_payout_module, "_sign_all", _sign_all)
+    return manager
+
+
+def run(count: int, max_concurrency: int = 16):
+    payouts = [(recipient, "0.1", "btc") for recipient in RECIPIENTS[:count]]
+    results = list(batch_payout(payouts, max_concurrency=max_concurrency, wait_for_receipt=False))
+    return sorted(results, key=lambda item: item["index"])
+
+
+def test_accepted_payouts_get_their_hashes(manager, monkeypatch):
+    def accept(raw_txs, size):
+        return [Web3.to_hex(Web3.keccak(raw_tx)) for raw_tx in raw_txs]
+
+    monkeypatch.setattr(bulk_signing, "send_raw_transactions", accept)
+    results = run(2)
+    assert [r["tx_hash"] for r in results] == [_hash(5), _hash(6)]
+    assert manager.next_nonce() == 7
+
+
+def test_rejected_payout_stops_later_batches_and_releases_their_nonces(manager, monkeypatch):
+    monkeypatch.setattr(
+        bulk_signing,
+        "send_raw_transactions",
+        lambda raw_txs, size: [RpcError({"code": -32000, "message": "insufficient funds"})],
+    )
+    results = run(3, max_concurrency=1)
+    assert "Broadcast failed" in results[0]["error"]
+    assert all("Not sent" in r["error"] for r in results[1:])
+    assert manager.next_nonce() == 5
+
+
+def test_broadcast_error_is_checked_against_the_node(manager, monkeypatch):
+    def timeout(raw_txs, size):
+        raise TimeoutError("read timed out")
+
+    def lookup(calls):
+        assert [params[0] for _, params in calls] == [_hash(5), _hash(6)]
+        return [{"hash": _hash(5)}, None]
+
+    monkeypatch.setattr(bulk_signing, "send_raw_transactions", timeout)
+    monkeypatch.setattr(batch_payout_module, "rpc_batch", lookup)
+    first, second = run(2)
+    assert first["tx_hash"] == _hash(5) and "error" not in first
+    assert "Broadcast failed" in second["error"] and "tx_hash" not in second
+    assert manager.next_nonce() == 6
+
+
+def test_unconfirmed_broadcast_is_reported_as_unknown(manager, monkeypatch):
+    def timeout(raw_txs, size):
+        raise ConnectionError("connection reset")
+
+    def lookup(calls):
+        return [RpcError({"code": -32603, "message": "busy"}), {"hash": _hash(6)}]
+
+    monkeypatch.setattr(bulk_signing, "send_raw_transactions", timeout)
+    monkeypatch.setattr(batch_payout_module, "rpc_batch", lookup)
+    first, second, third = run(3, max_concurrency=2)
+    assert first["status"] == "unknown" and first["tx_hash"] == _hash(5) and "error" not in first
+    assert second["status"] == "pending" and second["tx_hash"] == _hash(6)
+    assert "could not be confirmed" in third["error"]
+    # The node may hold nonce 5, so the next send re-reads the pending count
+    manager.web3.eth.pending = 7
+    assert manager.next_nonce() == 7
+
+
+def test_failed_lookup_leaves_every_payout_unknown(manager, monkeypatch):
+    def timeout(raw_txs, size):
+        raise TimeoutError("read timed out")
+
+    def lookup(calls):
+        raise ConnectionError("node unreachable")
+
+    monkeypatch.setattr(bulk_signing, "send_raw_transactions", timeout)
+    monkeypatch.setattr(batch_payout_module, "rpc_batch", lookup)
+    results = run(2)
+    assert [r["status"] for r in results] == ["unknown", "unknown"]
+    assert [r["tx_hash"] for r in results] == [_hash(5), _hash(6)]
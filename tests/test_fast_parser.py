@@ -0,0 +1,52 @@
+import pytest
+
+from mezo_agent.fast_parser import find_amounts, is_positive_amount, parse_swap, parse_transaction
+
+RECIPIENT = "0x" + "ab" * 20
+ROUTER = "0x" + "cd" * 20
+
+
+@pytest.mark.parametrize("amount", ["1k", "2m", "1e3", "1_000"])
+def test_transfer_with_letters_attached_to_amount_is_left_to_llm(amount):
+    assert parse_transaction(f"send {amount} mUSD to {RECIPIENT}") is None
+
+
+@pytest.mark.parametrize("amount", ["5k", "1e2", "1_000"])
+def test_swap_with_letters_attached_to_amount_is_left_to_llm(amount):
+    assert parse_swap(f"swap {amount} mUSD for BTC", ROUTER) is None
+
+
+def test_currency_symbol_may_follow_amount_directly():
+    assert parse_transaction(f"send 1.5BTC to {RECIPIENT}") == {
+        "amount": "1.5",
+        "currency": "BTC",
+        "recipient": RECIPIENT,
+    }
+    assert parse_swap("swap 10mUSD for BTC", ROUTER)["amount"] == "10"
+
+
+def test_plain_transfer_is_parsed():
+    assert parse_transaction(f"Send 1,000.5 mUSD to {RECIPIENT}")["amount"] == "1000.5"
+
+
+def test_zero_or_negative_amount_is_left_to_llm():
+    assert parse_transaction(f"send 0 BTC to {RECIPIENT}") is None
+    assert parse_transaction(f"send -1 BTC to {RECIPIENT}") is None
+
+
+def test_range_is_ambiguous():
+    assert find_amounts("swap 4-5 mUSD for BTC") == ["4", "5"]
+    assert parse_swap("swap 4-5 mUSD for BTC", ROUTER) is None
+
+
+def test_wrong_swap_direction_is_left_to_llm():
+    assert parse_swap("swap 10 BTC for mUSD", ROUTER) is None
+
+
+@pytest.mark.parametrize("amount", ["1e3", "NaN", "Infinity", "-1", "0", "", "1k"])
+def test_is_positive_amount_rejects_non_plain_decimals(amount):
+    assert not is_positive_amount(amount)
+
+
+def test_is_positive_amount_accepts_plain_decimals():
+    assert is_positive_amount("0.5") and is_positive_amount(" 10 ") and is_positive_amount(2)
@@ -0,0 +1,98 @@
+from mezo_agent.gas_oracle import GasOracle, _estimate_key
+
+TOKEN = "0x" + "11" * 20
+SENDER = "0x" + "22" * 20
+TRANSFER_SELECTOR = "a9059cbb"
+
+
+def _word(value: int) -> str:
+    return hex(value)[2:].rjust(64, "0")
+
+
+def transfer_tx(recipient: str, amount: int) -> dict:
+    return {"to": TOKEN, "from": SENDER, "data": "0x" + TRANSFER_SELECTOR + _word(int(recipient, 16)) + _word(amount)}
+
+
+class FakeEth:
+    def __init__(self):
+        self.estimates = 0
+        self.history = {"baseFeePerGas": [100, 100], "reward": [[1, 2, 3]]}
+        self.history_error = None
+        self.gas_price = 50
+
+    def estimate_gas(self, tx):
+        self.estimates += 1
+        return 50000
+
+    def fee_history(self, blocks, newest, percentiles):
+        if self.history_error:
+            raise self.history_error
+        return self.history
+
+
+class FakeWeb3:
+    def __init__(self):
+        self.eth = FakeEth()
+
+
+def test_amounts_to_one_recipient_share_an_estimate():
+    recipient = "0x" + "ab" * 20
+    assert _estimate_key(transfer_tx(recipient, 1)) == _estimate_key(transfer_tx(recipient, 10 ** 24))
+
+
+def test_different_recipients_get_their_own_estimate():
+    first, second = "0x" + "ab" * 20, "0x" + "cd" * 20
+    assert _estimate_key(transfer_tx(first, 1)) != _estimate_key(transfer_tx(second, 1))
+
+
+def test_key_ignores_case_of_target_and_sender():
+    tx = {"to": TOKEN.upper().replace("0X", "0x"), "from": SENDER, "value": 1}
+    assert _estimate_key(tx) == _estimate_key(dict(tx, to=TOKEN))
+
+
+def test_value_transfers_and_calls_differ():
+    assert _estimate_key({"to": TOKEN, "value": 1}) != _estimate_key({"to": TOKEN})
+
+
+def test_estimates_are_memoized_until_an_out_of_gas_receipt():
+    web3 = FakeWeb3()
+    oracle = GasOracle(web3)
+    tx = transfer_tx("0x" + "ab" * 20, 5)
+    assert oracle.estimate_gas(tx) == oracle.estimate_gas(tx) == 50000
+    assert web3.eth.estimates == 1
+
+    assert not oracle.check_receipt({"status": 0, "gasUsed": 30000}, 50000)
+    oracle.estimate_gas(tx)
+    assert web3.eth.estimates == 1
+
+    assert oracle.check_receipt({"status": 0, "gasUsed": 50000}, 50000)
+    oracle.estimate_gas(tx)
+    assert web3.eth.estimates == 2
+
+
+def test_fee_history_error_does_not_disable_eip1559():
+    web3 = FakeWeb3()
+    oracle = GasOracle(web3, ttl=0)
+    web3.eth.history_error = OSError("connection reset")
+    assert "gasPrice" in oracle.fee_params()
+
+    web3.eth.history_error = None
+    assert "maxFeePerGas" in oracle.fee_params()
+
+
+def test_history_without_base_fees_selects_legacy_pricing():
+    web3 = FakeWeb3()
+    web3.eth.history = {"baseFeePerGas": [0, 0], "reward": []}
+    oracle = GasOracle(web3, ttl=0)
+    assert oracle.fee_params("fast") == {"gasPrice": int(50 * 1.25)}
+
+
+def test_invalidate_refetches_fee_history_and_gas_price():
+    web3 = FakeWeb3()
+    oracle = GasOracle(web3, ttl=60)
+    first = oracle.fee_params()
+    web3.eth.history = {"baseFeePerGas": [200, 200], "reward": [[1, 2, 3]]}
+    assert oracle.fee_params() == first
+
+    oracle.invalidate()
+    assert oracle.fee_params()["maxFeePerGas"] > first["maxFeePerGas"]
@@ -0,0 +1,94 @@
+import re
+import pytest
+from mezo_agent import history
+from mezo_agent.history import ColumnStore, HistoryStore, FINALITY_LAG, SWAP_SCHEMA
+
+PAIR = "0x" + "ab" * 20
+
+
+class FakeSubgraph:
+    """
+    Answers the _meta and swaps queries HistoryStore sends, honouring the timestamp window.
+    """
+
+    def __init__(self, indexed_at: int):
+        self.indexed_at = indexed_at
+        self.swaps = []
+
+    def add_swap(self, timestamp: int):
+        self.swaps.append({
+            "id": f"swap-{len(self.swaps)}",
+            "timestamp": str(timestamp),
+            "amount0In": "1", "amount1In": "0", "amount0Out": "0", "amount1Out": "2", "amountUSD": "3",
+        })
+
+    def __call__(self, query: str) -> dict:
+        if "_meta" in query:
+            return {"data": {"_meta": {"block": {"timestamp": self.indexed_at}}}}
+        start = int(re.search(r"timestamp_gte: (\d+)", query).group(1))
+        end = int(re.search(r"timestamp_lte: (\d+)", query).group(1))
+        rows = [s for s in self.swaps if start <= int(s["timestamp"]) <= end]
+        return {"data": {"swaps": sorted(rows, key=lambda s: int(s["timestamp"]))}}
+
+
+@pytest.fixture
+def subgraph(monkeypatch):
+    fake = FakeSubgraph(indexed_at=10_000)
+    monkeypatch.setattr(history, "query_graph", fake)
+    monkeypatch.setattr(history.time, "time", lambda: 20_000)
+    return fake
+
+
+def test_column_store_appends_and_reads_ranges(tmp_path):
+    store = ColumnStore(str(tmp_path / "swaps"), SWAP_SCHEMA, "timestamp")
+    rows = {column: [] for column in SWAP_SCHEMA}
+    for ts in (10, 20, 30, 40):
+        for column in SWAP_SCHEMA:
+            rows[column].append(ts if column == "timestamp" else ts / 10)
+    store.append(rows)
+    assert len(store) == 4
+    assert store.last() == 40
+    assert list(store.range(15, 30)["timestamp"]) == [20, 30]
+    assert list(store.range(15, 30)["amount_usd"]) == [2.0, 3.0]
+
+
+def test_column_store_repairs_a_partial_append(tmp_path):
+    path = tmp_path / "swaps"
+    store = ColumnStore(str(path), SWAP_SCHEMA, "timestamp")
+    store.append({column: [1] for column in SWAP_SCHEMA})
+    with open(path / "timestamp.q", "ab") as f:
+        f.write(b"\0" * 8)  # a crash after writing only the key column
+    assert len(ColumnStore(str(path), SWAP_SCHEMA, "timestamp")) == 1
+    assert (path / "timestamp.q").stat().st_size == 8
+
+
+def test_sync_stops_short_of_the_indexed_head(tmp_path, subgraph):
+    for ts in (100, 5_000, 10_000 - FINALITY_LAG, 10_000 - FINALITY_LAG + 1, 15_000):
+        subgraph.add_swap(ts)
+    store = HistoryStore(root=str(tmp_path), max_workers=2)
+    assert store.sync_swaps(PAIR) == 3
+    assert list(store.swaps(PAIR, 0, 20_000)["timestamp"]) == [100, 5_000, 10_000 - FINALITY_LAG]
+
+
+def test_sync_resumes_after_the_last_stored_row(tmp_path, subgraph):
+    subgraph.add_swap(100)
+    store = HistoryStore(root=str(tmp_path))
+    assert store.sync_swaps(PAIR) == 1
+
+    subgraph.add_swap(9_000)
+    subgraph.indexed_at = 19_000
+    assert store.sync_swaps(PAIR) == 1
+    assert store.sync_swaps(PAIR) == 0
+
+    reopened = HistoryStore(root=str(tmp_path))
+    assert list(reopened.swaps(PAIR, 0, 20_000)["timestamp"]) == [100, 9_000]
+
+
+def test_ohlc_builds_candles_from_stored_swaps(tmp_path, subgraph):
+    for ts in (3_600, 3_700, 7_300):
+        subgraph.add_swap(ts)
+    store = HistoryStore(root=str(tmp_path))
+    store.sync_swaps(PAIR)
+    candles = store.ohlc(PAIR, 0, 10_000)
+    assert [(c["time"], c["trades"]) for c in candles] == [(3_600, 2), (7_200, 1)]
+    assert candles[0]["close"] == 2.0
@@ -0,0 +1,85 @@
+import time
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.messages import AIMessage
+from mezo_agent.llm_cache import CachedChatModel, normalize_prompt
+
+
+class FakeLLM:
+    def __init__(self, temperature: float = 0):
+        self.temperature = temperature
+        self.model_name = "fake"
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def invoke(self, prompt, **kwargs):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return AIMessage(content=f"answer to {prompt}")
+
+
+def test_identical_prompts_hit_the_cache():
+    llm = FakeLLM()
+    cached = CachedChatModel(llm)
+    assert cached.invoke("What is  Mezo?").content == cached.invoke("What is Mezo?").content
+    assert llm.calls == 1
+    assert cached.get_stats()["hits"] == 1
+
+
+def test_namespaces_do_not_share_entries():
+    llm = FakeLLM()
+    cached = CachedChatModel(llm)
+    cached.invoke("hello", namespace="a")
+    cached.invoke("hello", namespace="b")
+    assert llm.calls == 2
+
+
+def test_concurrent_identical_requests_share_one_call():
+    llm = FakeLLM()
+    llm.release.clear()
+    cached = CachedChatModel(llm)
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(cached.invoke, "price of BTC")
+        assert llm.started.wait(5)
+        followers = [pool.submit(cached.invoke, "price of BTC") for _ in range(4)]
+        while cached.get_stats()["coalesced"] < 4:
+            time.sleep(0.001)
+        llm.release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert llm.calls == 1
+    assert {r.content for r in results} == {"answer to price of BTC"}
+    assert cached.get_stats()["coalesced"] == 4
+
+
+def test_failed_calls_are_not_cached():
+    llm = FakeLLM()
+    cached = CachedChatModel(llm)
+
+    def fail(prompt, **kwargs):
+        llm.calls += 1
+        raise RuntimeError("rate limited")
+
+    llm.invoke = fail
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            cached.invoke("hello")
+    assert llm.calls == 2
+    assert cached.get_stats()["misses"] == 2
+
+
+def test_non_deterministic_models_bypass_the_cache():
+    llm = FakeLLM(temperature=0.9)
+    cached = CachedChatModel(llm)
+    cached.invoke("tweet")
+    cached.invoke("tweet")
+    assert llm.calls == 2
+    assert cached.get_stats()["bypassed"] == 2
+
+
+def test_normalize_prompt_collapses_whitespace_only():
+    assert normalize_prompt("  Send 1 BTC\n to\t0xAbC ") == "Send 1 BTC to 0xAbC"
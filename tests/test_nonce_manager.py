@@ -0,0 +1,124 @@
+import pytest
+from web3 import Web3
+from mezo_agent.nonce_manager import NonceManager
+
+
+class FakeEth:
+    def __init__(self, pending: int = 5):
+        self.pending = pending
+        self.reads = 0
+        self.sent = []
+
+    def get_transaction_count(self, address, block_identifier):
+        self.reads += 1
+        return self.pending
+
+    def send_raw_transaction(self, raw_tx):
+        self.sent.append(raw_tx)
+        return b"hash-" + raw_tx
+
+
+class FakeWeb3:
+    def __init__(self, pending: int = 5):
+        self.eth = FakeEth(pending)
+
+
+def make_manager(pending: int = 5):
+    web3 = FakeWeb3(pending)
+    return NonceManager(address="0x000000000000000000000000000000000000dEaD", web3=web3), web3.eth
+
+
+def test_nonces_are_read_once_then_counted_locally():
+    manager, eth = make_manager(pending=7)
+    assert [manager.next_nonce() for _ in range(3)] == [7, 8, 9]
+    assert eth.reads == 1
+
+
+def test_reserve_allocates_a_consecutive_block():
+    manager, _ = make_manager(pending=3)
+    assert list(manager.reserve(4)) == [3, 4, 5, 6]
+    assert manager.next_nonce() == 7
+
+
+def test_release_of_latest_nonce_hands_it_out_again():
+    manager, eth = make_manager()
+    nonce = manager.next_nonce()
+    manager.release(nonce)
+    assert manager.next_nonce() == nonce
+    assert eth.reads == 1
+
+
+def test_release_of_older_nonce_forces_a_resync():
+    manager, eth = make_manager(pending=10)
+    first = manager.next_nonce()
+    manager.next_nonce()
+    manager.release(first)
+    eth.pending = 11
+    assert manager.next_nonce() == 11
+    assert eth.reads == 2
+
+
+def test_releasing_a_reserved_block_in_reverse_restores_the_counter():
+    manager, eth = make_manager(pending=2)
+    nonces = manager.reserve(3)
+    for nonce in reversed(nonces):
+        manager.release(nonce)
+    assert manager.next_nonce() == 2
+    assert eth.reads == 1
+
+
+def test_resync_reads_the_chain_again():
+    manager, eth = make_manager(pending=1)
+    manager.next_nonce()
+    eth.pending = 20
+    manager.resync()
+    assert manager.next_nonce() == 20
+
+
+def test_send_releases_the_nonce_when_signing_fails():
+    manager, eth = make_manager(pending=4)
+
+    def sign(nonce):
+        raise ValueError("bad transaction")
+
+    with pytest.raises(ValueError):
+        manager.send(sign)
+    assert manager.next_nonce() == 4
+    assert eth.sent == []
+
+
+def test_send_resyncs_and_retries_after_a_nonce_error():
+    manager, eth = make_manager(pending=4)
+    attempts = []
+
+    def broadcast(raw_tx):
+        attempts.append(raw_tx)
+        if len(attempts) == 1:
+            eth.pending = 6
+            raise ValueError("nonce too low")
+        return b"ok"
+
+    assert manager.send(lambda nonce: bytes([nonce]), broadcast_fn=broadcast) == b"ok"
+    assert attempts == [bytes([4]), bytes([6])]
+    assert manager.next_nonce() == 7
+
+
+def test_send_treats_already_known_as_success():
+    manager, _ = make_manager()
+
+    def broadcast(raw_tx):
+        raise ValueError("already known")
+
+    assert manager.send(lambda nonce: b"raw", broadcast_fn=broadcast) == Web3.keccak(b"raw")
+
+
+def test_send_never_reuses_a_nonce_after_an_unknown_broadcast_failure():
+    manager, eth = make_manager(pending=4)
+
+    def broadcast(raw_tx):
+        raise TimeoutError("read timed out")
+
+    with pytest.raises(TimeoutError):
+        manager.send(lambda nonce: b"raw", broadcast_fn=broadcast)
+    eth.pending = 5  # the timed-out transaction did reach the pool
+    assert manager.next_nonce() == 5
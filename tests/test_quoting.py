@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from mezo_agent import quoting
+from mezo_agent.quoting import SwapQuoter, apply_slippage, get_amount_out
+
+MUSD = "0x" + "11" * 20
+WBTC = "0x" + "22" * 20
+OTHER = "0x" + "33" * 20
+PAIR = "0x" + "44" * 20
+
+
+def _word(value: int) -> str:
+    return hex(value)[2:].rjust(64, "0")
+
+
+class FakeChain:
+    """
+    Answers getReserves() and token0() eth_calls for one MUSD/WBTC pair.
+    """
+
+    def __init__(self, reserve0: int, reserve1: int):
+        self.reserves = (reserve0, reserve1)
+        self.batches = []
+
+    def __call__(self, calls):
+        self.batches.append(calls)
+        results = []
+        for _, (call, _) in calls:
+            if call["data"] == quoting.GET_RESERVES_SELECTOR:
+                results.append("0x" + _word(self.reserves[0]) + _word(self.reserves[1]) + _word(0))
+            else:
+                results.append("0x" + _word(int(MUSD, 16)))
+        return results
+
+
+@pytest.fixture
+def quoter(monkeypatch):
+    chain = FakeChain(10 ** 24, 10 ** 20)
+    monkeypatch.setattr(quoting, "rpc_batch", chain)
+    quoter = SwapQuoter(fee_bps=30)
+    quoter._pairs[tuple(sorted((MUSD, WBTC)))] = PAIR
+    quoter._pairs[tuple(sorted((MUSD, OTHER)))] = None
+    quoter._block = (100, time.time())
+    return quoter, chain
+
+
+def test_get_amount_out_matches_uniswap_v2():
+    assert get_amount_out(1000, 10 ** 6, 10 ** 6) == 996
+    assert get_amount_out(0, 10 ** 6, 10 ** 6) == 0
+    assert get_amount_out(1000, 0, 10 ** 6) == 0
+
+
+def test_apply_slippage():
+    assert apply_slippage(10000, 50) == 9950
+    assert apply_slippage(10000, 0) == 10000
+
+
+def test_quote_derives_min_out_from_slippage(quoter):
+    quoter, _ = quoter
+    quote = quoter.quote(10 ** 18, [MUSD, WBTC], slippage_bps=100)
+    assert quote["amount_out"] == get_amount_out(10 ** 18, 10 ** 24, 10 ** 20, 30)
+    assert quote["min_amount_out"] == apply_slippage(quote["amount_out"], 100)
+    assert quote["block"] == 100
+
+
+def test_reserves_are_read_once_per_block(quoter):
+    quoter, chain = quoter
+    quoter.quote(10 ** 18, [MUSD, WBTC])
+    quoter.quote(5 * 10 ** 18, [MUSD, WBTC])
+    assert len(chain.batches) == 1
+
+    quoter._block = (101, time.time())
+    quoter.quote(10 ** 18, [MUSD, WBTC])
+    assert len(chain.batches) == 2
+    # token0 never changes, so only getReserves is read again
+    assert len(chain.batches[1]) == 1
+
+
+def test_reverse_direction_swaps_the_reserves(quoter):
+    quoter, _ = quoter
+    amounts = quoter.get_amounts_out(10 ** 16, [WBTC, MUSD])
+    assert amounts[-1] == get_amount_out(10 ** 16, 10 ** 20, 10 ** 24, 30)
+
+
+def test_older_reserves_do_not_overwrite_newer_ones(quoter):
+    quoter, _ = quoter
+    quoter.update_reserves(PAIR, 5, 6, block=200)
+    quoter.update_reserves(PAIR, 1, 2, block=150)
+    assert quoter._reserves[PAIR] == (200, 5, 6)
+
+
+def test_missing_pool_raises(quoter):
+    quoter, _ = quoter
+    with pytest.raises(Exception, match="No liquidity pool"):
+        quoter.quote(10 ** 18, [MUSD, OTHER])
@@ -0,0 +1,101 @@
+import pytest
+
+from mezo_agent import receipts
+from mezo_agent.receipts import ReceiptWatcher, TransactionDropped
+
+TX_A = "0x" + "aa" * 32
+TX_B = "0x" + "bb" * 32
+
+
+def receipt(block: int, block_hash: str = "0x01", status: int = 1) -> dict:
+    return {"blockNumber": hex(block), "blockHash": block_hash, "status": hex(status), "gasUsed": hex(21000)}
+
+
+class FakeNode:
+    """
+    Answers eth_blockNumber and eth_getTransactionReceipt batches from in-memory state.
+    """
+
+    def __init__(self, block: int = 10):
+        self.block = block
+        self.receipts = {}
+        self.lookups = []
+
+    def __call__(self, calls):
+        results = []
+        for method, params in calls:
+            if method == "eth_blockNumber":
+                results.append(hex(self.block))
+            else:
+                self.lookups.append(params[0])
+                results.append(self.receipts.get(params[0]))
+        return results
+
+
+@pytest.fixture
+def node(monkeypatch):
+    node = FakeNode()
+    monkeypatch.setattr(receipts, "rpc_batch", node)
+    return node
+
+
+@pytest.fixture
+def watcher(monkeypatch):
+    watcher = ReceiptWatcher(drop_timeout=600)
+    monkeypatch.setattr(watcher, "_ensure_running", lambda: None)  # polls are driven by the test
+    return watcher
+
+
+def test_receipt_resolves_after_enough_confirmations(node, watcher):
+    confirmed = []
+    future = watcher.watch(TX_A, confirmations=2, on_confirmed=confirmed.append)
+    node.receipts[TX_A] = receipt(10)
+    watcher._poll()
+    assert not future.done()
+
+    node.block = 11
+    watcher._poll()
+    assert future.result(0).status == 1 and future.result(0).blockNumber == 10
+    assert confirmed == [future.result(0)]
+    assert watcher.pending_count() == 0
+
+
+def test_every_pending_receipt_is_read_in_one_batch_per_block(node, watcher):
+    watcher.watch(TX_A)
+    watcher.watch(bytes.fromhex(TX_B[2:]))
+    watcher._poll()
+    assert node.lookups == [TX_A, TX_B]
+
+    # No new block and both already checked: nothing to look up
+    watcher._poll()
+    assert node.lookups == [TX_A, TX_B]
+
+
+def test_watching_twice_shares_one_future(watcher):
+    assert watcher.watch(TX_A) is watcher.watch(TX_A.upper().replace("0X", "0x"))
+
+
+def test_moved_receipt_reports_a_reorg(node, watcher):
+    reorgs = []
+    future = watcher.watch(TX_A, confirmations=3, on_reorg=reorgs.append)
+    node.receipts[TX_A] = receipt(10, "0x01")
+    watcher._poll()
+
+    node.block = 11
+    node.receipts[TX_A] = receipt(11, "0x02")
+    watcher._poll()
+    assert reorgs == [TX_A] and not future.done()
+
+    node.block = 13
+    watcher._poll()
+    assert future.result(0).blockHash == "0x02"
+
+
+def test_transaction_without_receipt_is_dropped(node, watcher):
+    dropped = []
+    watcher.drop_timeout = -1
+    future = watcher.watch(TX_A, on_dropped=dropped.append)
+    watcher._poll()
+    with pytest.raises(TransactionDropped):
+        future.result(0)
+    assert dropped == [TX_A]
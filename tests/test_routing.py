@@ -0,0 +1,95 @@
+import time
+import pytest
+from mezo_agent import routing
+from mezo_agent.quoting import get_amount_out
+from mezo_agent.routing import PairGraph
+
+MUSD = "0x" + "01" * 20
+WBTC = "0x" + "02" * 20
+USDC = "0x" + "03" * 20
+DAI = "0x" + "04" * 20
+PAIR_1, PAIR_2, PAIR_3, PAIR_4 = ("0x" + f"a{i}" * 20 for i in range(1, 5))
+
+
+def pair(pair_id: str, token0: str, token1: str, reserve0: str, reserve1: str) -> dict:
+    return {
+        "id": pair_id,
+        "reserve0": reserve0,
+        "reserve1": reserve1,
+        "token0": {"id": token0, "decimals": "18"},
+        "token1": {"id": token1, "decimals": "18"},
+    }
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    pairs = [
+        # A thin direct pool and a deep two-hop route through USDC
+        pair(PAIR_1, MUSD, WBTC, "1000", "0.01"),
+        pair(PAIR_2, MUSD, USDC, "1000000", "1000000"),
+        pair(PAIR_3, USDC, WBTC, "1000000", "10"),
+        pair(PAIR_4, DAI, USDC, "10", "10"),
+    ]
+    queries = []
+
+    def query_graph(query):
+        queries.append(query)
+        return {"data": {"pairs": [] if 'id_gt: ""' not in query else pairs}}
+
+    monkeypatch.setattr(routing, "query_graph", query_graph)
+    graph = PairGraph()
+    graph.queries = queries
+    return graph
+
+
+def test_refresh_builds_adjacency_from_every_pair(graph):
+    graph.refresh()
+    assert {neighbour for neighbour, _ in graph._adjacency[USDC]} == {MUSD, WBTC, DAI}
+    assert graph._pairs[PAIR_1][2] == 1000 * 10 ** 18
+
+
+def test_best_route_prefers_the_deeper_multi_hop_path(graph):
+    amount_in = 100 * 10 ** 18
+    route = graph.best_route(MUSD, WBTC, amount_in, verify=False)
+    assert [t.lower() for t in route["path"]] == [MUSD, USDC, WBTC]
+    assert [p.lower() for p in route["pairs"]] == [PAIR_2, PAIR_3]
+
+    hop = get_amount_out(amount_in, 1000000 * 10 ** 18, 1000000 * 10 ** 18)
+    assert route["amount_out"] == get_amount_out(hop, 1000000 * 10 ** 18, 10 * 10 ** 18)
+
+
+def test_candidates_are_sorted_best_first_and_never_revisit_a_token(graph):
+    candidates = graph.candidate_routes(MUSD, WBTC, 10 ** 18)
+    outputs = [amount for amount, _, _ in candidates]
+    assert outputs == sorted(outputs, reverse=True)
+    for _, path, _ in candidates:
+        assert len(path) == len(set(path))
+
+
+def test_max_hops_limits_the_search(graph):
+    route = graph.best_route(MUSD, WBTC, 100 * 10 ** 18, max_hops=1, verify=False)
+    assert [p.lower() for p in route["pairs"]] == [PAIR_1]
+
+
+def test_unreachable_token_has_no_route(graph):
+    assert graph.best_route(MUSD, "0x" + "09" * 20, 10 ** 18, verify=False) is None
+
+
+def test_update_reserves_changes_the_quote(graph):
+    graph.refresh()
+    before = graph.candidate_routes(MUSD, WBTC, 10 ** 18, max_hops=1)[0][0]
+    graph.update_reserves(PAIR_1, 1000 * 10 ** 18, 10 ** 18)
+    after = graph.candidate_routes(MUSD, WBTC, 10 ** 18, max_hops=1)[0][0]
+    assert after > before
+
+
+def test_stale_graph_is_served_while_refreshing_in_the_background(graph):
+    graph.refresh()
+    graph._loaded_at = 0  # expired
+    loads = len(graph.queries)
+    assert graph.candidate_routes(MUSD, WBTC, 10 ** 18)  # answered from the current graph
+    for _ in range(100):
+        if not graph._refreshing:
+            break
+        time.sleep(0.01)
+    assert len(graph.queries) > loads
@@ -0,0 +1,73 @@
+import pytest
+from eth_account import Account
+
+from mezo_agent import signer_pool as signer_pool_module
+from mezo_agent.rpc_batch import RpcError
+from mezo_agent.signer_pool import Signer, SignerPool
+
+KEYS = ["0x" + f"{i:02x}" * 32 for i in (1, 2, 3)]
+TOKEN = "0x" + "aa" * 20
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.delenv("PRIVATE_KEY", raising=False)
+    pool = SignerPool(keys=KEYS)
+    for signer in pool.signers:
+        signer.set_balances(10 ** 18, {TOKEN: 10 ** 18})
+    pool._refreshed_at = float("inf")  # balances above count as fresh
+    return pool
+
+
+def test_duplicate_keys_are_loaded_once(monkeypatch):
+    monkeypatch.delenv("PRIVATE_KEY", raising=False)
+    assert len(SignerPool(keys=KEYS + KEYS[:1])) == 3
+
+
+def test_select_spreads_sends_across_accounts(pool):
+    chosen = [pool.select() for _ in range(3)]
+    assert {s.address for s in chosen} == {s.address for s in pool.signers}
+    pool.release(chosen[0])
+    assert pool.select() is chosen[0]
+
+
+def test_select_skips_accounts_that_cannot_cover_the_send(pool):
+    poor, rich = pool.signers[0], pool.signers[1]
+    poor.set_balances(0)
+    rich.set_balances(token_balances={TOKEN: 10 ** 19})
+    assert pool.select(min_balance=1) is not poor
+    assert pool.select(token=TOKEN, min_token_balance=10 ** 19) is rich
+
+
+def test_select_returns_least_busy_account_when_none_can_cover(pool):
+    chosen = pool.select(min_balance=10 ** 30)
+    assert chosen in pool.signers and chosen.in_flight == 1
+
+
+def test_debit_and_credit_track_balances():
+    signer = Signer(Account.from_key(KEYS[0]))
+    signer.debit(5)  # nothing tracked yet
+    assert signer.balance is None
+    signer.set_balances(100, {TOKEN: 50})
+    signer.debit(30)
+    signer.credit(5)
+    signer.debit(20, token=TOKEN.upper().replace("0X", "0x"))
+    assert signer.balance == 75 and signer.token_balances[TOKEN] == 30
+
+
+def test_refresh_reads_every_balance_in_one_batch(pool, monkeypatch):
+    batches = []
+
+    def fake_rpc_batch(calls):
+        batches.append(calls)
+        results = [hex(i + 1) for i in range(len(calls))]
+        results[1] = RpcError({"code": -32000, "message": "boom"})  # second account's native balance
+        return results
+
+    monkeypatch.setattr(signer_pool_module, "rpc_batch", fake_rpc_batch)
+    pool.refresh_balances([TOKEN])
+    assert len(batches) == 1 and len(batches[0]) == 6
+    first, second, third = pool.signers
+    assert first.balance == 1 and first.token_balances[TOKEN] == 4
+    assert second.balance == 10 ** 18 and second.token_balances[TOKEN] == 5
+    assert third.balance == 3 and third.token_balances[TOKEN] == 6
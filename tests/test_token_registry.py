@@ -0,0 +1,111 @@
+import json
+import re
+import threading
+import time
+
+from mezo_agent import token_registry as token_registry_module
+from mezo_agent.token_registry import TokenRegistry
+
+
+def _token(n: int, symbol: str) -> dict:
+    return {"id": "0x" + f"{n:040x}", "symbol": symbol, "decimals": "18"}
+
+
+class FakeSubgraph:
+    """
+    Answers the registry's paged tokens query from an in-memory list.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.queries = 0
+        self.gate = None
+
+    def __call__(self, query):
+        self.queries += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        first = int(re.search(r"first: (\d+)", query).group(1))
+        last_id = re.search(r'id_gt: "([^"]*)"', query).group(1)
+        page = [t for t in sorted(self.tokens, key=lambda t: t["id"]) if t["id"] > last_id][:first]
+        return {"data": {"tokens": page}}
+
+
+def make_registry(tmp_path, monkeypatch, tokens, ttl=3600):
+    subgraph = FakeSubgraph(tokens)
+    monkeypatch.setattr(token_registry_module, "query_graph", subgraph)
+    return TokenRegistry(cache_path=str(tmp_path / "tokens.json"), ttl=ttl), subgraph
+
+
+def test_every_page_is_fetched(tmp_path, monkeypatch):
+    monkeypatch.setattr(token_registry_module, "PAGE_SIZE", 2)
+    registry, subgraph = make_registry(tmp_path, monkeypatch, [_token(i, f"T{i}") for i in range(1, 6)])
+    assert sorted(registry.symbols()) == ["T1", "T2", "T3", "T4", "T5"]
+    assert subgraph.queries == 3
+
+
+def test_first_token_wins_for_a_duplicate_symbol(tmp_path, monkeypatch):
+    registry, _ = make_registry(tmp_path, monkeypatch, [_token(1, "MUSD"), _token(2, "musd")])
+    assert registry.address("MUSD") == "0x" + f"{1:040x}"
+
+
+def test_btc_is_an_alias_for_wtbtc(tmp_path, monkeypatch):
+    registry, _ = make_registry(tmp_path, monkeypatch, [_token(7, "WTBTC")])
+    assert registry.get("BTC")["symbol"] == "WTBTC"
+
+
+def test_warm_start_loads_the_snapshot_without_the_network(tmp_path, monkeypatch):
+    registry, subgraph = make_registry(tmp_path, monkeypatch, [_token(1, "MUSD")])
+    registry.refresh()
+    assert subgraph.queries == 1
+
+    warm, warm_subgraph = make_registry(tmp_path, monkeypatch, [])
+    assert warm.decimals("MUSD") == 18
+    assert warm_subgraph.queries == 0
+
+
+def test_stale_index_is_refreshed_in_the_background(tmp_path, monkeypatch):
+    registry, subgraph = make_registry(tmp_path, monkeypatch, [_token(1, "MUSD")], ttl=60)
+    registry.refresh()
+    subgraph.tokens.append(_token(2, "NEW"))
+    subgraph.gate = threading.Event()
+    registry._fetched_at -= 120
+
+    # The old index keeps serving while the refresh waits on the subgraph
+    assert registry.symbols() == ["MUSD"]
+    subgraph.gate.set()
+    for _ in range(100):
+        if "NEW" in registry.symbols():
+            break
+        time.sleep(0.01)
+    assert sorted(registry.symbols()) == ["MUSD", "NEW"]
+
+
+def test_unknown_symbol_forces_a_rate_limited_refresh(tmp_path, monkeypatch):
+    registry, subgraph = make_registry(tmp_path, monkeypatch, [_token(1, "MUSD")])
+    registry.refresh()
+    subgraph.tokens.append(_token(2, "NEW"))
+
+    # Within MISS_REFRESH_INTERVAL of the last fetch a miss does not hit the subgraph
+    assert registry.get("NEW") is None
+    assert subgraph.queries == 1
+
+    registry._fetched_at -= token_registry_module.MISS_REFRESH_INTERVAL + 1
+    assert registry.get("NEW")["symbol"] == "NEW"
+    assert subgraph.queries == 2
+
+
+def test_cached_symbols_does_not_wait_for_a_cold_fetch(tmp_path, monkeypatch):
+    registry, subgraph = make_registry(tmp_path, monkeypatch, [_token(1, "MUSD")])
+    subgraph.gate = threading.Event()
+    assert registry.cached_symbols() == []
+    subgraph.gate.set()
+
+
+def test_cached_symbols_serves_the_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "tokens.json"
+    entry = {"symbol": "MUSD", "address": "0x" + "11" * 20, "decimals": 18}
+    path.write_text(json.dumps({"fetched_at": time.time(), "tokens": {"musd": entry}}))
+    registry, subgraph = make_registry(tmp_path, monkeypatch, [])
+    assert registry.cached_symbols() == ["MUSD"]
+    assert subgraph.queries == 0
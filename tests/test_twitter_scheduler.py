@@ -0,0 +1,87 @@
+import json
+import time
+import threading
+from mezo_agent.twitter_scheduler import TokenBucket, TweetScheduler
+
+HOUR = 3600
+
+
+def make_scheduler(tmp_path, **kwargs):
+    return TweetScheduler(state_path=str(tmp_path / "schedule.json"), bucket=TokenBucket(1000, 1), **kwargs)
+
+
+def test_registering_twice_keeps_one_heap_entry(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    scheduler.register("joe", lambda: None, interval=HOUR)
+    slot = scheduler.next_fire_time("joe")
+    scheduler.register("joe", lambda: None, interval=HOUR)
+    assert len(scheduler._heap) == 1
+    assert scheduler.next_fire_time("joe") == slot
+
+
+def test_first_slots_fall_within_one_interval(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    start = time.time()
+    for name in ("a", "b", "c"):
+        scheduler.register(name, lambda: None, interval=HOUR)
+    for name in ("a", "b", "c"):
+        assert start <= scheduler.next_fire_time(name) <= time.time() + HOUR
+    assert len(scheduler._heap) == 3
+
+
+def test_saved_slot_is_resumed_after_a_restart(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    scheduler.register("joe", lambda: None, interval=HOUR)
+    slot = scheduler.next_fire_time("joe")
+    with open(tmp_path / "schedule.json") as f:
+        assert json.load(f) == {"joe": slot}
+
+    restarted = make_scheduler(tmp_path)
+    restarted.register("joe", lambda: None, interval=HOUR)
+    assert restarted.next_fire_time("joe") == slot
+
+
+def test_unregister_forgets_the_slot(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    scheduler.register("joe", lambda: None, interval=HOUR)
+    scheduler.unregister("joe")
+    assert scheduler.next_fire_time("joe") is None
+    with open(tmp_path / "schedule.json") as f:
+        assert json.load(f) == {}
+
+
+def test_due_job_posts_once_and_is_rescheduled(tmp_path):
+    with open(tmp_path / "schedule.json", "w") as f:
+        json.dump({"joe": 0.0}, f)  # overdue after downtime
+    scheduler = make_scheduler(tmp_path)
+    posted = threading.Event()
+    calls = []
+
+    def post():
+        calls.append(1)
+        posted.set()
+
+    scheduler.register("joe", post, interval=HOUR, jitter=0)
+    assert posted.wait(5)
+    assert calls == [1]
+    assert scheduler.next_fire_time("joe") > HOUR
+
+
+def test_blocked_job_does_not_stall_other_jobs(tmp_path):
+    with open(tmp_path / "schedule.json", "w") as f:
+        json.dump({"slow": 0.0, "fast": 0.0}, f)
+    scheduler = make_scheduler(tmp_path)
+    release, fast_posted = threading.Event(), threading.Event()
+    scheduler.register("slow", lambda: release.wait(5), interval=HOUR)
+    scheduler.register("fast", fast_posted.set, interval=HOUR)
+    try:
+        assert fast_posted.wait(5)
+    finally:
+        release.set()
+
+
+def test_token_bucket_allows_a_burst_up_to_capacity():
+    bucket = TokenBucket(capacity=3, window=HOUR)
+    for _ in range(3):
+        bucket.acquire()
+    assert bucket._tokens < 1